@@ -0,0 +1,53 @@
+import asyncio
+import hmac
+import threading
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Query
+from fastapi.responses import JSONResponse, PlainTextResponse
+
+from ....core.config import settings
+from shared.profiler import ProfilerBusyError, SamplingProfiler, memory_diff
+
+router = APIRouter()
+
+async def require_admin_token(authorization: Optional[str] = Header(None)):
+    """Jeton d'administration (Authorization: Bearer <ADMIN_TOKEN>)"""
+    if not settings.ADMIN_TOKEN:
+        raise HTTPException(status_code=404, detail="Not Found")
+    scheme, _, token = (authorization or "").partition(" ")
+    if scheme.lower() != "bearer" or not hmac.compare_digest(token.encode(), settings.ADMIN_TOKEN.encode()):
+        raise HTTPException(status_code=401, detail="Invalid admin token")
+
+@router.get("/profile", dependencies=[Depends(require_admin_token)])
+async def profile_cpu(
+    seconds: float = Query(10.0, gt=0, le=settings.PROFILE_MAX_SECONDS),
+    format: str = Query("collapsed", pattern="^(collapsed|speedscope)$"),
+    interval: float = Query(0.01, ge=0.001, le=1.0, description="Période d'échantillonnage (s)"),
+    idle: bool = Query(False, description="Inclure les threads en attente")
+):
+    """Profil statistique de tous les threads (boucle d'événements comprise)"""
+    profiler = SamplingProfiler(interval=interval, include_idle=idle)
+    try:
+        profile = await asyncio.to_thread(profiler.run, seconds, threading.get_ident())
+    except ProfilerBusyError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+
+    if format == "speedscope":
+        return JSONResponse(
+            profile.speedscope(f"{settings.PROJECT_NAME} {seconds}s"),
+            headers={"Content-Disposition": 'attachment; filename="backend.speedscope.json"'}
+        )
+    return PlainTextResponse(profile.collapsed())
+
+@router.get("/profile/memory", dependencies=[Depends(require_admin_token)])
+async def profile_memory(
+    seconds: float = Query(10.0, gt=0, le=settings.PROFILE_MAX_SECONDS),
+    top: int = Query(50, ge=1, le=500)
+):
+    """Croissance mémoire (différence d'instantanés tracemalloc) pendant la fenêtre"""
+    try:
+        diff = await asyncio.to_thread(memory_diff, seconds, top)
+    except ProfilerBusyError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    return {"success": True, "data": diff}
@@ -0,0 +1,42 @@
+from fastapi import APIRouter, Depends, Query
+from typing import Optional
+
+from ....core.exceptions import ValidationException
+from ....services.cache_service import cache_service
+from ....services.dashboard_service import DashboardService, DASHBOARD_WIDGETS
+from ....services.kaspa_service import KaspaService
+from ....services.price_service import PriceService
+from ....services.system_service import SystemService
+
+router = APIRouter()
+
+async def get_dashboard_service() -> DashboardService:
+    kaspa_service = KaspaService()
+    price_service = PriceService(cache_service)
+    system_service = SystemService(cache_service, kaspa_service, price_service)
+    return DashboardService(cache_service, kaspa_service, price_service, system_service)
+
+@router.get("")
+async def get_dashboard(
+    fields: Optional[str] = Query(
+        None,
+        description=f"Widgets séparés par des virgules ({','.join(DASHBOARD_WIDGETS)}), tous si omis"
+    ),
+    dashboard_service: DashboardService = Depends(get_dashboard_service)
+):
+    """Récupère tous les widgets du tableau de bord en un seul appel"""
+    if fields:
+        widgets = [f.strip() for f in fields.split(",") if f.strip()]
+        unknown = [w for w in widgets if w not in DASHBOARD_WIDGETS]
+        if unknown:
+            raise ValidationException(f"Unknown dashboard fields: {', '.join(unknown)}", "fields")
+    else:
+        widgets = list(DASHBOARD_WIDGETS)
+    
+    data, errors, stale = await dashboard_service.get_dashboard(dict.fromkeys(widgets))
+    return {
+        "success": True,
+        "data": data,
+        "errors": errors or None,
+        "stale": stale or None
+    }
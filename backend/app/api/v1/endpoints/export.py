@@ -0,0 +1,64 @@
+from fastapi import APIRouter, Depends, Query
+
+from ....core.exceptions import NodeException, ValidationException
+from ....services.block_indexer import COLUMN_TYPES as BLOCK_COLUMN_TYPES, COLUMNS as BLOCK_COLUMNS, block_indexer
+from ....services.cache_service import cache_service
+from ....services.price_service import PriceService
+from ....utils.export import EXPORT_FORMAT_PATTERN, export_response, iterate_batches
+
+router = APIRouter()
+
+PRICE_COLUMNS = ("timestamp", "price_usd", "market_cap_usd", "volume_usd")
+PRICE_COLUMN_TYPES = ("int64", "float64", "float64", "float64")
+
+# CoinGecko renvoie l'historique en un seul document (un point par jour au-delà
+# d'un jour): l'export des prix est chargé en mémoire, borné à 365 points
+PRICE_EXPORT_MAX_DAYS = 365
+
+async def get_price_service() -> PriceService:
+    return PriceService(cache_service)
+
+@router.get("/blocks")
+async def export_blocks(
+    from_: int = Query(..., alias="from", ge=0, description="Début de la plage (score DAA ou timestamp ms)"),
+    to: int = Query(..., ge=0, description="Fin de la plage (incluse)"),
+    by: str = Query("daa", pattern="^(daa|time)$", description="Axe de la plage: daa ou time"),
+    format: str = Query("ndjson", pattern=EXPORT_FORMAT_PATTERN)
+):
+    """Exporte les blocs indexés d'une plage, en streaming"""
+    if to < from_:
+        raise ValidationException("'to' must be greater than or equal to 'from'", "to")
+    if not block_indexer.is_open:
+        raise NodeException("Block index not available", "BLOCK_INDEX_UNAVAILABLE")
+    
+    return export_response(
+        block_indexer.iter_range(from_, to, by),
+        BLOCK_COLUMNS,
+        BLOCK_COLUMN_TYPES,
+        format,
+        f"blocks_{by}_{from_}_{to}"
+    )
+
+@router.get("/prices")
+async def export_prices(
+    days: int = Query(7, ge=1, le=PRICE_EXPORT_MAX_DAYS, description="Nombre de jours d'historique"),
+    format: str = Query("ndjson", pattern=EXPORT_FORMAT_PATTERN),
+    price_service: PriceService = Depends(get_price_service)
+):
+    """
+    Exporte l'historique des prix (USD)
+    Exception au streaming de bout en bout: la réponse amont n'est pas
+    paginable, elle est lue en entier puis encodée par lots
+    """
+    history = await price_service.get_price_history(days)
+    rows = (
+        (price[0], price[1], market_cap[1], volume[1])
+        for price, market_cap, volume in zip(
+            history.get("prices", []),
+            history.get("market_caps", []),
+            history.get("total_volumes", [])
+        )
+    )
+    return export_response(
+        iterate_batches(rows), PRICE_COLUMNS, PRICE_COLUMN_TYPES, format, f"prices_{days}d"
+    )
@@ -0,0 +1,91 @@
+from fastapi import APIRouter, Body, Depends, Query
+from datetime import datetime, timezone
+from decimal import Decimal
+from typing import List, Optional
+
+from ....core.exceptions import ValidationException
+from ....models.schemas import MiningStatsSample
+from ....services.database import database
+from .admin import require_admin_token
+
+router = APIRouter()
+
+MINING_STATS_COLUMNS = (
+    "timestamp", "hashrate", "difficulty", "block_height", "blocks_found",
+    "shares_submitted", "peer_count", "mining_address", "miner_id"
+)
+
+def _utc(value: datetime) -> datetime:
+    # Colonnes TIMESTAMP WITH TIME ZONE: une date sans fuseau est en UTC
+    return value if value.tzinfo else value.replace(tzinfo=timezone.utc)
+
+@router.get("/stats/latest")
+async def get_latest_mining_stats():
+    """Dernier échantillon enregistré dans mining_stats"""
+    record = await database.fetchrow("mining_stats_latest")
+    return {
+        "success": True,
+        "data": dict(record) if record else None
+    }
+
+@router.get("/stats")
+async def get_mining_stats(
+    start: datetime = Query(..., description="Début de la plage"),
+    end: Optional[datetime] = Query(None, description="Fin de la plage (exclue, maintenant si omise)"),
+    limit: int = Query(1000, ge=1, le=10000)
+):
+    """Échantillons mining_stats d'une plage, du plus ancien au plus récent"""
+    start = _utc(start)
+    end = _utc(end) if end else datetime.now(timezone.utc)
+    if end <= start:
+        raise ValidationException("'end' must be after 'start'", "end")
+    
+    records = await database.fetch("mining_stats_range", start, end, limit)
+    return {
+        "success": True,
+        "data": [dict(record) for record in records]
+    }
+
+@router.post("/stats", dependencies=[Depends(require_admin_token)])
+async def import_mining_stats(samples: List[MiningStatsSample] = Body(..., min_length=1, max_length=100000)):
+    """Import en masse d'échantillons (reprise d'historique) via COPY"""
+    records = (
+        (
+            _utc(sample.timestamp),
+            Decimal(str(sample.hashrate)),
+            Decimal(str(sample.difficulty)),
+            sample.block_height,
+            sample.blocks_found,
+            sample.shares_submitted,
+            sample.peer_count,
+            sample.mining_address,
+            sample.miner_id
+        )
+        for sample in samples
+    )
+    imported = await database.copy_records("mining_stats", MINING_STATS_COLUMNS, records)
+    return {
+        "success": True,
+        "data": {"imported": imported}
+    }
+
+@router.get("/blocks")
+async def get_found_blocks(limit: int = Query(50, ge=1, le=1000)):
+    """Derniers blocs trouvés (blocks_found), du plus récent au plus ancien"""
+    records = await database.fetch("blocks_found_recent", limit)
+    return {
+        "success": True,
+        "data": [dict(record) for record in records]
+    }
+
+@router.get("/events")
+async def get_mining_events(
+    event_type: Optional[str] = Query(None, max_length=50, description="Filtre sur le type d'événement"),
+    limit: int = Query(50, ge=1, le=1000)
+):
+    """Derniers événements de minage (alertes, démarrages, erreurs)"""
+    records = await database.fetch("mining_events_recent", event_type, limit)
+    return {
+        "success": True,
+        "data": [dict(record) for record in records]
+    }
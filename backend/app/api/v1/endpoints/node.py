@@ -1,8 +1,11 @@
 from fastapi import APIRouter, Depends, Query
 from typing import Optional
 
-from ....models.schemas import NodeStatusResponse
+from ....models.schemas import NodeStatusResponse, BlockListResponse
+from ....core.exceptions import ValidationException
+from ....services.block_indexer import block_indexer
 from ....services.kaspa_service import KaspaService
+from ....services.rpc_pool import kaspa_rpc_pool
 
 router = APIRouter()
 
@@ -27,4 +30,33 @@ async def get_block_info(
     return {
         "success": True,
         "data": block_info
-    }
\ No newline at end of file
+    }
+
+@router.get("/blocks", response_model=BlockListResponse)
+async def get_blocks_range(
+    from_: int = Query(..., alias="from", ge=0, description="Début de la plage (score DAA ou timestamp ms)"),
+    to: int = Query(..., ge=0, description="Fin de la plage (incluse)"),
+    by: str = Query("daa", pattern="^(daa|time)$", description="Axe de la plage: daa ou time"),
+    limit: int = Query(500, ge=1, le=5000)
+):
+    """Blocs indexés localement dans une plage, sans appel au nœud"""
+    if to < from_:
+        raise ValidationException("'to' must be greater than or equal to 'from'", "to")
+    
+    blocks = await block_indexer.get_range(from_, to, by, limit)
+    return BlockListResponse(data=blocks)
+
+@router.get("/blocks/recent", response_model=BlockListResponse)
+async def get_recent_blocks(
+    limit: int = Query(20, ge=1, le=200)
+):
+    """Derniers blocs indexés, du plus récent au plus ancien"""
+    return BlockListResponse(data=block_indexer.get_recent(limit))
+
+@router.get("/pool")
+async def get_rpc_pool_status():
+    """État des nœuds du pool RPC (latence, synchronisation, taux d'erreur)"""
+    return {
+        "success": True,
+        "data": kaspa_rpc_pool.get_stats()
+    }
@@ -1,7 +1,8 @@
 from fastapi import APIRouter, Depends, Query
-from typing import Optional
+from typing import Optional, Union
 
-from ....models.schemas import PriceResponse
+from ....core.exceptions import PriceException
+from ....models.schemas import PriceResponse, PriceTableResponse
 from ....services.price_service import PriceService
 from ....services.cache_service import cache_service
 
@@ -10,13 +11,26 @@ router = APIRouter()
 async def get_price_service() -> PriceService:
     return PriceService(cache_service)
 
-@router.get("/current", response_model=PriceResponse)
+@router.get("/current", response_model=Union[PriceResponse, PriceTableResponse])
 async def get_current_price(
+    vs: Optional[str] = Query(None, description="Devises de cotation, séparées par des virgules (ex. usd,jpy,btc)"),
+    assets: str = Query("KAS", description="Actifs, séparés par des virgules (ex. KAS,BTC)"),
     price_service: PriceService = Depends(get_price_service)
 ):
-    """Récupère le prix actuel de Kaspa"""
-    price_data = await price_service.get_kaspa_price()
-    return PriceResponse(data=price_data)
+    """Récupère le prix actuel de Kaspa, ou une table actif x devise si vs est fourni"""
+    if vs is None:
+        price_data = await price_service.get_kaspa_price()
+        return PriceResponse(data=price_data)
+    
+    engine = price_service.engine
+    quotes = await engine.get_quotes(engine.parse_pairs(assets.split(","), vs.split(",")))
+    if not quotes:
+        raise PriceException("Unable to fetch current price data")
+    
+    table = {}
+    for (asset, currency), quote in sorted(quotes.items()):
+        table.setdefault(asset, {})[currency] = quote.to_dict()
+    return PriceTableResponse(data=table)
 
 @router.get("/history")
 async def get_price_history(
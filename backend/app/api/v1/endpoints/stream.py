@@ -0,0 +1,47 @@
+from fastapi import APIRouter, Body, Depends, Header, Query
+from fastapi.responses import StreamingResponse
+from typing import Any, Dict, List, Optional
+
+from ....core.config import settings
+from ....services.event_hub import event_hub
+from .admin import require_admin_token
+
+router = APIRouter()
+
+async def sse_frames(last_event_id: Optional[int]):
+    queue = event_hub.subscribe(last_event_id)
+    try:
+        yield f"retry: {settings.SSE_RETRY_MS}\n\n".encode()
+        while True:
+            frame = await queue.get()
+            if frame is None:
+                # Abonnement coupé (client trop lent)
+                break
+            yield frame
+    finally:
+        event_hub.unsubscribe(queue)
+
+@router.get("")
+async def stream_events(
+    last_event_id: Optional[int] = Query(None, description="Reprise après cet identifiant"),
+    last_event_id_header: Optional[str] = Header(None, alias="Last-Event-ID")
+):
+    """Flux Server-Sent Events (mêmes événements que /ws), avec reprise via Last-Event-ID"""
+    if last_event_id is None and last_event_id_header and last_event_id_header.isdigit():
+        last_event_id = int(last_event_id_header)
+    
+    return StreamingResponse(
+        sse_frames(last_event_id),
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            "X-Accel-Buffering": "no"
+        }
+    )
+
+@router.post("/mining-alerts", dependencies=[Depends(require_admin_token)])
+async def publish_mining_alerts(alerts: List[Dict[str, Any]] = Body(..., max_length=1000)):
+    """Relaie les alertes du moniteur de minage sur /ws et le flux SSE"""
+    for alert in alerts:
+        await event_hub.publish("mining_alert", alert)
+    return {"success": True, "data": {"published": len(alerts)}}
@@ -1,33 +1,115 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Query
 from typing import List
 
-from ....models.schemas import WalletCreate, WalletResponse, WalletList
+from ....models.schemas import (
+    WalletCreate, WalletResponse, WalletList, WalletUnlock,
+    BalanceRequest, BalancesResponse, AddressBalance
+)
 from ....core.exceptions import WalletException, ValidationException
+from ....services.cache_service import cache_service
+from ....services.kaspa_service import KaspaService, SOMPI_PER_KAS
+from ....services.notification_service import kaspa_notifications
+from ....services.wallet_crypto import wallet_crypto_pool
+from ....services.wallet_repository import WalletRepository, wallet_repository
+from ....services.wallet_service import WalletService
 
 router = APIRouter()
 
+async def get_wallet_repository() -> WalletRepository:
+    return wallet_repository
+
+async def get_wallet_service() -> WalletService:
+    return WalletService(wallet_repository, wallet_crypto_pool, kaspa_notifications)
+
+async def get_kaspa_service() -> KaspaService:
+    return KaspaService(cache_service)
+
 @router.post("/create", response_model=WalletResponse)
-async def create_wallet(wallet_data: WalletCreate):
+async def create_wallet(
+    wallet_data: WalletCreate,
+    wallet_service: WalletService = Depends(get_wallet_service)
+):
     """Crée un nouveau wallet Kaspa"""
-    # TODO: Implémenter la création sécurisée de wallet
-    # Pour l'instant, retourner une réponse de test
-    raise WalletException("Wallet creation not yet implemented", "NOT_IMPLEMENTED")
+    entry = await wallet_service.create_wallet(wallet_data)
+    return entry.to_response()
 
 @router.get("/", response_model=WalletList)
-async def list_wallets():
-    """Liste tous les wallets"""
-    # TODO: Implémenter la liste des wallets
+async def list_wallets(
+    offset: int = Query(0, ge=0, description="Position de départ"),
+    limit: int = Query(50, ge=1, le=500, description="Nombre de wallets par page"),
+    include_balance: bool = Query(False, description="Inclure les soldes (un seul lot RPC par page)"),
+    repository: WalletRepository = Depends(get_wallet_repository),
+    kaspa_service: KaspaService = Depends(get_kaspa_service)
+):
+    """Liste les wallets, paginés dans l'ordre de création"""
+    wallets = [entry.to_response() for entry in repository.list(offset, limit)]
+    
+    if include_balance and wallets:
+        balances = await kaspa_service.get_balances([w.address for w in wallets])
+        for wallet in wallets:
+            if wallet.address in balances:
+                wallet.balance = balances[wallet.address] / SOMPI_PER_KAS
+    
     return WalletList(
-        wallets=[],
-        total=0,
-        message="Wallet listing not yet implemented"
+        wallets=wallets,
+        total=repository.count(),
+        offset=offset,
+        limit=limit
     )
 
+@router.post("/balances", response_model=BalancesResponse)
+async def get_balances(
+    request: BalanceRequest,
+    kaspa_service: KaspaService = Depends(get_kaspa_service)
+):
+    """Récupère les soldes de nombreuses adresses en requêtes RPC groupées"""
+    balances = await kaspa_service.get_balances(request.addresses)
+    return BalancesResponse(data=[
+        AddressBalance(
+            address=address,
+            balance=sompi / SOMPI_PER_KAS,
+            balance_sompi=sompi
+        )
+        for address, sompi in balances.items()
+    ])
+
+@router.get("/by-address/{address}", response_model=WalletResponse)
+async def get_wallet_by_address(
+    address: str,
+    repository: WalletRepository = Depends(get_wallet_repository)
+):
+    """Récupère un wallet par son adresse Kaspa"""
+    if not address.startswith("kaspa"):
+        raise ValidationException("Invalid Kaspa address format", "address")
+
+    entry = repository.get_by_address(address)
+    if not entry:
+        raise WalletException("Wallet not found", "WALLET_NOT_FOUND")
+    return entry.to_response()
+
 @router.get("/{wallet_id}", response_model=WalletResponse)
-async def get_wallet(wallet_id: str):
+async def get_wallet(
+    wallet_id: str,
+    repository: WalletRepository = Depends(get_wallet_repository)
+):
     """Récupère un wallet par son ID"""
     if not wallet_id or len(wallet_id) < 16:
         raise ValidationException("Invalid wallet ID format", "wallet_id")
-    
-    # TODO: Implémenter la récupération de wallet
-    raise WalletException("Wallet retrieval not yet implemented", "NOT_IMPLEMENTED")
\ No newline at end of file
+
+    entry = repository.get(wallet_id)
+    if not entry:
+        raise WalletException("Wallet not found", "WALLET_NOT_FOUND")
+    return entry.to_response()
+
+@router.post("/{wallet_id}/unlock", response_model=WalletResponse)
+async def unlock_wallet(
+    wallet_id: str,
+    unlock_data: WalletUnlock,
+    wallet_service: WalletService = Depends(get_wallet_service)
+):
+    """Déverrouille un wallet en vérifiant son mot de passe"""
+    if len(wallet_id) < 16:
+        raise ValidationException("Invalid wallet ID format", "wallet_id")
+
+    entry = await wallet_service.unlock_wallet(wallet_id, unlock_data.password)
+    return entry.to_response()
@@ -1,5 +1,5 @@
 from fastapi import APIRouter
-from .endpoints import system, prices, node, wallets
+from .endpoints import system, prices, node, wallets, dashboard, export, stream, admin, mining
 
 api_router = APIRouter()
 
@@ -26,4 +26,34 @@ api_router.include_router(
     wallets.router,
     prefix="/wallets",
     tags=["wallets"]
-)
\ No newline at end of file
+)
+
+api_router.include_router(
+    dashboard.router,
+    prefix="/dashboard",
+    tags=["dashboard"]
+)
+
+api_router.include_router(
+    mining.router,
+    prefix="/mining",
+    tags=["mining"]
+)
+
+api_router.include_router(
+    export.router,
+    prefix="/export",
+    tags=["export"]
+)
+
+api_router.include_router(
+    stream.router,
+    prefix="/stream",
+    tags=["stream"]
+)
+
+api_router.include_router(
+    admin.router,
+    prefix="/admin",
+    tags=["admin"]
+)
@@ -1,5 +1,5 @@
 from pydantic_settings import BaseSettings
-from typing import List, Optional
+from typing import Dict, List, Optional
 
 class Settings(BaseSettings):
     # API
@@ -13,16 +13,101 @@ class Settings(BaseSettings):
     
     # Database
     DATABASE_URL: Optional[str] = None
+    DATABASE_POOL_MIN_SIZE: int = 2
+    DATABASE_POOL_MAX_SIZE: int = 10
+    DATABASE_CONNECT_TIMEOUT: float = 5.0
+    DATABASE_COMMAND_TIMEOUT: float = 10.0
+    DATABASE_STATEMENT_CACHE_SIZE: int = 256
+    DATABASE_MAX_IDLE_TIME: float = 300.0
+    DATABASE_HEALTH_TIMEOUT: float = 2.0
+    
+    # Wallets
+    WALLETS_DIR: str = "/app/wallets"
+    WALLET_DB_PATH: str = "/app/wallets/wallets.db"
+    WALLET_KDF_N: int = 32768
+    WALLET_CRYPTO_WORKERS: int = 2
+    WALLET_CRYPTO_MAX_QUEUE: int = 16
+    WALLET_CRYPTO_USE_PROCESSES: bool = False
     
     # Redis
     REDIS_URL: str = "redis://localhost:6379"
     
     # Kaspa
     KASPA_RPC_URL: str = "http://localhost:16210"
+    # Pool multi-nœuds (KASPA_RPC_URL seul si vide)
+    KASPA_RPC_URLS: List[str] = []
+    KASPA_RPC_HEALTH_INTERVAL: float = 15.0
+    KASPA_HEDGE_PERCENTILE: float = 0.95
+    KASPA_HEDGE_MIN_DELAY: float = 0.05
     KASPA_NETWORK: str = "mainnet"
+    KASPA_ADDRESS_CHUNK_SIZE: int = 100
+    KASPA_RPC_MAX_CONCURRENCY: int = 4
+    KASPA_WRPC_URL: str = "ws://localhost:18110"
+    KASPA_NOTIFICATIONS_ENABLED: bool = True
+    
+    # Indexeur de blocs local
+    BLOCK_INDEX_ENABLED: bool = True
+    BLOCK_INDEX_DB_PATH: str = "/app/data/blocks.db"
+    BLOCK_INDEX_RETENTION: int = 1_000_000
+    BLOCK_INDEX_POLL_INTERVAL: float = 5.0
+    BLOCK_INDEX_RECENT_SIZE: int = 200
+    
+    # Snapshots persistés pour le démarrage à chaud
+    SNAPSHOT_PATH: str = "/app/data/snapshots.json"
+    SNAPSHOT_INTERVAL: float = 30.0
+    SNAPSHOT_MAX_STALE: float = 3600.0
+    
+    # Flux temps réel (SSE)
+    SSE_REPLAY_SIZE: int = 1000
+    SSE_HEARTBEAT_INTERVAL: float = 15.0
+    SSE_CLIENT_QUEUE_SIZE: int = 256
+    SSE_RETRY_MS: int = 3000
+    
+    # Surveillance de la boucle d'événements
+    LOOP_MONITOR_ENABLED: bool = True
+    LOOP_LAG_INTERVAL: float = 0.5
+    SLOW_CALLBACK_THRESHOLD: float = 0.1
+    
+    # Traçage des requêtes (Server-Timing, export OTLP/JSON des traces échantillonnées)
+    TRACING_ENABLED: bool = True
+    TRACE_SAMPLE_RATE: float = 0.0
+    TRACE_SLOW_THRESHOLD: float = 1.0
+    TRACE_EXPORT_URL: str = ""
+    TRACE_EXPORT_FORMAT: str = "otlp"
+    TRACE_EXPORT_BATCH_SIZE: int = 100
+    TRACE_EXPORT_INTERVAL: float = 5.0
+    TRACE_EXPORT_QUEUE_SIZE: int = 1000
+    
+    # Endpoints d'administration (profilage); désactivés si le jeton est vide
+    ADMIN_TOKEN: str = ""
+    PROFILE_MAX_SECONDS: int = 60
+    
+    # Mining monitor
+    MINING_MONITOR_URL: str = "http://localhost:8080"
     
     # External APIs
     COINGECKO_API_URL: str = "https://api.coingecko.com/api/v3"
+    COINPAPRIKA_API_URL: str = "https://api.coinpaprika.com/v1"
+    CRYPTOCOMPARE_API_URL: str = "https://min-api.cryptocompare.com"
+    
+    # Moteur de prix (symbole -> identifiant CoinGecko, devises de cotation autorisées)
+    PRICE_ASSETS: Dict[str, str] = {"KAS": "kaspa", "BTC": "bitcoin", "ETH": "ethereum"}
+    PRICE_CURRENCIES: List[str] = [
+        "usd", "eur", "gbp", "jpy", "chf", "cad", "aud", "nzd", "cny", "hkd", "sgd",
+        "krw", "inr", "brl", "mxn", "try", "sek", "nok", "dkk", "pln", "zar", "btc", "eth"
+    ]
+    PRICE_PREFETCH_ASSETS: List[str] = ["KAS"]
+    PRICE_COINPAPRIKA_IDS: Dict[str, str] = {"KAS": "kas-kaspa", "BTC": "btc-bitcoin", "ETH": "eth-ethereum"}
+    # Sources interrogées en parallèle (ordre = priorité des métadonnées 24h/volume/capitalisation)
+    PRICE_SOURCES: List[str] = ["coingecko", "coinpaprika", "cryptocompare"]
+    PRICE_SOURCE_DEADLINE: float = 2.0
+    PRICE_OUTLIER_THRESHOLD: float = 0.05
+    PRICE_REFRESH_INTERVAL: float = 60.0
+    PRICE_MAX_AGE: float = 120.0
+    PRICE_BATCH_WINDOW: float = 0.05
+    
+    # Hôtes acceptés en plus des valeurs par défaut (ex. nom du service Docker)
+    ALLOWED_HOSTS: List[str] = []
     
     # CORS
     BACKEND_CORS_ORIGINS: List[str] = ["http://localhost:8081", "http://localhost:3000"]
@@ -33,6 +118,11 @@ class Settings(BaseSettings):
     
     # Rate limiting
     RATE_LIMIT_PER_MINUTE: int = 60
+    RATE_LIMIT_ENABLED: bool = True
+    # Limites spécifiques par préfixe de route (requêtes/minute)
+    RATE_LIMIT_ROUTES: Dict[str, int] = {}
+    RATE_LIMIT_EXEMPT_PATHS: List[str] = ["/health", "/ready", "/metrics", "/"]
+    RATE_LIMIT_TRUST_PROXY: bool = False
     
     class Config:
         env_file = ".env"
@@ -26,6 +26,10 @@ class PriceException(KaspaZofException):
     def __init__(self, message: str, code: str = "PRICE_ERROR"):
         super().__init__(message, code)
 
+class DatabaseException(KaspaZofException):
+    def __init__(self, message: str, code: str = "DATABASE_ERROR"):
+        super().__init__(message, code)
+
 class ValidationException(KaspaZofException):
     def __init__(self, message: str, field: str = None):
         self.field = field
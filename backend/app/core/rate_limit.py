@@ -0,0 +1,187 @@
+import json
+import logging
+import math
+import time
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Tuple
+
+from starlette.routing import Match
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from .config import settings
+from ..services.cache_service import CacheService, cache_service
+
+logger = logging.getLogger(__name__)
+
+# GCRA (Generic Cell Rate Algorithm) atomique côté Redis.
+# KEYS[1] = clé client/route, ARGV[1] = intervalle d'émission (ms),
+# ARGV[2] = capacité de rafale (nombre de requêtes).
+# Retourne {autorisé, restant, retry_after_ms}.
+GCRA_LUA = """
+local key = KEYS[1]
+local emission = tonumber(ARGV[1])
+local burst = tonumber(ARGV[2])
+local t = redis.call('TIME')
+local now = tonumber(t[1]) * 1000 + math.floor(tonumber(t[2]) / 1000)
+local tat = tonumber(redis.call('GET', key))
+if not tat or tat < now then
+    tat = now
+end
+local new_tat = tat + emission
+local capacity = emission * burst
+local diff = new_tat - now
+if diff > capacity then
+    return {0, 0, diff - capacity}
+end
+redis.call('SET', key, new_tat, 'PX', math.ceil(diff))
+return {1, math.floor((capacity - diff) / emission), 0}
+"""
+
+
+class RateLimiter:
+    """Limiteur GCRA par client et par route, Redis avec repli en mémoire"""
+
+    def __init__(self, cache: CacheService, max_local_keys: int = 10000):
+        self.cache = cache
+        self.max_local_keys = max_local_keys
+        self._local_tat: Dict[str, float] = {}
+        self._script = None
+        self._script_client = None
+
+    def _get_script(self):
+        """Enregistre le script Lua une seule fois par client Redis"""
+        client = self.cache.redis_client
+        if self._script is None or self._script_client is not client:
+            self._script = client.register_script(GCRA_LUA)
+            self._script_client = client
+        return self._script
+
+    async def hit(self, key: str, limit: int) -> Tuple[bool, int, float]:
+        """Consomme une requête. Retourne (autorisé, restant, retry_after en secondes)"""
+        emission_ms = 60000.0 / limit
+
+        if self.cache.connected and self.cache.redis_client:
+            try:
+                script = self._get_script()
+                allowed, remaining, retry_ms = await script(
+                    keys=[f"ratelimit:{key}"],
+                    args=[emission_ms, limit]
+                )
+                return bool(int(allowed)), int(remaining), float(retry_ms) / 1000
+            except Exception as e:
+                logger.warning(f"Rate limit Redis error, using local fallback: {e}")
+
+        return self._hit_local(key, limit, emission_ms)
+
+    def _hit_local(self, key: str, limit: int, emission_ms: float) -> Tuple[bool, int, float]:
+        """Même algorithme GCRA, en mémoire du processus"""
+        now = time.monotonic() * 1000
+        tat = max(self._local_tat.get(key, now), now)
+        new_tat = tat + emission_ms
+        capacity = emission_ms * limit
+        diff = new_tat - now
+
+        if diff > capacity:
+            return False, 0, (diff - capacity) / 1000
+
+        if key not in self._local_tat and len(self._local_tat) >= self.max_local_keys:
+            self._purge_local(now)
+        self._local_tat[key] = new_tat
+        return True, int((capacity - diff) // emission_ms), 0.0
+
+    def _purge_local(self, now: float):
+        """Supprime les entrées expirées (et les plus anciennes si nécessaire)"""
+        self._local_tat = {k: v for k, v in self._local_tat.items() if v > now}
+        overflow = len(self._local_tat) - self.max_local_keys + 1
+        if overflow > 0:
+            for k in list(self._local_tat)[:overflow]:
+                del self._local_tat[k]
+
+
+class RateLimitMiddleware:
+    """Middleware ASGI appliquant RATE_LIMIT_PER_MINUTE et RATE_LIMIT_ROUTES"""
+
+    def __init__(self, app: ASGIApp, limiter: Optional[RateLimiter] = None):
+        self.app = app
+        self.limiter = limiter or RateLimiter(cache_service)
+        self.default_limit = settings.RATE_LIMIT_PER_MINUTE
+        self.exempt_paths = set(settings.RATE_LIMIT_EXEMPT_PATHS)
+        # Préfixes triés du plus long au plus court pour un match le plus précis
+        self.route_limits: List[Tuple[str, int]] = sorted(
+            settings.RATE_LIMIT_ROUTES.items(),
+            key=lambda item: len(item[0]),
+            reverse=True
+        )
+
+    def _resolve_limit(self, scope: Scope) -> Tuple[str, int]:
+        path = scope["path"]
+        for prefix, limit in self.route_limits:
+            if path.startswith(prefix):
+                return prefix, limit
+        # Sans limite spécifique: un compteur par route, à la limite par défaut
+        return self._route_key(scope), self.default_limit
+
+    @staticmethod
+    def _route_key(scope: Scope) -> str:
+        """Gabarit de la route (/wallets/{wallet_id}: pas une clé par wallet), sinon le chemin"""
+        router = getattr(scope.get("app"), "router", None)
+        for route in getattr(router, "routes", []):
+            match, _ = route.matches(scope)
+            if match != Match.NONE:
+                return route.path
+        return scope["path"]
+
+    def _client_id(self, scope: Scope) -> str:
+        if settings.RATE_LIMIT_TRUST_PROXY:
+            for name, value in scope.get("headers", []):
+                if name == b"x-forwarded-for":
+                    return value.decode("latin-1").split(",")[0].strip()
+        client = scope.get("client")
+        return client[0] if client else "unknown"
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http" or scope["path"] in self.exempt_paths:
+            await self.app(scope, receive, send)
+            return
+
+        route, limit = self._resolve_limit(scope)
+        allowed, remaining, retry_after = await self.limiter.hit(
+            f"{self._client_id(scope)}:{route}", limit
+        )
+
+        if not allowed:
+            await self._reject(send, limit, retry_after)
+            return
+
+        async def send_with_headers(message):
+            if message["type"] == "http.response.start":
+                headers = list(message.get("headers", []))
+                headers.append((b"x-ratelimit-limit", str(limit).encode()))
+                headers.append((b"x-ratelimit-remaining", str(remaining).encode()))
+                message["headers"] = headers
+            await send(message)
+
+        await self.app(scope, receive, send_with_headers)
+
+    async def _reject(self, send: Send, limit: int, retry_after: float):
+        body = json.dumps({
+            "success": False,
+            "error": {
+                "code": "RATE_LIMITED",
+                "message": "Trop de requêtes, veuillez réessayer plus tard"
+            },
+            "timestamp": datetime.now(timezone.utc).isoformat()
+        }).encode()
+
+        await send({
+            "type": "http.response.start",
+            "status": 429,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode()),
+                (b"retry-after", str(max(1, math.ceil(retry_after))).encode()),
+                (b"x-ratelimit-limit", str(limit).encode()),
+                (b"x-ratelimit-remaining", b"0"),
+            ]
+        })
+        await send({"type": "http.response.body", "body": body})
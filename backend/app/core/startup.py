@@ -0,0 +1,103 @@
+import importlib.abc
+import logging
+import os
+import sys
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Lu directement (les Settings ne sont pas encore construits au moment des imports)
+STARTUP_PROFILE = os.getenv("STARTUP_PROFILE", "").lower() in ("1", "true", "yes")
+
+class _TimedLoader(importlib.abc.Loader):
+    """Mesure l'exécution d'un module (imports imbriqués inclus)"""
+
+    def __init__(self, loader, profiler: "StartupProfiler"):
+        self.loader = loader
+        self.profiler = profiler
+
+    def create_module(self, spec):
+        return self.loader.create_module(spec)
+
+    def exec_module(self, module):
+        start = time.perf_counter()
+        try:
+            self.loader.exec_module(module)
+        finally:
+            self.profiler.imports.append((module.__name__, time.perf_counter() - start))
+
+    def __getattr__(self, name):
+        return getattr(self.loader, name)
+
+class _TimingFinder(importlib.abc.MetaPathFinder):
+    def __init__(self, profiler: "StartupProfiler"):
+        self.profiler = profiler
+
+    def find_spec(self, fullname, path, target=None):
+        for finder in sys.meta_path:
+            if finder is self or not hasattr(finder, "find_spec"):
+                continue
+            spec = finder.find_spec(fullname, path, target)
+            if spec is not None:
+                if spec.loader is not None and hasattr(spec.loader, "exec_module"):
+                    spec.loader = _TimedLoader(spec.loader, self.profiler)
+                return spec
+        return None
+
+class StartupProfiler:
+    """Temps d'import par module et d'initialisation par service (mode STARTUP_PROFILE)"""
+
+    def __init__(self, enabled: bool = False):
+        self.enabled = enabled
+        self.started_at = time.perf_counter()
+        self.imports: List[Tuple[str, float]] = []
+        self.steps: List[Tuple[str, float]] = []
+        self.ready_at: Optional[float] = None
+        self._finder: Optional[_TimingFinder] = None
+
+    def install_import_hook(self):
+        if self.enabled and self._finder is None:
+            self._finder = _TimingFinder(self)
+            sys.meta_path.insert(0, self._finder)
+
+    def remove_import_hook(self):
+        if self._finder is not None:
+            sys.meta_path.remove(self._finder)
+            self._finder = None
+
+    @contextmanager
+    def step(self, name: str):
+        """Mesure une étape d'initialisation (toujours enregistrée, coût négligeable)"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.steps.append((name, time.perf_counter() - start))
+
+    def mark_ready(self):
+        self.ready_at = time.perf_counter()
+        self.remove_import_hook()
+        if self.enabled:
+            self.log_report()
+
+    def report(self, top: int = 25) -> Dict[str, Any]:
+        slowest = sorted(self.imports, key=lambda item: item[1], reverse=True)[:top]
+        return {
+            "startup_seconds": round(self.ready_at - self.started_at, 4) if self.ready_at else None,
+            "init_steps_ms": {name: round(duration * 1000, 2) for name, duration in self.steps},
+            "slowest_imports_ms": {name: round(duration * 1000, 2) for name, duration in slowest}
+        }
+
+    def log_report(self):
+        report = self.report()
+        logger.info(f"Startup completed in {report['startup_seconds']}s")
+        for name, duration in report["init_steps_ms"].items():
+            logger.info(f"  init {name}: {duration} ms")
+        for name, duration in report["slowest_imports_ms"].items():
+            logger.info(f"  import {name}: {duration} ms")
+
+# Instance globale (importée en premier par app.main)
+startup_profiler = StartupProfiler(STARTUP_PROFILE)
+startup_profiler.install_import_hook()
@@ -0,0 +1,272 @@
+import asyncio
+import functools
+import logging
+import random
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, List, Optional
+
+import httpx
+from fastapi.responses import JSONResponse
+
+from .config import settings
+
+logger = logging.getLogger(__name__)
+
+class Span:
+    __slots__ = ("name", "span_id", "parent_id", "start", "end", "attributes", "error")
+
+    def __init__(self, name: str, parent_id: Optional[int], attributes: Dict[str, Any]):
+        self.name = name
+        self.span_id = random.getrandbits(64)
+        self.parent_id = parent_id
+        self.start = time.perf_counter()
+        self.end: Optional[float] = None
+        self.attributes = attributes
+        self.error = False
+
+    @property
+    def duration(self) -> float:
+        return (self.end or time.perf_counter()) - self.start
+
+class Trace:
+    """Spans d'une requête (toujours collectés: ils alimentent Server-Timing)"""
+
+    __slots__ = ("trace_id", "root", "spans", "sampled", "wall_start", "perf_start")
+
+    def __init__(self, name: str, trace_id: int = None, parent_id: int = None, sampled: bool = False):
+        self.trace_id = trace_id or random.getrandbits(128)
+        self.wall_start = time.time_ns()
+        self.perf_start = time.perf_counter()
+        self.root = Span(name, parent_id, {})
+        self.spans: List[Span] = []
+        self.sampled = sampled
+
+    def server_timing(self) -> str:
+        """En-tête Server-Timing: durée cumulée par nom de span, puis durée totale"""
+        totals: Dict[str, List[float]] = {}
+        for span in self.spans:
+            if span.end is not None:
+                entry = totals.setdefault(span.name, [0.0, 0])
+                entry[0] += span.end - span.start
+                entry[1] += 1
+        metrics = [
+            f'{name};dur={duration * 1000:.2f}' + (f';desc="x{count}"' if count > 1 else "")
+            for name, (duration, count) in totals.items()
+        ]
+        metrics.append(f"total;dur={self.root.duration * 1000:.2f}")
+        return ", ".join(metrics)
+
+    def wall_ns(self, perf: float) -> int:
+        return self.wall_start + int((perf - self.perf_start) * 1e9)
+
+_current_trace: ContextVar[Optional[Trace]] = ContextVar("current_trace", default=None)
+_current_span: ContextVar[Optional[Span]] = ContextVar("current_span", default=None)
+
+@contextmanager
+def span(name: str, **attributes):
+    """Mesure un bloc dans la trace de la requête courante (sans effet hors requête)"""
+    trace = _current_trace.get()
+    if trace is None:
+        yield None
+        return
+    parent = _current_span.get() or trace.root
+    current = Span(name, parent.span_id, attributes)
+    trace.spans.append(current)
+    token = _current_span.set(current)
+    try:
+        yield current
+    except BaseException:
+        current.error = True
+        raise
+    finally:
+        current.end = time.perf_counter()
+        _current_span.reset(token)
+
+def traced(name: str):
+    """Décorateur de span pour une coroutine"""
+    def decorator(func):
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            with span(name):
+                return await func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+def _parse_traceparent(value: str):
+    # W3C: version-traceid-parentid-flags
+    parts = value.split("-")
+    if len(parts) != 4 or len(parts[1]) != 32 or len(parts[2]) != 16:
+        return None
+    try:
+        return int(parts[1], 16), int(parts[2], 16), bool(int(parts[3], 16) & 1)
+    except ValueError:
+        return None
+
+class TracingMiddleware:
+    """Trace par requête: en-tête Server-Timing et export des traces échantillonnées"""
+
+    def __init__(self, app):
+        self.app = app
+        self.sample_rate = settings.TRACE_SAMPLE_RATE
+        self.slow_threshold = settings.TRACE_SLOW_THRESHOLD
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        name = f"{scope['method']} {scope['path']}"
+        parent = None
+        for key, value in scope["headers"]:
+            if key == b"traceparent":
+                parent = _parse_traceparent(value.decode("latin-1"))
+                break
+        if parent:
+            trace = Trace(name, parent[0], parent[1], parent[2])
+        else:
+            trace = Trace(name, sampled=random.random() < self.sample_rate)
+        trace_token = _current_trace.set(trace)
+        span_token = _current_span.set(trace.root)
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                trace.root.attributes["http.status_code"] = message["status"]
+                message.setdefault("headers", [])
+                message["headers"] = list(message["headers"]) + [
+                    (b"server-timing", trace.server_timing().encode())
+                ]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        except BaseException:
+            trace.root.error = True
+            raise
+        finally:
+            trace.root.end = time.perf_counter()
+            _current_span.reset(span_token)
+            _current_trace.reset(trace_token)
+            if trace.sampled or (self.slow_threshold and trace.root.duration >= self.slow_threshold):
+                trace_exporter.submit(trace)
+
+class TracedJSONResponse(JSONResponse):
+    """Réponse JSON dont la sérialisation apparaît comme span "render\""""
+
+    def render(self, content: Any) -> bytes:
+        with span("render"):
+            return super().render(content)
+
+class TraceExporter:
+    """Envoi par lots des traces vers un collecteur local (OTLP/HTTP JSON ou JSON simple)"""
+
+    def __init__(self):
+        self.url = settings.TRACE_EXPORT_URL
+        self.format = settings.TRACE_EXPORT_FORMAT
+        self.batch_size = settings.TRACE_EXPORT_BATCH_SIZE
+        self.interval = settings.TRACE_EXPORT_INTERVAL
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=settings.TRACE_EXPORT_QUEUE_SIZE)
+        self.dropped = 0
+        self._task: Optional[asyncio.Task] = None
+        self._client: Optional[httpx.AsyncClient] = None
+
+    def submit(self, trace: Trace):
+        if not self.url:
+            return
+        try:
+            self.queue.put_nowait(trace)
+        except asyncio.QueueFull:
+            self.dropped += 1
+
+    def start(self):
+        if self.url and (self._task is None or self._task.done()):
+            self._client = httpx.AsyncClient(timeout=5.0)
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+            await self._flush()
+        if self._client:
+            await self._client.aclose()
+            self._client = None
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(self.interval)
+            await self._flush()
+
+    async def _flush(self):
+        while not self.queue.empty():
+            batch = []
+            while len(batch) < self.batch_size and not self.queue.empty():
+                batch.append(self.queue.get_nowait())
+            payload = self._otlp(batch) if self.format == "otlp" else [self._json(t) for t in batch]
+            try:
+                response = await self._client.post(self.url, json=payload)
+                response.raise_for_status()
+            except httpx.HTTPError as e:
+                logger.warning(f"Trace export failed ({len(batch)} traces dropped): {e}")
+                return
+
+    @staticmethod
+    def _json(trace: Trace) -> Dict[str, Any]:
+        def encode(span: Span) -> Dict[str, Any]:
+            return {
+                "name": span.name,
+                "span_id": f"{span.span_id:016x}",
+                "parent_id": f"{span.parent_id:016x}" if span.parent_id else None,
+                "offset_ms": round((span.start - trace.perf_start) * 1000, 3),
+                "duration_ms": round(span.duration * 1000, 3),
+                "attributes": span.attributes,
+                "error": span.error
+            }
+        return {
+            "trace_id": f"{trace.trace_id:032x}",
+            "start_unix_ns": trace.wall_start,
+            "spans": [encode(trace.root)] + [encode(span) for span in trace.spans]
+        }
+
+    @staticmethod
+    def _otlp(traces: List[Trace]) -> Dict[str, Any]:
+        def attribute(key: str, value: Any) -> Dict[str, Any]:
+            if isinstance(value, bool):
+                return {"key": key, "value": {"boolValue": value}}
+            if isinstance(value, int):
+                return {"key": key, "value": {"intValue": str(value)}}
+            if isinstance(value, float):
+                return {"key": key, "value": {"doubleValue": value}}
+            return {"key": key, "value": {"stringValue": str(value)}}
+
+        spans = []
+        for trace in traces:
+            for span in [trace.root] + trace.spans:
+                encoded = {
+                    "traceId": f"{trace.trace_id:032x}",
+                    "spanId": f"{span.span_id:016x}",
+                    "name": span.name,
+                    # 2 = SERVER (racine), 1 = INTERNAL
+                    "kind": 2 if span is trace.root else 1,
+                    "startTimeUnixNano": str(trace.wall_ns(span.start)),
+                    "endTimeUnixNano": str(trace.wall_ns(span.end or span.start)),
+                    "attributes": [attribute(k, v) for k, v in span.attributes.items()],
+                    "status": {"code": 2 if span.error else 0}
+                }
+                if span.parent_id:
+                    encoded["parentSpanId"] = f"{span.parent_id:016x}"
+                spans.append(encoded)
+        return {
+            "resourceSpans": [{
+                "resource": {"attributes": [attribute("service.name", settings.PROJECT_NAME)]},
+                "scopeSpans": [{"scope": {"name": "kaspazof.tracing"}, "spans": spans}]
+            }]
+        }
+
+# Instance globale
+trace_exporter = TraceExporter()
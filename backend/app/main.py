@@ -1,9 +1,15 @@
-from fastapi import FastAPI, Request
+# Importé en premier: en mode STARTUP_PROFILE, mesure les imports qui suivent
+from .core.startup import startup_profiler
+
+from fastapi import FastAPI, Request, Response, WebSocket, WebSocketDisconnect
+from fastapi.responses import JSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.trustedhost import TrustedHostMiddleware
 from fastapi.exceptions import RequestValidationError
 from starlette.exceptions import HTTPException as StarletteHTTPException
 from contextlib import asynccontextmanager
+import asyncio
+from prometheus_client import CONTENT_TYPE_LATEST, generate_latest
 import logging
 import time
 
@@ -15,8 +21,20 @@ from .core.exceptions import (
     http_exception_handler,
     general_exception_handler
 )
+from .core.rate_limit import RateLimitMiddleware
+from .core.tracing import TracedJSONResponse, TracingMiddleware, trace_exporter
+from .services.block_indexer import block_indexer
 from .services.cache_service import cache_service
+from .services.database import database
+from .services.event_hub import event_hub
+from .services.notification_service import kaspa_notifications
+from .services.price_engine import price_engine
+from .services.rpc_pool import kaspa_rpc_pool
+from .services.snapshot_store import snapshot_store
+from .services.wallet_crypto import wallet_crypto_pool
+from .services.wallet_repository import wallet_repository
 from .api.v1.router import api_router
+from shared.loop_monitor import LoopMonitor
 
 # Configuration logging
 logging.basicConfig(
@@ -25,20 +43,76 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Retard de boucle et callbacks bloquants (métriques exposées sur /metrics)
+loop_monitor = LoopMonitor(
+    interval=settings.LOOP_LAG_INTERVAL,
+    slow_callback_threshold=settings.SLOW_CALLBACK_THRESHOLD
+)
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     # Startup
     logger.info("Starting KaspaZof API...")
     
-    # Initialiser les services
-    await cache_service.connect()
+    # Démarrée en premier pour couvrir aussi l'initialisation
+    if settings.LOOP_MONITOR_ENABLED:
+        loop_monitor.start()
+    
+    # Redis en tâche de fond: le worker est prêt sans attendre le délai de connexion
+    cache_service.start()
+    
+    # Pool PostgreSQL ouvert en tâche de fond (connexions préparées avant les requêtes)
+    database.start()
+    
+    # Initialisations indépendantes en parallèle (snapshots locaux, wallets, index de blocs)
+    async def init_snapshots():
+        with startup_profiler.step("snapshot_store"):
+            await snapshot_store.initialize()
+        snapshot_store.start()
     
+    async def init_wallets():
+        with startup_profiler.step("wallet_repository"):
+            await wallet_repository.initialize()
+    
+    async def init_block_index():
+        if settings.BLOCK_INDEX_ENABLED:
+            with startup_profiler.step("block_indexer"):
+                await block_indexer.start()
+    
+    await asyncio.gather(init_snapshots(), init_wallets(), init_block_index())
+    
+    with startup_profiler.step("background_services"):
+        wallet_crypto_pool.start()
+        kaspa_rpc_pool.start()
+        trace_exporter.start()
+        price_engine.start()
+        
+        # Flux de notifications kaspad (blocs, score DAA, UTXOs des wallets)
+        if settings.KASPA_NOTIFICATIONS_ENABLED:
+            await kaspa_notifications.track_addresses(wallet_repository.addresses())
+            kaspa_notifications.start()
+        
+        # Indexeur local du DAG (réveillé par les notifications de blocs)
+        if settings.BLOCK_INDEX_ENABLED:
+            kaspa_notifications.add_block_listener(block_indexer.notify_block)
+    
+    startup_profiler.mark_ready()
     logger.info("KaspaZof API started successfully")
     yield
     
     # Shutdown
     logger.info("Shutting down KaspaZof API...")
+    await kaspa_notifications.stop()
+    await block_indexer.stop()
+    await kaspa_rpc_pool.close()
+    await price_engine.stop()
     await cache_service.disconnect()
+    await database.close()
+    await snapshot_store.stop()
+    await trace_exporter.stop()
+    wallet_crypto_pool.shutdown()
+    await wallet_repository.close()
+    await loop_monitor.stop()
     logger.info("KaspaZof API shutdown complete")
 
 # Créer l'application FastAPI
@@ -49,15 +123,22 @@ app = FastAPI(
     openapi_url=f"{settings.API_V1_STR}/openapi.json" if settings.DEBUG else None,
     docs_url="/docs" if settings.DEBUG else None,
     redoc_url="/redoc" if settings.DEBUG else None,
+    default_response_class=TracedJSONResponse,
     lifespan=lifespan
 )
 
 # Middleware de sécurité
 app.add_middleware(
     TrustedHostMiddleware,
-    allowed_hosts=["localhost", "127.0.0.1", "*.localhost"] if settings.DEBUG else ["yourdomain.com"]
+    allowed_hosts=(
+        ["localhost", "127.0.0.1", "*.localhost"] if settings.DEBUG else ["yourdomain.com"]
+    ) + settings.ALLOWED_HOSTS
 )
 
+# Limitation de débit par client et par route
+if settings.RATE_LIMIT_ENABLED:
+    app.add_middleware(RateLimitMiddleware)
+
 # CORS
 app.add_middleware(
     CORSMiddleware,
@@ -67,21 +148,39 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Middleware de logging des requêtes
-@app.middleware("http")
-async def log_requests(request: Request, call_next):
-    start_time = time.time()
+# Middleware de logging des requêtes (ASGI pur: les déconnexions restent visibles des flux SSE)
+class RequestLoggingMiddleware:
+    def __init__(self, app):
+        self.app = app
     
-    # Log de la requête
-    logger.info(f"Request: {request.method} {request.url}")
-    
-    response = await call_next(request)
-    
-    # Log de la réponse
-    process_time = time.time() - start_time
-    logger.info(f"Response: {response.status_code} - {process_time:.3f}s")
-    
-    return response
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        
+        start_time = time.time()
+        
+        # Log de la requête
+        logger.info(f"Request: {scope['method']} {Request(scope).url}")
+        
+        status_code = 500
+        
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                # Log de la réponse (dès l'envoi des en-têtes)
+                process_time = time.time() - start_time
+                logger.info(f"Response: {status_code} - {process_time:.3f}s")
+            await send(message)
+        
+        await self.app(scope, receive, send_wrapper)
+
+# Traçage par requête (en-tête Server-Timing)
+if settings.TRACING_ENABLED:
+    app.add_middleware(TracingMiddleware)
+
+app.add_middleware(RequestLoggingMiddleware)
 
 # Gestionnaires d'exceptions
 app.add_exception_handler(KaspaZofException, kaspazof_exception_handler)
@@ -103,6 +202,47 @@ async def health_check():
         "environment": settings.ENVIRONMENT
     }
 
+# Readiness: le worker peut recevoir du trafic (distinct de /health, la liveness)
+@app.get("/ready")
+async def readiness_check():
+    """Readiness check: initialisation terminée et dépendances requises disponibles"""
+    components = {
+        "startup": startup_profiler.ready_at is not None,
+        "wallet_store": wallet_repository.initialized,
+        "block_index": block_indexer.is_open if settings.BLOCK_INDEX_ENABLED else None,
+        # Optionnels: l'API fonctionne en mode dégradé sans eux
+        "redis": cache_service.connected,
+        "kaspa_notifications": kaspa_notifications.connected if settings.KASPA_NOTIFICATIONS_ENABLED else None
+    }
+    required = ("startup", "wallet_store", "block_index")
+    ready = all(components[name] is not False for name in required)
+    
+    content = {
+        "status": "ready" if ready else "starting",
+        "components": components
+    }
+    if startup_profiler.enabled:
+        content["startup_profile"] = startup_profiler.report()
+    return JSONResponse(status_code=200 if ready else 503, content=content)
+
+# WebSocket temps réel (événements poussés par le hub)
+@app.websocket("/ws")
+async def websocket_endpoint(websocket: WebSocket):
+    await event_hub.connect(websocket)
+    try:
+        while True:
+            await websocket.receive_text()
+    except WebSocketDisconnect:
+        pass
+    finally:
+        event_hub.disconnect(websocket)
+
+# Métriques Prometheus
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    """Endpoint pour les métriques Prometheus"""
+    return Response(content=generate_latest(), headers={"Content-Type": CONTENT_TYPE_LATEST})
+
 # Root endpoint
 @app.get("/")
 async def root():
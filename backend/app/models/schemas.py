@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field, validator
-from typing import Optional, List
+from typing import Dict, Optional, List
 from datetime import datetime
 from enum import Enum
 
@@ -37,6 +37,9 @@ class WalletCreate(BaseModel):
             raise ValueError('Password must be at least 8 characters')
         return v
 
+class WalletUnlock(BaseModel):
+    password: str = Field(..., min_length=1, max_length=128)
+
 class WalletResponse(BaseModel):
     id: str
     label: str
@@ -48,6 +51,19 @@ class WalletResponse(BaseModel):
 class WalletList(BaseResponse):
     wallets: List[WalletResponse]
     total: int
+    offset: int = 0
+    limit: Optional[int] = None
+
+class BalanceRequest(BaseModel):
+    addresses: List[str] = Field(..., min_length=1, max_length=10000)
+
+class AddressBalance(BaseModel):
+    address: str
+    balance: float
+    balance_sompi: int
+
+class BalancesResponse(BaseResponse):
+    data: List[AddressBalance]
 
 # Price models
 class PriceData(BaseModel):
@@ -61,6 +77,18 @@ class PriceData(BaseModel):
 class PriceResponse(BaseResponse):
     data: PriceData
 
+class PriceQuoteData(BaseModel):
+    price: float
+    change_24h: Optional[float] = None
+    volume_24h: Optional[float] = None
+    market_cap: Optional[float] = None
+    last_updated: datetime
+    sources: List[str] = []
+
+class PriceTableResponse(BaseResponse):
+    # actif -> devise -> cotation
+    data: Dict[str, Dict[str, PriceQuoteData]]
+
 # Node models
 class NodeInfo(BaseModel):
     is_synced: bool
@@ -74,6 +102,29 @@ class NodeInfo(BaseModel):
 class NodeStatusResponse(BaseResponse):
     data: NodeInfo
 
+class BlockHeader(BaseModel):
+    hash: str
+    daa_score: int
+    blue_score: int
+    timestamp: int
+    tx_count: int
+    parents: List[str]
+
+class BlockListResponse(BaseResponse):
+    data: List[BlockHeader]
+
+# Mining models (tables de mining-monitor/init.sql)
+class MiningStatsSample(BaseModel):
+    timestamp: datetime
+    hashrate: float = Field(0.0, ge=0)
+    difficulty: float = Field(0.0, ge=0)
+    block_height: int = Field(0, ge=0)
+    blocks_found: int = Field(0, ge=0)
+    shares_submitted: int = Field(0, ge=0)
+    peer_count: int = Field(0, ge=0)
+    mining_address: Optional[str] = Field(None, max_length=255)
+    miner_id: Optional[str] = Field(None, max_length=100)
+
 # System models
 class ServiceStatus(BaseModel):
     name: str
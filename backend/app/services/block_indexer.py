@@ -0,0 +1,228 @@
+import asyncio
+import logging
+import os
+import sqlite3
+import threading
+from collections import deque
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+
+from ..core.config import settings
+from .kaspa_service import KaspaService
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS blocks (
+    hash TEXT PRIMARY KEY,
+    daa_score INTEGER NOT NULL,
+    blue_score INTEGER NOT NULL,
+    timestamp INTEGER NOT NULL,
+    tx_count INTEGER NOT NULL,
+    parents TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_blocks_daa_score ON blocks(daa_score);
+CREATE INDEX IF NOT EXISTS idx_blocks_timestamp ON blocks(timestamp);
+CREATE TABLE IF NOT EXISTS indexer_meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
+
+COLUMNS = ("hash", "daa_score", "blue_score", "timestamp", "tx_count", "parents")
+# Types d'export (timestamp en ms, parents joints par des virgules)
+COLUMN_TYPES = ("string", "int64", "int64", "int64", "int64", "string")
+
+def parse_block(block: Dict[str, Any]) -> Optional[Tuple]:
+    """Extrait l'en-tête compact d'un bloc kaspad (None si incomplet)"""
+    header = block.get("header") or {}
+    verbose = block.get("verboseData") or {}
+    block_hash = verbose.get("hash") or header.get("hash")
+    if not block_hash:
+        return None
+
+    parents = []
+    levels = header.get("parents") or []
+    if levels:
+        parents = levels[0].get("parentHashes", [])
+
+    return (
+        block_hash,
+        int(header.get("daaScore", 0)),
+        int(header.get("blueScore", 0)),
+        int(header.get("timestamp", 0)),
+        len(verbose.get("transactionIds") or block.get("transactions") or []),
+        ",".join(parents)
+    )
+
+def row_to_dict(row: Tuple) -> Dict[str, Any]:
+    data = dict(zip(COLUMNS, row))
+    data["parents"] = data["parents"].split(",") if data["parents"] else []
+    return data
+
+class BlockIndexer:
+    """Indexeur incrémental du DAG: en-têtes compacts dans SQLite, servis sans toucher au nœud"""
+
+    def __init__(self, db_path: str = None, kaspa_service: KaspaService = None):
+        self.db_path = db_path or settings.BLOCK_INDEX_DB_PATH
+        self.kaspa_service = kaspa_service or KaspaService()
+        self.retention = settings.BLOCK_INDEX_RETENTION
+        self.poll_interval = settings.BLOCK_INDEX_POLL_INTERVAL
+        self.recent = deque(maxlen=settings.BLOCK_INDEX_RECENT_SIZE)
+        self.cursor: Optional[str] = None
+        self.indexed_blocks = 0
+        self._conn: Optional[sqlite3.Connection] = None
+        self._db_lock = threading.Lock()
+        self._wakeup = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+
+    async def start(self):
+        """Ouvre la base, recharge le flux récent et lance le suivi du DAG"""
+        await asyncio.to_thread(self._open)
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self._conn:
+            await asyncio.to_thread(self._conn.close)
+            self._conn = None
+
+    def _open(self):
+        os.makedirs(os.path.dirname(self.db_path) or ".", exist_ok=True)
+        conn = sqlite3.connect(self.db_path, check_same_thread=False, isolation_level=None)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.executescript(SCHEMA)
+        self._conn = conn
+
+        row = conn.execute("SELECT value FROM indexer_meta WHERE key = 'cursor'").fetchone()
+        self.cursor = row[0] if row else None
+        rows = conn.execute(
+            f"SELECT {', '.join(COLUMNS)} FROM blocks ORDER BY daa_score DESC LIMIT ?",
+            (self.recent.maxlen,)
+        ).fetchall()
+        self.recent.extend(row_to_dict(row) for row in reversed(rows))
+
+    @property
+    def is_open(self) -> bool:
+        return self._conn is not None
+
+    def notify_block(self, block: Dict[str, Any]):
+        """Appelé sur notification block-added: réveille la boucle de synchronisation"""
+        self._wakeup.set()
+
+    async def _run(self):
+        while True:
+            try:
+                added = await self.sync_once()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Block indexer sync failed: {e}")
+                added = 0
+
+            # À jour: attendre un nouveau bloc (notification) ou l'intervalle de secours
+            if added == 0:
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=self.poll_interval)
+                except asyncio.TimeoutError:
+                    pass
+                self._wakeup.clear()
+
+    async def sync_once(self) -> int:
+        """Indexe les blocs ajoutés depuis le curseur; retourne le nombre de nouveaux blocs"""
+        if self.cursor is None:
+            # Premier démarrage: suivre le DAG à partir du sommet actuel
+            dag_info = await self.kaspa_service._make_rpc_call("getBlockDagInfo")
+            self.cursor = dag_info.get("sink") or (dag_info.get("tipHashes") or [None])[0]
+            if not self.cursor:
+                return 0
+
+        result = await self.kaspa_service._make_rpc_call("getBlocks", {
+            "lowHash": self.cursor,
+            "includeBlocks": True,
+            "includeTransactions": False
+        })
+
+        rows = [row for row in map(parse_block, result.get("blocks") or []) if row and row[0] != self.cursor]
+        if not rows:
+            return 0
+
+        rows.sort(key=lambda row: row[1])
+        cursor = rows[-1][0]
+        await asyncio.to_thread(self._store, rows, cursor)
+        self.cursor = cursor
+        self.indexed_blocks += len(rows)
+        self.recent.extend(row_to_dict(row) for row in rows)
+        return len(rows)
+
+    def _store(self, rows: List[Tuple], cursor: str):
+        with self._db_lock:
+            self._conn.execute("BEGIN")
+            try:
+                self._conn.executemany(
+                    "INSERT OR IGNORE INTO blocks VALUES (?, ?, ?, ?, ?, ?)", rows
+                )
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO indexer_meta VALUES ('cursor', ?)", (cursor,)
+                )
+                # Rétention bornée en nombre de scores DAA
+                self._conn.execute(
+                    "DELETE FROM blocks WHERE daa_score < ?", (rows[-1][1] - self.retention,)
+                )
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    async def get_range(
+        self, start: int, end: int, by: str = "daa", limit: int = 500
+    ) -> List[Dict[str, Any]]:
+        """Blocs dont le score DAA (ou le timestamp en ms) est dans [start, end]"""
+        column = "timestamp" if by == "time" else "daa_score"
+        rows = await asyncio.to_thread(self._select_range, column, start, end, limit)
+        return [row_to_dict(row) for row in rows]
+
+    def _select_range(self, column: str, start: int, end: int, limit: int) -> List[Tuple]:
+        with self._db_lock:
+            return self._conn.execute(
+                f"SELECT {', '.join(COLUMNS)} FROM blocks "
+                f"WHERE {column} BETWEEN ? AND ? ORDER BY {column} LIMIT ?",
+                (start, end, limit)
+            ).fetchall()
+
+    async def iter_range(
+        self, start: int, end: int, by: str = "daa", batch_size: int = 1000
+    ) -> AsyncIterator[List[Tuple]]:
+        """Parcourt une plage par lots via une connexion de lecture dédiée (instantané WAL)"""
+        column = "timestamp" if by == "time" else "daa_score"
+        conn = await asyncio.to_thread(
+            sqlite3.connect, f"file:{self.db_path}?mode=ro", uri=True, check_same_thread=False
+        )
+        try:
+            cursor = await asyncio.to_thread(
+                conn.execute,
+                f"SELECT {', '.join(COLUMNS)} FROM blocks "
+                f"WHERE {column} BETWEEN ? AND ? ORDER BY {column}",
+                (start, end)
+            )
+            while True:
+                rows = await asyncio.to_thread(cursor.fetchmany, batch_size)
+                if not rows:
+                    break
+                yield rows
+        finally:
+            await asyncio.to_thread(conn.close)
+
+    def get_recent(self, limit: int = 20) -> List[Dict[str, Any]]:
+        """Derniers blocs indexés, du plus récent au plus ancien"""
+        return list(self.recent)[-limit:][::-1]
+
+# Instance globale
+block_indexer = BlockIndexer()
@@ -1,17 +1,24 @@
 import aioredis
+import asyncio
 import json
 import logging
-from typing import Any, Optional, Dict
+from typing import Any, Optional, Dict, Iterable, List, Union
 from datetime import datetime, timezone
 
 from ..core.config import settings
+from ..core.tracing import traced
+from .snapshot_store import SnapshotStore, snapshot_store
 
 logger = logging.getLogger(__name__)
 
 class CacheService:
-    def __init__(self):
+    def __init__(self, snapshots: Optional[SnapshotStore] = None):
         self.redis_client: Optional[aioredis.Redis] = None
         self.connected = False
+        # Copie locale des snapshots, servie tant qu'ils sont frais si Redis est indisponible
+        self.snapshots = snapshots
+        self.max_reconnect_delay = 30.0
+        self._connect_task: Optional[asyncio.Task] = None
         
     async def connect(self):
         """Initialise la connexion Redis"""
@@ -35,17 +42,39 @@ class CacheService:
             self.connected = False
             self.redis_client = None
     
+    def start(self):
+        """Connexion Redis en tâche de fond: le démarrage n'attend pas Redis"""
+        if self._connect_task is None or self._connect_task.done():
+            self._connect_task = asyncio.create_task(self._connect_loop())
+    
+    async def _connect_loop(self):
+        delay = 1.0
+        while not self.connected:
+            await self.connect()
+            if self.connected:
+                return
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, self.max_reconnect_delay)
+    
     async def disconnect(self):
         """Ferme la connexion Redis"""
+        if self._connect_task:
+            self._connect_task.cancel()
+            try:
+                await self._connect_task
+            except asyncio.CancelledError:
+                pass
+            self._connect_task = None
         if self.redis_client:
             await self.redis_client.close()
             self.connected = False
             logger.info("Redis cache disconnected")
     
+    @traced("cache.get")
     async def get(self, key: str) -> Optional[Dict[str, Any]]:
         """Récupère une valeur du cache"""
         if not self.connected or not self.redis_client:
-            return None
+            return self._local(key)
             
         try:
             data = await self.redis_client.get(key)
@@ -60,10 +89,16 @@ class CacheService:
             return None
         except Exception as e:
             logger.error(f"Cache get error for key {key}: {e}")
-            return None
+            return self._local(key)
     
+    def _local(self, key: str) -> Optional[Dict[str, Any]]:
+        return self.snapshots.get(key) if self.snapshots else None
+    
+    @traced("cache.set")
     async def set(self, key: str, value: Dict[str, Any], ttl: int = 300) -> bool:
         """Stocke une valeur dans le cache"""
+        if self.snapshots:
+            self.snapshots.put(key, value, ttl)
         if not self.connected or not self.redis_client:
             return False
             
@@ -83,8 +118,11 @@ class CacheService:
             logger.error(f"Cache set error for key {key}: {e}")
             return False
     
+    @traced("cache.delete")
     async def delete(self, key: str) -> bool:
         """Supprime une clé du cache"""
+        if self.snapshots:
+            self.snapshots.expire(key)
         if not self.connected or not self.redis_client:
             return False
             
@@ -95,6 +133,7 @@ class CacheService:
             logger.error(f"Cache delete error for key {key}: {e}")
             return False
     
+    @traced("cache.exists")
     async def exists(self, key: str) -> bool:
         """Vérifie si une clé existe"""
         if not self.connected or not self.redis_client:
@@ -107,6 +146,86 @@ class CacheService:
             logger.error(f"Cache exists error for key {key}: {e}")
             return False
     
+    @traced("cache.get_many")
+    async def get_many(self, keys: Iterable[str]) -> Dict[str, Optional[Dict[str, Any]]]:
+        """Récupère plusieurs valeurs en un seul aller-retour (MGET)"""
+        keys = list(keys)
+        result: Dict[str, Optional[Dict[str, Any]]] = dict.fromkeys(keys)
+        if not keys:
+            return result
+        if not self.connected or not self.redis_client:
+            return {key: self._local(key) for key in keys}
+            
+        try:
+            values = await self.redis_client.mget(keys)
+        except Exception as e:
+            logger.error(f"Cache mget error for keys {keys}: {e}")
+            return {key: self._local(key) for key in keys}
+        
+        corrupted: List[str] = []
+        for key, data in zip(keys, values):
+            if not data:
+                continue
+            try:
+                result[key] = json.loads(data)
+            except json.JSONDecodeError as e:
+                logger.error(f"Cache JSON decode error for key {key}: {e}")
+                corrupted.append(key)
+        
+        # Supprimer les clés corrompues en une seule commande
+        if corrupted:
+            await self.delete_many(corrupted)
+        
+        return result
+    
+    @traced("cache.set_many")
+    async def set_many(
+        self,
+        items: Dict[str, Dict[str, Any]],
+        ttl: Union[int, Dict[str, int]] = 300
+    ) -> bool:
+        """Stocke plusieurs valeurs via un pipeline, avec TTL global ou par clé"""
+        if self.snapshots:
+            for key, value in items.items():
+                self.snapshots.put(key, value, ttl.get(key, 300) if isinstance(ttl, dict) else ttl)
+        if not items or not self.connected or not self.redis_client:
+            return False
+            
+        try:
+            cached_at = datetime.now(timezone.utc).isoformat()
+            pipe = self.redis_client.pipeline(transaction=False)
+            for key, value in items.items():
+                key_ttl = ttl.get(key, 300) if isinstance(ttl, dict) else ttl
+                cache_data = {
+                    "data": value,
+                    "cached_at": cached_at,
+                    "ttl": key_ttl
+                }
+                pipe.setex(key, key_ttl, json.dumps(cache_data, default=str))
+            await pipe.execute()
+            return True
+            
+        except Exception as e:
+            logger.error(f"Cache set_many error for keys {list(items)}: {e}")
+            return False
+    
+    @traced("cache.delete_many")
+    async def delete_many(self, keys: Iterable[str]) -> int:
+        """Supprime plusieurs clés en une seule commande DEL"""
+        keys = list(keys)
+        if self.snapshots:
+            for key in keys:
+                self.snapshots.expire(key)
+        if not keys or not self.connected or not self.redis_client:
+            return 0
+            
+        try:
+            return await self.redis_client.delete(*keys)
+        except Exception as e:
+            logger.error(f"Cache delete_many error for keys {keys}: {e}")
+            return 0
+    
+    @traced("cache.clear_pattern")
     async def clear_pattern(self, pattern: str) -> int:
         """Supprime toutes les clés correspondant au pattern"""
         if not self.connected or not self.redis_client:
@@ -152,4 +271,4 @@ class CacheService:
             return False
 
 # Instance globale
-cache_service = CacheService()
\ No newline at end of file
+cache_service = CacheService(snapshot_store)
\ No newline at end of file
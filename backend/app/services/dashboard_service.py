@@ -0,0 +1,155 @@
+import httpx
+import asyncio
+from typing import Any, Dict, Iterable, List, Set, Tuple
+import logging
+
+from ..core.config import settings
+from .kaspa_service import block_summary
+
+logger = logging.getLogger(__name__)
+
+# Widgets disponibles et clés de snapshot associées
+DASHBOARD_WIDGETS = {
+    "price": "kaspa_price_data",
+    "node": "dashboard:node",
+    "block": "dashboard:block",
+    "system": "dashboard:system",
+    "mining": "dashboard:mining"
+}
+
+# Rafraîchissements de widgets en arrière-plan (partagés entre les requêtes)
+_refreshing: Set[str] = set()
+_background_tasks: Set[asyncio.Task] = set()
+
+class DashboardService:
+    def __init__(self, cache_service, kaspa_service, price_service, system_service):
+        self.cache_service = cache_service
+        self.kaspa_service = kaspa_service
+        self.price_service = price_service
+        self.system_service = system_service
+        self.timeout = 5.0
+        # Durée de vie des snapshots par widget (secondes)
+        self.snapshot_ttls = {
+            "price": 300,
+            "node": 10,
+            "block": 5,
+            "system": 30,
+            "mining": 15
+        }
+        self._fetchers = {
+            "price": self._fetch_price,
+            "node": self._fetch_node,
+            "block": self._fetch_block,
+            "system": self._fetch_system,
+            "mining": self._fetch_mining
+        }
+
+    async def get_dashboard(
+        self, widgets: Iterable[str]
+    ) -> Tuple[Dict[str, Any], Dict[str, str], List[str]]:
+        """Assemble les widgets demandés depuis le cache, en un seul aller-retour Redis"""
+        widgets = list(widgets)
+        cached = await self.cache_service.get_many(DASHBOARD_WIDGETS[w] for w in widgets)
+
+        data: Dict[str, Any] = {}
+        missing = []
+        for widget in widgets:
+            entry = cached.get(DASHBOARD_WIDGETS[widget])
+            if entry and "data" in entry:
+                data[widget] = entry["data"]
+            else:
+                missing.append(widget)
+
+        errors: Dict[str, str] = {}
+        stale: List[str] = []
+        if not missing:
+            return data, errors, stale
+
+        # Dernière valeur connue (snapshot local): réponse immédiate, rafraîchie en arrière-plan
+        snapshots = self.cache_service.snapshots
+        to_fetch = []
+        for widget in missing:
+            entry = snapshots.get_stale(DASHBOARD_WIDGETS[widget]) if snapshots else None
+            if entry:
+                data[widget] = entry["data"]
+                stale.append(widget)
+            else:
+                to_fetch.append(widget)
+        if stale:
+            self._refresh_in_background(stale)
+
+        if to_fetch:
+            fresh, fetch_errors = await self._fetch_widgets(to_fetch)
+            data.update(fresh)
+            errors.update(fetch_errors)
+
+        return data, errors, stale
+
+    async def _fetch_widgets(
+        self, widgets: List[str]
+    ) -> Tuple[Dict[str, Any], Dict[str, str]]:
+        """Récupère les widgets en parallèle puis les met en cache"""
+        results = await asyncio.gather(
+            *(self._fetchers[widget]() for widget in widgets),
+            return_exceptions=True
+        )
+
+        data: Dict[str, Any] = {}
+        errors: Dict[str, str] = {}
+        fresh: Dict[str, Dict[str, Any]] = {}
+        ttls: Dict[str, int] = {}
+        for widget, result in zip(widgets, results):
+            if isinstance(result, Exception):
+                logger.warning(f"Dashboard widget {widget} unavailable: {result}")
+                data[widget] = None
+                errors[widget] = getattr(result, "message", str(result))
+            else:
+                data[widget] = result
+                fresh[DASHBOARD_WIDGETS[widget]] = result
+                ttls[DASHBOARD_WIDGETS[widget]] = self.snapshot_ttls[widget]
+
+        if fresh:
+            await self.cache_service.set_many(fresh, ttl=ttls)
+
+        return data, errors
+
+    def _refresh_in_background(self, widgets: List[str]):
+        # Un seul rafraîchissement en cours par widget
+        pending = [widget for widget in widgets if widget not in _refreshing]
+        if not pending:
+            return
+        _refreshing.update(pending)
+
+        async def refresh():
+            try:
+                await self._fetch_widgets(pending)
+            finally:
+                _refreshing.difference_update(pending)
+
+        task = asyncio.create_task(refresh())
+        _background_tasks.add(task)
+        task.add_done_callback(_background_tasks.discard)
+
+    async def _fetch_price(self) -> Dict[str, Any]:
+        price_data = await self.price_service.get_kaspa_price()
+        return price_data.dict()
+
+    async def _fetch_node(self) -> Dict[str, Any]:
+        node_info = await self.kaspa_service.get_node_info()
+        return node_info.dict()
+
+    async def _fetch_block(self) -> Dict[str, Any]:
+        return block_summary(await self.kaspa_service.get_block_info())
+
+    async def _fetch_system(self) -> Dict[str, Any]:
+        system_info = await self.system_service.get_system_info()
+        return system_info.dict()
+
+    async def _fetch_mining(self) -> Dict[str, Any]:
+        async with httpx.AsyncClient() as client:
+            response = await client.get(
+                f"{settings.MINING_MONITOR_URL}/stats",
+                timeout=self.timeout
+            )
+            response.raise_for_status()
+            return response.json()
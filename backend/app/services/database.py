@@ -0,0 +1,232 @@
+import asyncio
+import json
+import logging
+import time
+from contextlib import asynccontextmanager
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import asyncpg
+
+from ..core.config import settings
+from ..core.exceptions import DatabaseException
+from ..core.tracing import span
+
+logger = logging.getLogger(__name__)
+
+# Requêtes fréquentes (tables de mining-monitor/init.sql): texte fixe, donc préparées
+# une seule fois par connexion puis réutilisées via le cache d'asyncpg
+STATEMENTS = {
+    "mining_stats_latest": """
+        SELECT timestamp, hashrate, difficulty, block_height, blocks_found,
+               shares_submitted, peer_count, mining_address, miner_id
+        FROM mining_stats
+        ORDER BY timestamp DESC
+        LIMIT 1
+    """,
+    "mining_stats_range": """
+        SELECT timestamp, hashrate, difficulty, block_height, blocks_found,
+               shares_submitted, peer_count, miner_id
+        FROM mining_stats
+        WHERE timestamp >= $1 AND timestamp < $2
+        ORDER BY timestamp
+        LIMIT $3
+    """,
+    "blocks_found_recent": """
+        SELECT timestamp, block_hash, block_height, difficulty, reward, mining_address, miner_id
+        FROM blocks_found
+        ORDER BY timestamp DESC
+        LIMIT $1
+    """,
+    "mining_events_recent": """
+        SELECT timestamp, event_type, description, miner_id, data
+        FROM mining_events
+        WHERE $1::text IS NULL OR event_type = $1::text
+        ORDER BY timestamp DESC
+        LIMIT $2
+    """
+}
+
+DATABASE_ERRORS = (
+    asyncpg.PostgresError,
+    asyncpg.InterfaceError,
+    asyncpg.InternalClientError,
+    OSError,
+    asyncio.TimeoutError
+)
+
+def _asyncpg_dsn(url: Optional[str]) -> Optional[str]:
+    # postgresql+asyncpg://... (URL SQLAlchemy) -> postgresql://...
+    if url and "+" in url.split("://", 1)[0]:
+        return url.split("+", 1)[0] + "://" + url.split("://", 1)[1]
+    return url
+
+class Database:
+    """
+    Pool asyncpg partagé par toute l'application: connexions ouvertes une
+    fois, requêtes préparées conservées par connexion (statement cache),
+    et COPY binaire pour les insertions en masse.
+    """
+
+    def __init__(self, dsn: Optional[str] = None):
+        self.dsn = _asyncpg_dsn(dsn if dsn is not None else settings.DATABASE_URL)
+        self.pool: Optional[asyncpg.Pool] = None
+        self.max_reconnect_delay = 30.0
+        self._connect_task: Optional[asyncio.Task] = None
+        self.queries = 0
+        self.errors = 0
+        self.last_latency_ms: Optional[float] = None
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.dsn)
+
+    async def connect(self):
+        """Ouvre le pool (min_size connexions établies et préparées)"""
+        try:
+            self.pool = await asyncpg.create_pool(
+                self.dsn,
+                min_size=settings.DATABASE_POOL_MIN_SIZE,
+                max_size=settings.DATABASE_POOL_MAX_SIZE,
+                command_timeout=settings.DATABASE_COMMAND_TIMEOUT,
+                statement_cache_size=settings.DATABASE_STATEMENT_CACHE_SIZE,
+                max_inactive_connection_lifetime=settings.DATABASE_MAX_IDLE_TIME,
+                timeout=settings.DATABASE_CONNECT_TIMEOUT,
+                init=self._init_connection
+            )
+            logger.info(
+                f"PostgreSQL pool ready ({settings.DATABASE_POOL_MIN_SIZE}-{settings.DATABASE_POOL_MAX_SIZE} connections)"
+            )
+        except DATABASE_ERRORS as e:
+            logger.warning(f"PostgreSQL connection failed: {e}")
+            self.pool = None
+
+    def start(self):
+        """Connexion en tâche de fond: le démarrage n'attend pas PostgreSQL"""
+        if not self.enabled:
+            logger.info("DATABASE_URL not set, PostgreSQL disabled")
+            return
+        if self._connect_task is None or self._connect_task.done():
+            self._connect_task = asyncio.create_task(self._connect_loop())
+
+    async def _connect_loop(self):
+        delay = 1.0
+        while self.pool is None:
+            await self.connect()
+            if self.pool is not None:
+                return
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, self.max_reconnect_delay)
+
+    async def close(self):
+        if self._connect_task:
+            self._connect_task.cancel()
+            try:
+                await self._connect_task
+            except asyncio.CancelledError:
+                pass
+            self._connect_task = None
+        if self.pool:
+            await self.pool.close()
+            self.pool = None
+            logger.info("PostgreSQL pool closed")
+
+    async def _init_connection(self, conn: asyncpg.Connection):
+        # Codec binaire (version 1 + texte JSON): utilisable aussi par COPY
+        await conn.set_type_codec(
+            "jsonb",
+            encoder=lambda value: b"\x01" + json.dumps(value).encode(),
+            decoder=lambda data: json.loads(data[1:]),
+            schema="pg_catalog",
+            format="binary"
+        )
+
+    @asynccontextmanager
+    async def acquire(self):
+        """Connexion du pool; les erreurs PostgreSQL deviennent des DatabaseException"""
+        if self.pool is None:
+            raise DatabaseException("Database unavailable")
+        self.queries += 1
+        try:
+            async with self.pool.acquire() as conn:
+                yield conn
+        except DATABASE_ERRORS as e:
+            self.errors += 1
+            logger.error(f"Database error: {e}")
+            raise DatabaseException(f"Database error: {e.__class__.__name__}")
+
+    async def fetch(self, name: str, *args) -> List[asyncpg.Record]:
+        """Exécute une requête de STATEMENTS"""
+        query = self._query(name)
+        with span("db.fetch", statement=name):
+            async with self.acquire() as conn:
+                return await conn.fetch(query, *args)
+
+    async def fetchrow(self, name: str, *args) -> Optional[asyncpg.Record]:
+        query = self._query(name)
+        with span("db.fetch", statement=name):
+            async with self.acquire() as conn:
+                return await conn.fetchrow(query, *args)
+
+    @staticmethod
+    def _query(name: str) -> str:
+        if name not in STATEMENTS:
+            raise DatabaseException(f"Unknown statement: {name}")
+        return STATEMENTS[name]
+
+    async def execute(self, query: str, *args) -> str:
+        """Requête ad hoc (mise en cache préparée par asyncpg)"""
+        with span("db.execute"):
+            async with self.acquire() as conn:
+                return await conn.execute(query, *args)
+
+    async def copy_records(
+        self,
+        table: str,
+        columns: Sequence[str],
+        records: Iterable[Tuple[Any, ...]],
+        schema: Optional[str] = None
+    ) -> int:
+        """Insertion en masse via COPY (protocole binaire); renvoie le nombre de lignes"""
+        with span("db.copy", table=table):
+            async with self.acquire() as conn:
+                status = await conn.copy_records_to_table(
+                    table,
+                    records=records,
+                    columns=list(columns),
+                    schema_name=schema
+                )
+        return int(status.split()[-1])
+
+    async def probe(self) -> Tuple[bool, Optional[float]]:
+        """Aller-retour réel (acquisition + SELECT 1) et sa latence en ms"""
+        if self.pool is None:
+            return False, None
+        timeout = settings.DATABASE_HEALTH_TIMEOUT
+        started = time.perf_counter()
+        try:
+            async with self.pool.acquire(timeout=timeout) as conn:
+                await conn.fetchval("SELECT 1", timeout=timeout)
+        except DATABASE_ERRORS as e:
+            logger.warning(f"Database health check failed: {e}")
+            return False, None
+        self.last_latency_ms = round((time.perf_counter() - started) * 1000, 2)
+        return True, self.last_latency_ms
+
+    def get_stats(self) -> Dict[str, Any]:
+        stats = {
+            "enabled": self.enabled,
+            "connected": self.pool is not None,
+            "queries": self.queries,
+            "errors": self.errors,
+            "last_latency_ms": self.last_latency_ms
+        }
+        if self.pool is not None:
+            stats.update({
+                "pool_size": self.pool.get_size(),
+                "pool_idle": self.pool.get_idle_size(),
+                "pool_max_size": self.pool.get_max_size()
+            })
+        return stats
+
+# Instance globale
+database = Database()
@@ -0,0 +1,116 @@
+import asyncio
+import json
+import logging
+import time
+from collections import deque
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional, Set
+
+from fastapi import WebSocket
+
+from ..core.config import settings
+
+logger = logging.getLogger(__name__)
+
+HEARTBEAT_FRAME = b": heartbeat\n\n"
+
+class EventHub:
+    """Diffuse les événements temps réel aux clients WebSocket et SSE"""
+
+    def __init__(self, replay_size: int = None, heartbeat_interval: float = None):
+        self.connections: Set[WebSocket] = set()
+        self.subscribers: Set[asyncio.Queue] = set()
+        # Trames SSE déjà encodées, pour la reprise via Last-Event-ID
+        self.replay = deque(maxlen=replay_size or settings.SSE_REPLAY_SIZE)
+        self.heartbeat_interval = heartbeat_interval or settings.SSE_HEARTBEAT_INTERVAL
+        self.queue_size = settings.SSE_CLIENT_QUEUE_SIZE
+        # Identifiants en millisecondes depuis l'epoch: ils continuent de croître après
+        # un redémarrage, un Last-Event-ID d'avant le redémarrage reste donc plus ancien
+        self.last_event_id = int(time.time() * 1000)
+        self._heartbeat_task: Optional[asyncio.Task] = None
+
+    async def connect(self, websocket: WebSocket):
+        await websocket.accept()
+        self.connections.add(websocket)
+        logger.info(f"WebSocket connected. Total: {len(self.connections)}")
+
+    def disconnect(self, websocket: WebSocket):
+        self.connections.discard(websocket)
+        logger.info(f"WebSocket disconnected. Total: {len(self.connections)}")
+
+    def subscribe(self, last_event_id: Optional[int] = None) -> asyncio.Queue:
+        """Abonnement SSE; les événements manqués depuis last_event_id sont rejoués"""
+        queue = asyncio.Queue(maxsize=self.queue_size)
+        if last_event_id is not None:
+            missed = [frame for event_id, frame in self.replay if event_id > last_event_id]
+            oldest = self.replay[0][0] if self.replay else self.last_event_id + 1
+            stale = last_event_id < oldest - 1 or len(missed) >= self.queue_size
+            if stale or last_event_id > self.last_event_id:
+                # Trop ancien pour le tampon, ou émis par une autre instance: le client recharge son état
+                queue.put_nowait(self._encode_frame(None, "resync", {"last_event_id": self.last_event_id}))
+                missed = missed[-(self.queue_size // 2):]
+            for frame in missed:
+                queue.put_nowait(frame)
+
+        self.subscribers.add(queue)
+        if self._heartbeat_task is None or self._heartbeat_task.done():
+            self._heartbeat_task = asyncio.create_task(self._heartbeat_loop())
+        logger.info(f"SSE client connected. Total: {len(self.subscribers)}")
+        return queue
+
+    def unsubscribe(self, queue: asyncio.Queue):
+        self.subscribers.discard(queue)
+        logger.info(f"SSE client disconnected. Total: {len(self.subscribers)}")
+
+    async def _heartbeat_loop(self):
+        # Une seule tâche pour tous les clients SSE (aucun minuteur par client)
+        while self.subscribers:
+            await asyncio.sleep(self.heartbeat_interval)
+            self._broadcast_frame(HEARTBEAT_FRAME)
+
+    def _broadcast_frame(self, frame: bytes):
+        for queue in list(self.subscribers):
+            try:
+                queue.put_nowait(frame)
+            except asyncio.QueueFull:
+                # Client trop lent: il sera déconnecté puis reprendra via Last-Event-ID
+                logger.warning("SSE client too slow, dropping subscription")
+                self.subscribers.discard(queue)
+                while not queue.empty():
+                    queue.get_nowait()
+                queue.put_nowait(None)
+
+    @staticmethod
+    def _encode_frame(event_id: Optional[int], event: str, data: Any) -> bytes:
+        data = data if isinstance(data, str) else json.dumps(data, default=str)
+        prefix = f"id: {event_id}\n" if event_id is not None else ""
+        return f"{prefix}event: {event}\ndata: {data}\n\n".encode()
+
+    async def publish(self, event: str, payload: Dict[str, Any]):
+        """Encode l'événement une seule fois puis l'envoie à tous les clients"""
+        message = json.dumps({
+            "event": event,
+            "payload": payload,
+            "timestamp": datetime.now(timezone.utc).isoformat()
+        }, default=str)
+
+        self.last_event_id = max(self.last_event_id + 1, int(time.time() * 1000))
+        frame = self._encode_frame(self.last_event_id, event, message)
+        self.replay.append((self.last_event_id, frame))
+        self._broadcast_frame(frame)
+
+        if not self.connections:
+            return
+
+        connections = list(self.connections)
+        results = await asyncio.gather(
+            *(connection.send_text(message) for connection in connections),
+            return_exceptions=True
+        )
+        for connection, result in zip(connections, results):
+            if isinstance(result, Exception):
+                logger.warning(f"WebSocket send failed: {result}")
+                self.disconnect(connection)
+
+# Instance globale
+event_hub = EventHub()
@@ -1,51 +1,45 @@
-import httpx
 import asyncio
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional
 from datetime import datetime, timezone
 import logging
 
 from ..core.config import settings
 from ..core.exceptions import NodeException
+from ..core.tracing import span
 from ..models.schemas import NodeInfo, NetworkType
+from .rpc_pool import KaspaRpcPool, kaspa_rpc_pool
 
 logger = logging.getLogger(__name__)
 
+SOMPI_PER_KAS = 100_000_000
+
+def block_summary(block: Dict[str, Any]) -> Dict[str, Any]:
+    """Forme commune d'un bloc, qu'il vienne de getBlock ou d'une notification blockAdded"""
+    block = block.get("block", block)
+    header = block.get("header") or {}
+    return {
+        "hash": (block.get("verboseData") or {}).get("hash"),
+        "daa_score": header.get("daaScore"),
+        "blue_score": header.get("blueScore"),
+        "timestamp": header.get("timestamp"),
+        "tx_count": len(block.get("transactions") or [])
+    }
+
 class KaspaService:
-    def __init__(self):
-        self.rpc_url = settings.KASPA_RPC_URL
-        self.timeout = 10.0
+    def __init__(self, cache_service=None, rpc_pool: KaspaRpcPool = None):
+        self.rpc_pool = rpc_pool or kaspa_rpc_pool
+        self.cache_service = cache_service
+        self.address_chunk_size = settings.KASPA_ADDRESS_CHUNK_SIZE
+        self.max_concurrency = settings.KASPA_RPC_MAX_CONCURRENCY
+        self.balance_cache_ttl = 60
         
     async def _make_rpc_call(self, method: str, params: Dict[str, Any] = None) -> Dict[str, Any]:
-        """Effectue un appel RPC au nœud Kaspa"""
-        payload = {
-            "jsonrpc": "2.0",
-            "method": method,
-            "params": params or {},
-            "id": 1
-        }
-        
+        """Effectue un appel RPC via le pool de nœuds Kaspa"""
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.post(
-                    self.rpc_url,
-                    json=payload,
-                    timeout=self.timeout
-                )
-                response.raise_for_status()
-                data = response.json()
-                
-                if "error" in data:
-                    raise NodeException(f"RPC Error: {data['error']}")
-                
-                if "result" not in data:
-                    raise NodeException("Invalid RPC response format")
-                
-                return data["result"]
-                
-        except httpx.TimeoutException:
-            raise NodeException("Timeout connecting to Kaspa node")
-        except httpx.ConnectError:
-            raise NodeException("Cannot connect to Kaspa node")
+            with span("rpc", method=method):
+                return await self.rpc_pool.call(method, params)
+        except NodeException:
+            raise
         except Exception as e:
             logger.error(f"RPC call failed: {e}")
             raise NodeException(f"RPC call failed: {str(e)}")
@@ -132,6 +126,95 @@ class KaspaService:
             logger.error(f"Failed to get block info: {e}")
             raise NodeException("Failed to retrieve block information")
     
+    async def _chunked_address_call(self, method: str, addresses: List[str]) -> List[Dict[str, Any]]:
+        """Découpe les adresses en lots RPC exécutés avec un parallélisme borné"""
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        
+        async def call_chunk(chunk: List[str]) -> Dict[str, Any]:
+            async with semaphore:
+                return await self._make_rpc_call(method, {"addresses": chunk})
+        
+        chunks = [
+            addresses[i:i + self.address_chunk_size]
+            for i in range(0, len(addresses), self.address_chunk_size)
+        ]
+        return await asyncio.gather(*(call_chunk(chunk) for chunk in chunks))
+    
+    async def _block_marker(self) -> Any:
+        """Score DAA virtuel poussé par le flux de notifications s'il est connecté, sinon via RPC"""
+        # Import tardif: notification_service dépend de ce module
+        from .notification_service import kaspa_notifications
+        if kaspa_notifications.connected and kaspa_notifications.virtual_daa_score:
+            return kaspa_notifications.virtual_daa_score
+        dag_info = await self._make_rpc_call("getBlockDagInfo")
+        return dag_info.get("virtualDaaScore") or (dag_info.get("tipHashes") or ["none"])[0]
+
+    async def get_balances(self, addresses: List[str]) -> Dict[str, int]:
+        """Récupère les soldes (en sompi) de plusieurs adresses, mis en cache jusqu'au prochain bloc"""
+        addresses = list(dict.fromkeys(addresses))
+        if not addresses:
+            return {}
+        
+        try:
+            # Le score DAA virtuel identifie le bloc courant: un nouveau bloc invalide le cache
+            block_marker = await self._block_marker()
+            cache_keys = {address: f"balance:{block_marker}:{address}" for address in addresses}
+            
+            balances: Dict[str, int] = {}
+            if self.cache_service:
+                cached = await self.cache_service.get_many(cache_keys.values())
+                for address, key in cache_keys.items():
+                    entry = cached.get(key)
+                    if entry:
+                        balances[address] = entry["data"]["balance"]
+            
+            missing = [address for address in addresses if address not in balances]
+            if not missing:
+                return balances
+            
+            fresh: Dict[str, Dict[str, Any]] = {}
+            for result in await self._chunked_address_call("getBalancesByAddresses", missing):
+                for item in result.get("entries", []):
+                    address = item.get("address")
+                    if address not in cache_keys:
+                        continue
+                    balance = int(item.get("balance", 0))
+                    balances[address] = balance
+                    fresh[cache_keys[address]] = {"balance": balance}
+            
+            if self.cache_service and fresh:
+                await self.cache_service.set_many(fresh, ttl=self.balance_cache_ttl)
+            
+            # Conserver l'ordre des adresses demandées
+            return {address: balances[address] for address in addresses if address in balances}
+            
+        except NodeException:
+            raise
+        except Exception as e:
+            logger.error(f"Failed to get balances: {e}")
+            raise NodeException("Failed to retrieve address balances")
+    
+    async def get_utxos(self, addresses: List[str]) -> Dict[str, List[Dict[str, Any]]]:
+        """Récupère les UTXOs de plusieurs adresses, regroupés par adresse"""
+        addresses = list(dict.fromkeys(addresses))
+        utxos: Dict[str, List[Dict[str, Any]]] = {address: [] for address in addresses}
+        if not addresses:
+            return utxos
+        
+        try:
+            for result in await self._chunked_address_call("getUtxosByAddresses", addresses):
+                for item in result.get("entries", []):
+                    address = item.get("address")
+                    if address in utxos:
+                        utxos[address].append(item)
+            return utxos
+            
+        except NodeException:
+            raise
+        except Exception as e:
+            logger.error(f"Failed to get UTXOs: {e}")
+            raise NodeException("Failed to retrieve address UTXOs")
+    
     async def health_check(self) -> bool:
         """Vérifie si le nœud est accessible"""
         try:
@@ -0,0 +1,176 @@
+import asyncio
+import json
+import logging
+import random
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set
+
+import websockets
+
+from ..core.config import settings
+from .cache_service import CacheService, cache_service
+from .event_hub import EventHub, event_hub
+from .kaspa_service import KaspaService, block_summary
+
+logger = logging.getLogger(__name__)
+
+# Snapshots invalidés par un nouveau bloc
+BLOCK_SNAPSHOT_KEYS = ["dashboard:node", "dashboard:block"]
+
+class KaspaNotificationClient:
+    """Abonnement persistant au flux de notifications de kaspad (wRPC JSON)"""
+
+    def __init__(
+        self,
+        url: str = None,
+        cache: CacheService = cache_service,
+        hub: EventHub = event_hub,
+        kaspa_service: KaspaService = None
+    ):
+        self.url = url or settings.KASPA_WRPC_URL
+        self.cache = cache
+        self.hub = hub
+        self.kaspa_service = kaspa_service or KaspaService(cache)
+        self.tracked_addresses: Set[str] = set()
+        self.block_listeners: List[Callable[[Dict[str, Any]], None]] = []
+        self.connected = False
+        self.virtual_daa_score: Optional[int] = None
+        self.last_block_hash: Optional[str] = None
+        self.min_reconnect_delay = 1.0
+        self.max_reconnect_delay = 30.0
+        self._ws = None
+        self._task: Optional[asyncio.Task] = None
+        self._request_id = 0
+
+    def start(self):
+        """Démarre la boucle de connexion en tâche de fond"""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def add_block_listener(self, listener: Callable[[Dict[str, Any]], None]):
+        """Enregistre un callback appelé à chaque bloc notifié"""
+        self.block_listeners.append(listener)
+
+    async def track_addresses(self, addresses: Iterable[str]):
+        """Ajoute des adresses au suivi UTXO (abonnement immédiat si connecté)"""
+        new_addresses = set(addresses) - self.tracked_addresses
+        if not new_addresses:
+            return
+        self.tracked_addresses |= new_addresses
+        if self.connected:
+            try:
+                await self._send("notifyUtxosChanged", {"addresses": sorted(new_addresses)})
+            except Exception as e:
+                # Le réabonnement complet est fait à la reconnexion
+                logger.warning(f"UTXO subscription failed: {e}")
+
+    async def _run(self):
+        delay = self.min_reconnect_delay
+        while True:
+            try:
+                async with websockets.connect(self.url, ping_interval=20, ping_timeout=20) as ws:
+                    self._ws = ws
+                    self.connected = True
+                    delay = self.min_reconnect_delay
+                    logger.info(f"Kaspa notification stream connected: {self.url}")
+
+                    await self._subscribe_all()
+                    await self._resync()
+
+                    async for raw in ws:
+                        await self._dispatch(raw)
+
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Kaspa notification stream error: {e}")
+            finally:
+                self.connected = False
+                self._ws = None
+
+            # Backoff exponentiel avec gigue
+            await asyncio.sleep(delay + random.uniform(0, delay / 2))
+            delay = min(delay * 2, self.max_reconnect_delay)
+
+    async def _send(self, method: str, params: Dict[str, Any] = None):
+        self._request_id += 1
+        await self._ws.send(json.dumps({
+            "jsonrpc": "2.0",
+            "id": self._request_id,
+            "method": method,
+            "params": params or {}
+        }))
+
+    async def _subscribe_all(self):
+        await self._send("notifyBlockAdded")
+        await self._send("notifyVirtualDaaScoreChanged")
+        if self.tracked_addresses:
+            await self._send("notifyUtxosChanged", {"addresses": sorted(self.tracked_addresses)})
+
+    async def _resync(self):
+        """Rattrape l'état manqué pendant la déconnexion"""
+        await self.cache.delete_many(BLOCK_SNAPSHOT_KEYS)
+        try:
+            dag_info = await self.kaspa_service._make_rpc_call("getBlockDagInfo")
+            self.virtual_daa_score = int(dag_info.get("virtualDaaScore", 0)) or None
+        except Exception as e:
+            logger.warning(f"Kaspa notification resync failed: {e}")
+        await self.hub.publish("resync", {"virtual_daa_score": self.virtual_daa_score})
+
+    async def _dispatch(self, raw: str):
+        try:
+            message = json.loads(raw)
+        except (TypeError, ValueError):
+            logger.warning("Invalid notification payload from kaspad")
+            return
+
+        if "error" in message and message.get("error"):
+            logger.error(f"Kaspa subscription error: {message['error']}")
+            return
+
+        method = message.get("method")
+        params = message.get("params") or {}
+        if method == "blockAddedNotification":
+            await self._on_block_added(params.get("block") or {})
+        elif method == "virtualDaaScoreChangedNotification":
+            await self._on_daa_score_changed(params)
+        elif method == "utxosChangedNotification":
+            await self._on_utxos_changed(params)
+
+    async def _on_block_added(self, block: Dict[str, Any]):
+        summary = block_summary(block)
+        self.last_block_hash = summary["hash"]
+        for listener in self.block_listeners:
+            listener(block)
+
+        # Le nœud a changé: le prochain appel relira le statut; même forme que DashboardService
+        await self.cache.delete("dashboard:node")
+        await self.cache.set("dashboard:block", summary, ttl=5)
+        await self.hub.publish("block_added", summary)
+
+    async def _on_daa_score_changed(self, params: Dict[str, Any]):
+        try:
+            self.virtual_daa_score = int(params.get("virtualDaaScore"))
+        except (TypeError, ValueError):
+            return
+        await self.hub.publish("virtual_daa_score", {"virtual_daa_score": self.virtual_daa_score})
+
+    async def _on_utxos_changed(self, params: Dict[str, Any]):
+        addresses = set()
+        for key in ("added", "removed"):
+            for entry in params.get(key) or []:
+                if entry.get("address") in self.tracked_addresses:
+                    addresses.add(entry["address"])
+        if addresses:
+            await self.hub.publish("utxos_changed", {"addresses": sorted(addresses)})
+
+# Instance globale
+kaspa_notifications = KaspaNotificationClient()
@@ -0,0 +1,296 @@
+import asyncio
+import logging
+import statistics
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+import httpx
+
+from ..core.config import settings
+from ..core.exceptions import PriceException, ValidationException
+from ..core.tracing import traced
+from .price_sources import Pair, PriceSource, SourceQuote, build_sources
+
+logger = logging.getLogger(__name__)
+
+class PriceQuote:
+    """Cotation agrégée (médiane des sources concordantes)"""
+
+    __slots__ = ("price", "change_24h", "volume_24h", "market_cap", "updated_at", "fetched_at", "sources")
+
+    def __init__(
+        self,
+        price: float,
+        change_24h=None,
+        volume_24h=None,
+        market_cap=None,
+        updated_at: float = None,
+        fetched_at: float = None,
+        sources: List[str] = None
+    ):
+        self.price = price
+        self.change_24h = change_24h
+        self.volume_24h = volume_24h
+        self.market_cap = market_cap
+        # Horodatage de la source (affiché) et de la récupération (fraîcheur)
+        self.fetched_at = fetched_at or time.time()
+        self.updated_at = updated_at or self.fetched_at
+        self.sources = sources or []
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "price": self.price,
+            "change_24h": self.change_24h,
+            "volume_24h": self.volume_24h,
+            "market_cap": self.market_cap,
+            "last_updated": datetime.fromtimestamp(self.updated_at, timezone.utc),
+            "sources": self.sources
+        }
+
+class SourceState:
+    """Dernières cotations et santé d'une source"""
+
+    def __init__(self, source: PriceSource):
+        self.source = source
+        self.quotes: Dict[Pair, Tuple[SourceQuote, float]] = {}
+        self.requests = 0
+        self.errors = 0
+        self.late = 0
+        self.ewma_latency: Optional[float] = None
+        self.in_flight = False
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "requests": self.requests,
+            "errors": self.errors,
+            "late": self.late,
+            "ewma_latency_ms": round(self.ewma_latency * 1000, 2) if self.ewma_latency else None
+        }
+
+class PriceEngine:
+    """
+    Prix multi-actifs et multi-devises servis depuis la mémoire.
+    Toutes les paires demandées (tous clients confondus) sont regroupées
+    dans un seul appel par source et par rafraîchissement; les sources sont
+    interrogées en parallèle et agrégées par médiane avant une échéance,
+    les plus lentes complétant la table en arrière-plan.
+    """
+
+    def __init__(self, sources: List[PriceSource] = None):
+        self.sources = [SourceState(source) for source in (sources or build_sources(settings.PRICE_SOURCES))]
+        self.deadline = settings.PRICE_SOURCE_DEADLINE
+        self.outlier_threshold = settings.PRICE_OUTLIER_THRESHOLD
+        self.assets = {symbol.upper(): coin_id for symbol, coin_id in settings.PRICE_ASSETS.items()}
+        self.currencies = frozenset(currency.lower() for currency in settings.PRICE_CURRENCIES)
+        self.refresh_interval = settings.PRICE_REFRESH_INTERVAL
+        self.max_age = settings.PRICE_MAX_AGE
+        self.batch_window = settings.PRICE_BATCH_WINDOW
+        self.quotes: Dict[Pair, PriceQuote] = {}
+        # Paires rafraîchies à chaque cycle (préchargées + demandées par les clients)
+        self.wanted: Set[Pair] = {
+            (asset.upper(), currency)
+            for asset in settings.PRICE_PREFETCH_ASSETS
+            for currency in self.currencies
+        }
+        self.refreshes = 0
+        # Paires écartées comme aberrantes, par source (cumul et cycle en cours)
+        self.outliers: Dict[str, int] = {}
+        self._outliers: Dict[str, Set[Pair]] = {}
+        self._refreshing = False
+        self._batch: Optional[asyncio.Task] = None
+        self._background: Set[asyncio.Task] = set()
+        self._task: Optional[asyncio.Task] = None
+        self._client: Optional[httpx.AsyncClient] = None
+
+    def parse_pairs(self, assets: Iterable[str], currencies: Iterable[str]) -> Set[Pair]:
+        """Valide les actifs et devises demandés (liste blanche de la configuration)"""
+        assets = {asset.strip().upper() for asset in assets if asset.strip()}
+        currencies = {currency.strip().lower() for currency in currencies if currency.strip()}
+        if not assets or not currencies:
+            raise ValidationException("At least one asset and one currency are required", "vs")
+        for asset in assets - self.assets.keys():
+            raise ValidationException(f"Unsupported asset: {asset}", "assets")
+        for currency in currencies - self.currencies:
+            raise ValidationException(f"Unsupported currency: {currency}", "vs")
+        return {(asset, currency) for asset in assets for currency in currencies}
+
+    async def get_quotes(self, pairs: Set[Pair]) -> Dict[Pair, PriceQuote]:
+        """Cotations des paires; les paires absentes ou périmées déclenchent un rafraîchissement groupé"""
+        now = time.time()
+        missing = {
+            pair for pair in pairs
+            if pair not in self.quotes or now - self.quotes[pair].fetched_at > self.max_age
+        }
+        if missing:
+            self.wanted.update(missing)
+            try:
+                await self._join_batch()
+            except PriceException:
+                # Les dernières cotations connues restent servies
+                if not any(pair in self.quotes for pair in pairs):
+                    raise
+        return {pair: self.quotes[pair] for pair in pairs if pair in self.quotes}
+
+    async def _join_batch(self):
+        # Les demandes arrivant pendant la fenêtre partagent le même appel
+        if self._batch is None or self._batch.done():
+            self._batch = asyncio.create_task(self._run_batch())
+        await asyncio.shield(self._batch)
+
+    async def _run_batch(self):
+        await asyncio.sleep(self.batch_window)
+        # Fenêtre fermée: les demandes suivantes ouvrent un nouveau lot
+        self._batch = None
+        await self.refresh()
+
+    @traced("price.fetch")
+    async def refresh(self):
+        """Interroge toutes les sources en parallèle; attend au plus l'échéance, sauf si aucune n'a répondu"""
+        pairs = set(self.wanted)
+        if not pairs:
+            return
+        self.refreshes += 1
+
+        started = time.time()
+        tasks: Dict[asyncio.Task, SourceState] = {}
+        for state in self.sources:
+            # Une source encore occupée par le cycle précédent n'est pas relancée
+            if state.in_flight:
+                continue
+            task = asyncio.create_task(self._fetch_source(state, pairs, started))
+            self._background.add(task)
+            task.add_done_callback(self._background.discard)
+            tasks[task] = state
+
+        if tasks:
+            self._refreshing = True
+            try:
+                done, pending = await asyncio.wait(tasks, timeout=self.deadline)
+                # Échéance dépassée sans réponse: attendre la première source qui aboutit
+                while pending and not any(task.result() for task in done):
+                    done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            finally:
+                self._refreshing = False
+            # Les sources lentes terminent en arrière-plan et mettent la table à jour
+            for task in pending:
+                tasks[task].late += 1
+
+        self._log_outliers()
+        if not any(self._fresh_answers(pair, time.time()) for pair in pairs):
+            raise PriceException("No price source available")
+
+    async def _fetch_source(self, state: SourceState, pairs: Set[Pair], started: float) -> bool:
+        state.in_flight = True
+        state.requests += 1
+        try:
+            quotes = await state.source.fetch(self._http(), pairs)
+        except Exception as e:
+            state.errors += 1
+            logger.warning(f"Price source {state.source.name} failed: {e}")
+            return False
+        finally:
+            state.in_flight = False
+
+        now = time.time()
+        latency = now - started
+        state.ewma_latency = latency if state.ewma_latency is None else 0.8 * state.ewma_latency + 0.2 * latency
+        for pair, quote in quotes.items():
+            state.quotes[pair] = (quote, now)
+        self._aggregate(quotes.keys(), now)
+        if not self._refreshing:
+            # Source lente terminée hors du cycle: rapport immédiat
+            self._log_outliers()
+        return bool(quotes)
+
+    def _fresh_answers(self, pair: Pair, now: float) -> List[Tuple[str, SourceQuote]]:
+        answers = []
+        for state in self.sources:
+            entry = state.quotes.get(pair)
+            if entry and now - entry[1] <= self.max_age:
+                answers.append((state.source.name, entry[0]))
+        return answers
+
+    def _aggregate(self, pairs: Iterable[Pair], now: float):
+        """Médiane des sources fraîches, après rejet des valeurs trop éloignées"""
+        for pair in pairs:
+            answers = self._fresh_answers(pair, now)
+            if not answers:
+                continue
+            median = statistics.median(quote.price for _, quote in answers)
+            if len(answers) >= 3:
+                kept = [
+                    (name, quote) for name, quote in answers
+                    if abs(quote.price - median) <= self.outlier_threshold * median
+                ]
+                if kept and len(kept) < len(answers):
+                    for name in {name for name, _ in answers} - {name for name, _ in kept}:
+                        self._outliers.setdefault(name, set()).add(pair)
+                    answers = kept
+                    median = statistics.median(quote.price for _, quote in answers)
+
+            self.quotes[pair] = PriceQuote(
+                median,
+                _first(answers, "change_24h"),
+                _first(answers, "volume_24h"),
+                _first(answers, "market_cap"),
+                _first(answers, "updated_at"),
+                now,
+                [name for name, _ in answers]
+            )
+
+    def _log_outliers(self):
+        # Un avertissement par source écartée et par rafraîchissement, pas par paire
+        for name, pairs in sorted(self._outliers.items()):
+            listed = ", ".join(f"{asset}/{currency}" for asset, currency in sorted(pairs))
+            logger.warning(f"Price source {name} discarded as outlier for {len(pairs)} pair(s): {listed}")
+            self.outliers[name] = self.outliers.get(name, 0) + len(pairs)
+        self._outliers.clear()
+
+    def _http(self) -> httpx.AsyncClient:
+        if self._client is None:
+            self._client = httpx.AsyncClient()
+        return self._client
+
+    def start(self):
+        """Rafraîchissement périodique: les paires suivies restent en mémoire"""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        for task in list(self._background):
+            task.cancel()
+        if self._client:
+            await self._client.aclose()
+            self._client = None
+
+    async def _run(self):
+        while True:
+            try:
+                await self.refresh()
+            except PriceException as e:
+                logger.warning(f"Price refresh failed: {e}")
+            await asyncio.sleep(self.refresh_interval)
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "tracked_pairs": len(self.wanted),
+            "quotes": len(self.quotes),
+            "refreshes": self.refreshes,
+            "outliers": dict(self.outliers),
+            "sources": {state.source.name: state.get_stats() for state in self.sources}
+        }
+
+def _first(answers: List[Tuple[str, SourceQuote]], attribute: str):
+    # Métadonnées: première source (ordre de PRICE_SOURCES) qui les fournit
+    return next((getattr(q, attribute) for _, q in answers if getattr(q, attribute) is not None), None)
+
+# Instance globale
+price_engine = PriceEngine()
@@ -0,0 +1,176 @@
+import asyncio
+import logging
+from abc import ABC, abstractmethod
+from typing import Dict, Iterable, List, Set, Tuple
+
+import httpx
+
+from ..core.config import settings
+from ..core.exceptions import PriceException
+
+logger = logging.getLogger(__name__)
+
+# (actif, devise), ex. ("KAS", "usd")
+Pair = Tuple[str, str]
+
+class SourceQuote:
+    """Cotation brute d'une source"""
+
+    __slots__ = ("price", "change_24h", "volume_24h", "market_cap", "updated_at")
+
+    def __init__(self, price: float, change_24h=None, volume_24h=None, market_cap=None, updated_at=None):
+        self.price = price
+        self.change_24h = change_24h
+        self.volume_24h = volume_24h
+        self.market_cap = market_cap
+        self.updated_at = updated_at
+
+class PriceSource(ABC):
+    """Interface d'une source de prix: un appel groupé pour un ensemble de paires"""
+
+    name = "source"
+
+    def supports(self, asset: str) -> bool:
+        return True
+
+    @abstractmethod
+    async def fetch(self, client: httpx.AsyncClient, pairs: Set[Pair]) -> Dict[Pair, SourceQuote]:
+        """Cotations des paires supportées (les paires inconnues de la source sont omises)"""
+
+    @staticmethod
+    async def _get_json(client: httpx.AsyncClient, url: str, params: Dict, timeout: float):
+        try:
+            response = await client.get(url, params=params, timeout=timeout, headers={"Accept": "application/json"})
+            response.raise_for_status()
+            return response.json()
+        except httpx.TimeoutException:
+            raise PriceException("Timeout fetching price data")
+        except httpx.HTTPStatusError as e:
+            if e.response.status_code == 429:
+                raise PriceException("Rate limit exceeded, please try again later")
+            raise PriceException(f"API error: {e.response.status_code}")
+        except (httpx.HTTPError, ValueError) as e:
+            raise PriceException(f"Unable to fetch price data: {e}")
+
+class CoinGeckoSource(PriceSource):
+    name = "coingecko"
+
+    def __init__(self, api_url: str = None, coin_ids: Dict[str, str] = None, timeout: float = 10.0):
+        self.api_url = api_url or settings.COINGECKO_API_URL
+        self.coin_ids = {k.upper(): v for k, v in (coin_ids or settings.PRICE_ASSETS).items()}
+        self.timeout = timeout
+
+    def supports(self, asset: str) -> bool:
+        return asset in self.coin_ids
+
+    async def fetch(self, client, pairs):
+        pairs = {pair for pair in pairs if self.supports(pair[0])}
+        params = {
+            "ids": ",".join(sorted({self.coin_ids[asset] for asset, _ in pairs})),
+            "vs_currencies": ",".join(sorted({currency for _, currency in pairs})),
+            "include_24hr_change": "true",
+            "include_24hr_vol": "true",
+            "include_market_cap": "true",
+            "include_last_updated_at": "true"
+        }
+        data = await self._get_json(client, f"{self.api_url}/simple/price", params, self.timeout)
+
+        quotes = {}
+        for asset, currency in pairs:
+            coin = data.get(self.coin_ids[asset])
+            if not coin or coin.get(currency) is None:
+                continue
+            quotes[(asset, currency)] = SourceQuote(
+                float(coin[currency]),
+                coin.get(f"{currency}_24h_change"),
+                coin.get(f"{currency}_24h_vol"),
+                coin.get(f"{currency}_market_cap"),
+                coin.get("last_updated_at")
+            )
+        return quotes
+
+class CoinPaprikaSource(PriceSource):
+    """Un appel /tickers par actif (toutes les devises dans le paramètre quotes), en parallèle"""
+
+    name = "coinpaprika"
+
+    def __init__(self, api_url: str = None, coin_ids: Dict[str, str] = None, timeout: float = 10.0):
+        self.api_url = api_url or settings.COINPAPRIKA_API_URL
+        self.coin_ids = {k.upper(): v for k, v in (coin_ids or settings.PRICE_COINPAPRIKA_IDS).items()}
+        self.timeout = timeout
+
+    def supports(self, asset: str) -> bool:
+        return asset in self.coin_ids
+
+    async def fetch(self, client, pairs):
+        by_asset: Dict[str, List[str]] = {}
+        for asset, currency in pairs:
+            if self.supports(asset):
+                by_asset.setdefault(asset, []).append(currency)
+
+        # L'API n'a pas d'appel groupé multi-actifs: les requêtes partent ensemble
+        responses = await asyncio.gather(*(
+            self._get_json(
+                client,
+                f"{self.api_url}/tickers/{self.coin_ids[asset]}",
+                {"quotes": ",".join(sorted(c.upper() for c in currencies))},
+                self.timeout
+            )
+            for asset, currencies in by_asset.items()
+        ))
+
+        quotes = {}
+        for (asset, currencies), data in zip(by_asset.items(), responses):
+            for currency in currencies:
+                quote = data.get("quotes", {}).get(currency.upper())
+                if not quote or quote.get("price") is None:
+                    continue
+                quotes[(asset, currency)] = SourceQuote(
+                    float(quote["price"]),
+                    quote.get("percent_change_24h"),
+                    quote.get("volume_24h"),
+                    quote.get("market_cap")
+                )
+        return quotes
+
+class CryptoCompareSource(PriceSource):
+    """pricemulti: symboles d'actifs et de devises directement"""
+
+    name = "cryptocompare"
+
+    def __init__(self, api_url: str = None, timeout: float = 10.0):
+        self.api_url = api_url or settings.CRYPTOCOMPARE_API_URL
+        self.timeout = timeout
+
+    async def fetch(self, client, pairs):
+        params = {
+            "fsyms": ",".join(sorted({asset for asset, _ in pairs})),
+            "tsyms": ",".join(sorted({currency.upper() for _, currency in pairs}))
+        }
+        data = await self._get_json(client, f"{self.api_url}/data/pricemulti", params, self.timeout)
+        if data.get("Response") == "Error":
+            raise PriceException(f"API error: {data.get('Message')}")
+
+        quotes = {}
+        for asset, currency in pairs:
+            price = data.get(asset, {}).get(currency.upper())
+            if price is not None:
+                quotes[(asset, currency)] = SourceQuote(float(price))
+        return quotes
+
+SOURCE_TYPES = {
+    CoinGeckoSource.name: CoinGeckoSource,
+    CoinPaprikaSource.name: CoinPaprikaSource,
+    CryptoCompareSource.name: CryptoCompareSource
+}
+
+def build_sources(names: Iterable[str]) -> List[PriceSource]:
+    """Sources configurées (PRICE_SOURCES), dans l'ordre de priorité des métadonnées"""
+    sources = []
+    for name in names:
+        source_type = SOURCE_TYPES.get(name)
+        if source_type is None:
+            logger.warning(f"Unknown price source ignored: {name}")
+            continue
+        sources.append(source_type())
+    return sources
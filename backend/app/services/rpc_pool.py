@@ -0,0 +1,222 @@
+import asyncio
+import logging
+import time
+from collections import deque
+from typing import Any, Dict, List, Optional
+
+import httpx
+
+from ..core.config import settings
+from ..core.exceptions import NodeException
+
+logger = logging.getLogger(__name__)
+
+class RpcNodeError(Exception):
+    """Erreur de transport vers un nœud (le nœud est pénalisé, un autre peut répondre)"""
+
+class RpcNode:
+    """État de santé d'un nœud kaspad"""
+
+    def __init__(self, url: str, sample_size: int = 50):
+        self.url = url
+        self.latencies = deque(maxlen=sample_size)
+        self.ewma_latency: Optional[float] = None
+        self.error_rate = 0.0
+        self.is_synced = True
+        self.consecutive_failures = 0
+        self.cooldown_until = 0.0
+        self.requests = 0
+        self.errors = 0
+
+    def record_success(self, latency: float):
+        self.requests += 1
+        self.latencies.append(latency)
+        self.ewma_latency = latency if self.ewma_latency is None else 0.8 * self.ewma_latency + 0.2 * latency
+        self.error_rate *= 0.9
+        self.consecutive_failures = 0
+
+    def record_failure(self, cooldown: float):
+        self.requests += 1
+        self.errors += 1
+        self.error_rate = 0.9 * self.error_rate + 0.1
+        self.consecutive_failures += 1
+        if self.consecutive_failures >= 3:
+            self.cooldown_until = time.monotonic() + cooldown
+
+    def available(self, now: float) -> bool:
+        return now >= self.cooldown_until
+
+    def score(self) -> float:
+        """Plus petit = meilleur"""
+        latency = self.ewma_latency if self.ewma_latency is not None else 0.1
+        score = latency * (1 + 10 * self.error_rate)
+        if not self.is_synced:
+            score += 1000.0
+        return score
+
+    def percentile(self, q: float) -> Optional[float]:
+        if not self.latencies:
+            return None
+        ordered = sorted(self.latencies)
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+    def get_stats(self) -> Dict[str, Any]:
+        p95 = self.percentile(0.95)
+        return {
+            "url": self.url,
+            "is_synced": self.is_synced,
+            "ewma_latency_ms": round(self.ewma_latency * 1000, 2) if self.ewma_latency else None,
+            "p95_latency_ms": round(p95 * 1000, 2) if p95 else None,
+            "error_rate": round(self.error_rate, 4),
+            "requests": self.requests,
+            "errors": self.errors,
+            "in_cooldown": not self.available(time.monotonic())
+        }
+
+class KaspaRpcPool:
+    """Pool de nœuds kaspad avec routage pondéré par la santé et requêtes couvertes (hedging)"""
+
+    def __init__(self, urls: List[str] = None):
+        urls = urls or settings.KASPA_RPC_URLS or [settings.KASPA_RPC_URL]
+        self.nodes = [RpcNode(url) for url in dict.fromkeys(urls)]
+        self.timeout = 10.0
+        self.hedge_percentile = settings.KASPA_HEDGE_PERCENTILE
+        self.min_hedge_delay = settings.KASPA_HEDGE_MIN_DELAY
+        self.failure_cooldown = 10.0
+        self.health_interval = settings.KASPA_RPC_HEALTH_INTERVAL
+        self._client: Optional[httpx.AsyncClient] = None
+        self._health_task: Optional[asyncio.Task] = None
+
+    def _get_client(self) -> httpx.AsyncClient:
+        # Client partagé: connexions keep-alive réutilisées entre les appels
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                timeout=self.timeout,
+                limits=httpx.Limits(max_connections=100, max_keepalive_connections=20)
+            )
+        return self._client
+
+    def start(self):
+        """Démarre les sondes de santé périodiques"""
+        if self._health_task is None or self._health_task.done():
+            self._health_task = asyncio.create_task(self._health_loop())
+
+    async def close(self):
+        if self._health_task:
+            self._health_task.cancel()
+            try:
+                await self._health_task
+            except asyncio.CancelledError:
+                pass
+            self._health_task = None
+        if self._client:
+            await self._client.aclose()
+            self._client = None
+
+    def ranked_nodes(self) -> List[RpcNode]:
+        """Nœuds disponibles du meilleur au moins bon (tous si aucun n'est disponible)"""
+        now = time.monotonic()
+        available = [node for node in self.nodes if node.available(now)] or list(self.nodes)
+        return sorted(available, key=lambda node: node.score())
+
+    def _hedge_delay(self, node: RpcNode) -> float:
+        delay = node.percentile(self.hedge_percentile)
+        if delay is None:
+            delay = 0.25
+        return min(max(delay, self.min_hedge_delay), self.timeout / 2)
+
+    async def _call_node(self, node: RpcNode, payload: Dict[str, Any]) -> Dict[str, Any]:
+        start = time.perf_counter()
+        try:
+            response = await self._get_client().post(node.url, json=payload)
+            response.raise_for_status()
+            data = response.json()
+        except httpx.TimeoutException:
+            node.record_failure(self.failure_cooldown)
+            raise RpcNodeError("Timeout connecting to Kaspa node")
+        except httpx.ConnectError:
+            node.record_failure(self.failure_cooldown)
+            raise RpcNodeError("Cannot connect to Kaspa node")
+        except (httpx.HTTPError, ValueError) as e:
+            node.record_failure(self.failure_cooldown)
+            raise RpcNodeError(f"RPC call failed: {e}")
+
+        node.record_success(time.perf_counter() - start)
+        return data
+
+    async def call(self, method: str, params: Dict[str, Any] = None) -> Dict[str, Any]:
+        """Appel RPC routé vers le meilleur nœud; les lectures sont couvertes par un second nœud"""
+        payload = {
+            "jsonrpc": "2.0",
+            "method": method,
+            "params": params or {},
+            "id": 1
+        }
+        # Seules les lectures idempotentes sont dupliquées
+        hedge = method.startswith("get")
+        candidates = self.ranked_nodes()
+        in_flight: Dict[asyncio.Task, RpcNode] = {}
+        last_error: Optional[Exception] = None
+
+        def launch_next():
+            node = candidates.pop(0)
+            in_flight[asyncio.create_task(self._call_node(node, payload))] = node
+
+        launch_next()
+        try:
+            while in_flight:
+                primary = next(iter(in_flight.values()))
+                can_hedge = hedge and candidates and len(in_flight) < 2
+                done, _ = await asyncio.wait(
+                    in_flight,
+                    timeout=self._hedge_delay(primary) if can_hedge else None,
+                    return_when=asyncio.FIRST_COMPLETED
+                )
+
+                if not done:
+                    # Réponse trop lente: requête couverte vers le nœud suivant
+                    launch_next()
+                    continue
+
+                for task in done:
+                    node = in_flight.pop(task)
+                    error = task.exception()
+                    if error is None:
+                        data = task.result()
+                        if "error" in data and data["error"]:
+                            raise NodeException(f"RPC Error: {data['error']}")
+                        if "result" not in data:
+                            raise NodeException("Invalid RPC response format")
+                        return data["result"]
+                    logger.warning(f"RPC {method} failed on {node.url}: {error}")
+                    last_error = error
+
+                # Bascule vers le nœud suivant après un échec
+                if not in_flight and candidates:
+                    launch_next()
+        finally:
+            for task in in_flight:
+                task.cancel()
+
+        raise NodeException(str(last_error) if last_error else "No Kaspa node available")
+
+    async def _health_loop(self):
+        while True:
+            await asyncio.gather(*(self._probe(node) for node in self.nodes))
+            await asyncio.sleep(self.health_interval)
+
+    async def _probe(self, node: RpcNode):
+        try:
+            data = await self._call_node(node, {"jsonrpc": "2.0", "method": "getInfo", "params": {}, "id": 1})
+            node.is_synced = bool((data.get("result") or {}).get("isSynced", False))
+        except RpcNodeError:
+            pass
+        except Exception as e:
+            logger.warning(f"Health probe failed for {node.url}: {e}")
+
+    def get_stats(self) -> List[Dict[str, Any]]:
+        # Tous les nœuds, y compris ceux en pénalité (in_cooldown), classés par score
+        return [node.get_stats() for node in sorted(self.nodes, key=lambda node: node.score())]
+
+# Instance globale
+kaspa_rpc_pool = KaspaRpcPool()
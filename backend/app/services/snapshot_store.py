@@ -0,0 +1,147 @@
+import asyncio
+import json
+import logging
+import os
+import tempfile
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, Optional
+
+from ..core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Snapshots conservés localement (mêmes clés que le cache Redis)
+SNAPSHOT_KEYS = (
+    "kaspa_price_data",
+    "dashboard:node",
+    "dashboard:block",
+    "dashboard:system",
+    "dashboard:mining"
+)
+
+class SnapshotStore:
+    """Dernières valeurs connues des snapshots, persistées dans un fichier local pour le démarrage à chaud"""
+
+    def __init__(self, path: str = None, keys: Iterable[str] = SNAPSHOT_KEYS):
+        self.path = path or settings.SNAPSHOT_PATH
+        self.keys = frozenset(keys)
+        self.interval = settings.SNAPSHOT_INTERVAL
+        self.max_stale = settings.SNAPSHOT_MAX_STALE
+        self.entries: Dict[str, Dict[str, Any]] = {}
+        self._dirty = False
+        self._task: Optional[asyncio.Task] = None
+
+    def put(self, key: str, value: Any, ttl: int):
+        if key not in self.keys:
+            return
+        now = time.time()
+        self.entries[key] = {
+            "data": value,
+            "cached_at": datetime.fromtimestamp(now, timezone.utc).isoformat(),
+            "ttl": ttl,
+            "stored_at": now
+        }
+        self._dirty = True
+
+    def get(self, key: str, max_age: float = None) -> Optional[Dict[str, Any]]:
+        """Entrée au format du cache si son âge ne dépasse pas max_age (TTL d'origine par défaut)"""
+        entry = self.entries.get(key)
+        if entry is None:
+            return None
+        limit = entry["ttl"] if max_age is None else max_age
+        return entry if time.time() - entry["stored_at"] <= limit else None
+
+    def get_stale(self, key: str) -> Optional[Dict[str, Any]]:
+        """Dernière valeur connue, même expirée (dans la limite de SNAPSHOT_MAX_STALE)"""
+        return self.get(key, self.max_stale)
+
+    def expire(self, key: str):
+        """Invalidation du cache: l'entrée n'est plus fraîche mais reste la dernière valeur connue"""
+        entry = self.entries.get(key)
+        if entry is not None and entry["ttl"]:
+            entry["ttl"] = 0
+            self._dirty = True
+
+    def load(self):
+        """Charge le fichier de snapshots (appelé au démarrage, hors boucle d'événements)"""
+        try:
+            with open(self.path, "rb") as f:
+                entries = json.loads(f.read())
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable snapshot file {self.path}: {e}")
+            return
+
+        now = time.time()
+        for key, entry in entries.items():
+            if key in self.keys and now - entry.get("stored_at", 0) <= self.max_stale:
+                self.entries[key] = entry
+        logger.info(f"Warm-start snapshots loaded: {len(self.entries)}")
+
+    def save(self):
+        """Écrit les snapshots de façon atomique (fichier temporaire puis rename)"""
+        payload = self._serialize()
+        if payload is not None:
+            self._write(payload)
+
+    def _serialize(self) -> Optional[bytes]:
+        if not self._dirty:
+            return None
+        self._dirty = False
+        return json.dumps(self.entries, separators=(",", ":"), default=str).encode()
+
+    def _write(self, payload: bytes):
+        directory = os.path.dirname(self.path) or "."
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".snapshots-")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(payload)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.path)
+        except OSError:
+            self._dirty = True
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+            raise
+
+    async def initialize(self):
+        await asyncio.to_thread(self.load)
+
+    def start(self):
+        """Démarre l'écriture périodique du fichier"""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self._save_async()
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(self.interval)
+            await self._save_async()
+
+    async def _save_async(self):
+        # Sérialisation dans la boucle (pas de modification concurrente), écriture dans un thread
+        payload = self._serialize()
+        if payload is None:
+            return
+        try:
+            await asyncio.to_thread(self._write, payload)
+        except OSError as e:
+            logger.warning(f"Snapshot write failed: {e}")
+
+# Instance globale
+snapshot_store = SnapshotStore()
@@ -0,0 +1,56 @@
+import asyncio
+import os
+from datetime import datetime, timezone
+
+from ..models.schemas import SystemInfo, ServiceStatus
+from .database import Database, database as default_database
+
+
+class SystemService:
+    def __init__(self, cache_service, kaspa_service, price_service, database: Database = None):
+        self.cache_service = cache_service
+        self.kaspa_service = kaspa_service
+        self.price_service = price_service
+        self.database = database or default_database
+
+    async def get_system_info(self) -> SystemInfo:
+        """Récupère les informations système et l'état des services"""
+        # Vérifications de santé en parallèle
+        cache_healthy, kaspa_healthy, price_healthy, (db_healthy, db_latency) = await asyncio.gather(
+            self.cache_service.health_check(),
+            self.kaspa_service.health_check(),
+            self.price_service.health_check(),
+            self.database.probe()
+        )
+        checked_at = datetime.now(timezone.utc)
+
+        services = [
+            ServiceStatus(name="redis_cache", status=cache_healthy, last_check=checked_at),
+            ServiceStatus(name="kaspa_node", status=kaspa_healthy, last_check=checked_at),
+            ServiceStatus(name="price_api", status=price_healthy, last_check=checked_at)
+        ]
+
+        # Base de données (si configurée): aller-retour réel sur le pool
+        if self.database.enabled:
+            services.append(ServiceStatus(
+                name="database",
+                status=db_healthy,
+                latency_ms=db_latency,
+                last_check=checked_at
+            ))
+
+        # Informations système (psutil importé à la demande: hors du chemin de démarrage)
+        try:
+            import psutil
+            uptime = int(psutil.boot_time())
+            current_time = int(datetime.now(timezone.utc).timestamp())
+            uptime_seconds = current_time - uptime
+        except Exception:
+            uptime_seconds = 0
+
+        return SystemInfo(
+            environment=os.getenv("ENVIRONMENT", "development"),
+            version=os.getenv("VERSION", "0.1.0"),
+            uptime=uptime_seconds,
+            services=services
+        )
@@ -0,0 +1,145 @@
+import asyncio
+import base64
+import logging
+import os
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+from cryptography.exceptions import InvalidTag
+from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+from cryptography.hazmat.primitives.kdf.scrypt import Scrypt
+from prometheus_client import Counter, Gauge, Histogram
+
+from ..core.config import settings
+from ..core.exceptions import WalletException
+
+logger = logging.getLogger(__name__)
+
+# Métriques Prometheus
+crypto_queue_depth = Gauge(
+    'kaspazof_wallet_crypto_queue_depth',
+    'Opérations crypto wallet en attente ou en cours'
+)
+crypto_tasks = Counter(
+    'kaspazof_wallet_crypto_tasks_total',
+    'Opérations crypto wallet par type et résultat',
+    ['operation', 'result']
+)
+crypto_duration = Histogram(
+    'kaspazof_wallet_crypto_duration_seconds',
+    'Durée des opérations crypto wallet (attente incluse)',
+    ['operation'],
+    buckets=(0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+)
+
+# Fonctions exécutées dans les workers (niveau module pour être picklables)
+
+def _derive_key(password: str, salt: bytes, n: int, r: int, p: int) -> bytes:
+    return Scrypt(salt=salt, length=32, n=n, r=r, p=p).derive(password.encode())
+
+def encrypt_secret(password: str, secret: bytes, n: int, r: int = 8, p: int = 1) -> Dict[str, Any]:
+    """Dérive une clé scrypt du mot de passe et chiffre le secret en AES-GCM"""
+    salt = os.urandom(16)
+    nonce = os.urandom(12)
+    key = _derive_key(password, salt, n, r, p)
+    ciphertext = AESGCM(key).encrypt(nonce, secret, None)
+    return {
+        "kdf": "scrypt",
+        "n": n,
+        "r": r,
+        "p": p,
+        "salt": base64.b64encode(salt).decode(),
+        "nonce": base64.b64encode(nonce).decode(),
+        "ciphertext": base64.b64encode(ciphertext).decode()
+    }
+
+def decrypt_secret(password: str, envelope: Dict[str, Any]) -> Optional[bytes]:
+    """Déchiffre le secret; retourne None si le mot de passe est invalide"""
+    key = _derive_key(
+        password,
+        base64.b64decode(envelope["salt"]),
+        envelope["n"],
+        envelope["r"],
+        envelope["p"]
+    )
+    try:
+        return AESGCM(key).decrypt(
+            base64.b64decode(envelope["nonce"]),
+            base64.b64decode(envelope["ciphertext"]),
+            None
+        )
+    except InvalidTag:
+        return None
+
+class WalletCryptoPool:
+    """Pool borné de workers pour le KDF et le chiffrement des wallets"""
+
+    def __init__(
+        self,
+        workers: int = None,
+        max_queue: int = None,
+        use_processes: bool = None
+    ):
+        self.workers = workers or settings.WALLET_CRYPTO_WORKERS
+        self.max_queue = max_queue if max_queue is not None else settings.WALLET_CRYPTO_MAX_QUEUE
+        self.use_processes = (
+            use_processes if use_processes is not None else settings.WALLET_CRYPTO_USE_PROCESSES
+        )
+        self._executor: Optional[Executor] = None
+        self._pending = 0
+
+    def start(self):
+        """Crée l'exécuteur (threads ou processus)"""
+        if self._executor:
+            return
+        if self.use_processes:
+            self._executor = ProcessPoolExecutor(max_workers=self.workers)
+        else:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.workers,
+                thread_name_prefix="wallet-crypto"
+            )
+        logger.info(
+            f"Wallet crypto pool started: {self.workers} "
+            f"{'processes' if self.use_processes else 'threads'}, queue {self.max_queue}"
+        )
+
+    def shutdown(self):
+        if self._executor:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    async def run(self, operation: str, func: Callable, *args) -> Any:
+        """Soumet une opération au pool, en refusant si la file est pleine"""
+        if self._pending >= self.workers + self.max_queue:
+            crypto_tasks.labels(operation, "rejected").inc()
+            raise WalletException("Wallet service busy, please retry later", "WALLET_BUSY")
+
+        self.start()
+        self._pending += 1
+        crypto_queue_depth.set(self._pending)
+        start = time.perf_counter()
+        try:
+            loop = asyncio.get_running_loop()
+            result = await loop.run_in_executor(self._executor, func, *args)
+            crypto_tasks.labels(operation, "ok").inc()
+            return result
+        except Exception:
+            crypto_tasks.labels(operation, "error").inc()
+            raise
+        finally:
+            self._pending -= 1
+            crypto_queue_depth.set(self._pending)
+            crypto_duration.labels(operation).observe(time.perf_counter() - start)
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "workers": self.workers,
+            "mode": "process" if self.use_processes else "thread",
+            "pending": self._pending,
+            "max_queue": self.max_queue
+        }
+
+# Instance globale
+wallet_crypto_pool = WalletCryptoPool()
@@ -0,0 +1,187 @@
+import asyncio
+import json
+import logging
+import os
+import sqlite3
+import threading
+from datetime import datetime
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+from ..core.config import settings
+from ..core.exceptions import WalletException
+from ..models.schemas import WalletResponse, WalletStatus
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS wallets (
+    id TEXT PRIMARY KEY,
+    label TEXT NOT NULL,
+    address TEXT NOT NULL UNIQUE,
+    status TEXT NOT NULL,
+    created_at TEXT NOT NULL,
+    secret TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_wallets_created_at ON wallets(created_at, id);
+"""
+
+class WalletEntry(NamedTuple):
+    """Entrée compacte de l'index mémoire (sans données sensibles)"""
+    id: str
+    label: str
+    address: str
+    status: str
+    created_at: str
+
+    def to_response(self) -> WalletResponse:
+        return WalletResponse(
+            id=self.id,
+            label=self.label,
+            address=self.address,
+            status=WalletStatus(self.status),
+            created_at=datetime.fromisoformat(self.created_at)
+        )
+
+class WalletRepository:
+    """Stockage des wallets dans SQLite avec index id/label/adresse en mémoire"""
+
+    def __init__(self, db_path: str = None, legacy_dir: str = None):
+        self.db_path = db_path or settings.WALLET_DB_PATH
+        self.legacy_dir = legacy_dir or settings.WALLETS_DIR
+        self._conn: Optional[sqlite3.Connection] = None
+        self._db_lock = threading.Lock()
+        self._by_id: Dict[str, WalletEntry] = {}
+        self._by_address: Dict[str, str] = {}
+        # Ordre de création, pour une pagination en O(taille de page)
+        self._order: List[str] = []
+        self.initialized = False
+
+    async def initialize(self):
+        """Ouvre la base et charge l'index en mémoire (hors boucle d'événements)"""
+        if self.initialized:
+            return
+        entries = await asyncio.to_thread(self._open_and_load)
+        for entry in entries:
+            self._index(entry)
+        self.initialized = True
+        logger.info(f"Wallet repository loaded: {len(self._order)} wallets")
+
+    async def close(self):
+        """Ferme la connexion SQLite"""
+        if self._conn:
+            await asyncio.to_thread(self._conn.close)
+            self._conn = None
+        self.initialized = False
+
+    def _open_and_load(self) -> List[WalletEntry]:
+        os.makedirs(os.path.dirname(self.db_path) or ".", exist_ok=True)
+        conn = sqlite3.connect(self.db_path, check_same_thread=False, isolation_level=None)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.executescript(SCHEMA)
+        self._conn = conn
+
+        if conn.execute("SELECT COUNT(*) FROM wallets").fetchone()[0] == 0:
+            self._import_legacy_files()
+
+        rows = conn.execute(
+            "SELECT id, label, address, status, created_at FROM wallets ORDER BY created_at, id"
+        ).fetchall()
+        return [WalletEntry(*row) for row in rows]
+
+    def _import_legacy_files(self):
+        """Importe une seule fois les anciens fichiers /app/wallets/<id>.json"""
+        if not os.path.isdir(self.legacy_dir):
+            return
+
+        rows = []
+        for filename in os.listdir(self.legacy_dir):
+            if not filename.endswith(".json"):
+                continue
+            try:
+                with open(os.path.join(self.legacy_dir, filename), "r") as f:
+                    data = json.load(f)
+                rows.append((
+                    data["id"],
+                    data["label"],
+                    data["address"],
+                    data.get("status", WalletStatus.ACTIVE.value),
+                    data["created_at"],
+                    None
+                ))
+            except (OSError, ValueError, KeyError) as e:
+                logger.warning(f"Skipping legacy wallet file {filename}: {e}")
+
+        if rows:
+            with self._db_lock:
+                self._conn.executemany(
+                    "INSERT OR IGNORE INTO wallets VALUES (?, ?, ?, ?, ?, ?)", rows
+                )
+            logger.info(f"Imported {len(rows)} legacy wallet files")
+
+    def _index(self, entry: WalletEntry):
+        if entry.id not in self._by_id:
+            self._order.append(entry.id)
+        self._by_id[entry.id] = entry
+        self._by_address[entry.address] = entry.id
+
+    def _ensure_ready(self):
+        if not self.initialized:
+            raise WalletException("Wallet store not initialized", "WALLET_STORE_UNAVAILABLE")
+
+    async def add(self, entry: WalletEntry, secret: Optional[Dict[str, Any]] = None):
+        """Enregistre un nouveau wallet puis met à jour l'index"""
+        self._ensure_ready()
+        if entry.id in self._by_id or entry.address in self._by_address:
+            raise WalletException("Wallet already exists", "WALLET_EXISTS")
+
+        row = (*entry, json.dumps(secret) if secret is not None else None)
+        try:
+            await asyncio.to_thread(self._insert, row)
+        except sqlite3.IntegrityError:
+            # Deux créations concurrentes: la contrainte UNIQUE départage
+            raise WalletException("Wallet already exists", "WALLET_EXISTS")
+        self._index(entry)
+
+    def _insert(self, row: Tuple):
+        with self._db_lock:
+            self._conn.execute("INSERT INTO wallets VALUES (?, ?, ?, ?, ?, ?)", row)
+
+    async def get_secret(self, wallet_id: str) -> Optional[Dict[str, Any]]:
+        """Charge les données chiffrées d'un wallet (jamais gardées en mémoire)"""
+        self._ensure_ready()
+        if wallet_id not in self._by_id:
+            return None
+        raw = await asyncio.to_thread(self._select_secret, wallet_id)
+        return json.loads(raw) if raw else None
+
+    def _select_secret(self, wallet_id: str) -> Optional[str]:
+        with self._db_lock:
+            row = self._conn.execute(
+                "SELECT secret FROM wallets WHERE id = ?", (wallet_id,)
+            ).fetchone()
+        return row[0] if row else None
+
+    def get(self, wallet_id: str) -> Optional[WalletEntry]:
+        self._ensure_ready()
+        return self._by_id.get(wallet_id)
+
+    def get_by_address(self, address: str) -> Optional[WalletEntry]:
+        self._ensure_ready()
+        wallet_id = self._by_address.get(address)
+        return self._by_id.get(wallet_id) if wallet_id else None
+
+    def list(self, offset: int = 0, limit: int = 50) -> List[WalletEntry]:
+        """Page de wallets dans l'ordre de création"""
+        self._ensure_ready()
+        return [self._by_id[wallet_id] for wallet_id in self._order[offset:offset + limit]]
+
+    def addresses(self) -> List[str]:
+        self._ensure_ready()
+        return list(self._by_address)
+
+    def count(self) -> int:
+        return len(self._order)
+
+# Instance globale
+wallet_repository = WalletRepository()
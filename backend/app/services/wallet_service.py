@@ -0,0 +1,64 @@
+import secrets
+import logging
+from datetime import datetime, timezone
+
+from ..core.config import settings
+from ..core.exceptions import WalletException
+from ..models.schemas import WalletCreate, WalletStatus
+from .wallet_crypto import WalletCryptoPool, encrypt_secret, decrypt_secret
+from .wallet_repository import WalletEntry, WalletRepository
+
+logger = logging.getLogger(__name__)
+
+class WalletService:
+    def __init__(
+        self,
+        repository: WalletRepository,
+        crypto_pool: WalletCryptoPool,
+        notifications=None
+    ):
+        self.repository = repository
+        self.crypto_pool = crypto_pool
+        self.notifications = notifications
+
+    async def create_wallet(self, wallet_data: WalletCreate) -> WalletEntry:
+        """Crée un wallet; la dérivation de clé et le chiffrement tournent dans le pool"""
+        private_key = secrets.token_bytes(32)
+        envelope = await self.crypto_pool.run(
+            "encrypt",
+            encrypt_secret,
+            wallet_data.password,
+            private_key,
+            settings.WALLET_KDF_N
+        )
+
+        # Génération d'une adresse de test (remplacer par vraie génération)
+        entry = WalletEntry(
+            id=secrets.token_hex(16),
+            label=wallet_data.label,
+            address=f"kaspa:qz{secrets.token_hex(32)}",
+            status=WalletStatus.ACTIVE.value,
+            created_at=datetime.now(timezone.utc).isoformat()
+        )
+        await self.repository.add(entry, envelope)
+        if self.notifications:
+            await self.notifications.track_addresses([entry.address])
+
+        logger.info(f"Wallet created: {entry.id}")
+        return entry
+
+    async def unlock_wallet(self, wallet_id: str, password: str) -> WalletEntry:
+        """Vérifie le mot de passe en déchiffrant la clé du wallet"""
+        entry = self.repository.get(wallet_id)
+        if not entry:
+            raise WalletException("Wallet not found", "WALLET_NOT_FOUND")
+
+        envelope = await self.repository.get_secret(wallet_id)
+        if not envelope:
+            raise WalletException("Wallet has no encrypted key", "WALLET_NO_KEY")
+
+        secret = await self.crypto_pool.run("decrypt", decrypt_secret, password, envelope)
+        if secret is None:
+            raise WalletException("Invalid wallet password", "INVALID_PASSWORD")
+
+        return entry
@@ -0,0 +1,43 @@
+from itertools import islice
+from typing import AsyncIterator, Iterable, List, Sequence, Tuple
+
+from fastapi.responses import StreamingResponse
+
+from shared.export import ENCODERS, EXPORT_FORMAT_PATTERN, EXPORT_MEDIA_TYPES, PARQUET_AVAILABLE
+
+from ..core.exceptions import ValidationException
+
+async def stream_export(
+    batches: AsyncIterator[List[Tuple]], columns: Sequence[str], types: Sequence[str], fmt: str
+) -> AsyncIterator[bytes]:
+    """Encode les lots de lignes au fil de l'eau"""
+    encoder = ENCODERS[fmt](columns, types)
+    async for rows in batches:
+        chunk = encoder.encode(rows)
+        if chunk:
+            yield chunk
+    tail = encoder.close()
+    if tail:
+        yield tail
+
+def export_response(
+    batches: AsyncIterator[List[Tuple]], columns: Sequence[str], types: Sequence[str], fmt: str, name: str
+) -> StreamingResponse:
+    """Réponse HTTP en streaming (NDJSON, CSV ou Parquet)"""
+    if fmt == "parquet" and not PARQUET_AVAILABLE:
+        raise ValidationException("Parquet export requires pyarrow", "format")
+
+    return StreamingResponse(
+        stream_export(batches, columns, types, fmt),
+        media_type=EXPORT_MEDIA_TYPES[fmt],
+        headers={"Content-Disposition": f'attachment; filename="{name}.{fmt}"'}
+    )
+
+async def iterate_batches(rows: Iterable[Tuple], batch_size: int = 1000) -> AsyncIterator[List[Tuple]]:
+    """Découpe un itérable de lignes en lots"""
+    iterator = iter(rows)
+    while True:
+        batch = list(islice(iterator, batch_size))
+        if not batch:
+            return
+        yield batch
@@ -0,0 +1,19 @@
+import os
+import sys
+import tempfile
+
+# Backend (paquet app) et racine du dépôt (paquet shared) importables depuis les tests
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+sys.path.insert(0, os.path.dirname(BACKEND_DIR))
+
+# Configuration minimale: aucun service externe requis
+_data_dir = tempfile.mkdtemp(prefix="kaspazof-tests-")
+os.environ.setdefault("SECRET_KEY", "test-secret-key")
+os.environ.setdefault("WALLETS_DIR", os.path.join(_data_dir, "wallets"))
+os.environ.setdefault("WALLET_DB_PATH", os.path.join(_data_dir, "wallets", "wallets.db"))
+os.environ.setdefault("BLOCK_INDEX_DB_PATH", os.path.join(_data_dir, "blocks.db"))
+os.environ.setdefault("SNAPSHOT_PATH", os.path.join(_data_dir, "snapshots.json"))
+os.environ.setdefault("REDIS_URL", "redis://127.0.0.1:1")
+os.environ.setdefault("KASPA_NOTIFICATIONS_ENABLED", "false")
+os.environ.setdefault("BLOCK_INDEX_ENABLED", "false")
@@ -0,0 +1,184 @@
+import asyncio
+import json
+
+import websockets
+
+from app.services.notification_service import BLOCK_SNAPSHOT_KEYS, KaspaNotificationClient
+
+ADDRESS = "kaspa:qtracked"
+
+class FakeCache:
+    def __init__(self):
+        self.values = {}
+        self.deleted = []
+
+    async def set(self, key, value, ttl=300):
+        self.values[key] = value
+        return True
+
+    async def delete(self, key):
+        self.deleted.append([key])
+        return True
+
+    async def delete_many(self, keys):
+        self.deleted.append(list(keys))
+        return len(keys)
+
+class FakeHub:
+    def __init__(self):
+        self.events = []
+
+    async def publish(self, event, payload):
+        self.events.append((event, payload))
+
+    def of(self, event):
+        return [payload for name, payload in self.events if name == event]
+
+class FakeKaspaService:
+    def __init__(self):
+        self.daa_score = 1000
+
+    async def _make_rpc_call(self, method, params=None):
+        assert method == "getBlockDagInfo"
+        return {"virtualDaaScore": str(self.daa_score)}
+
+class FakeKaspad:
+    """Serveur wRPC JSON local: enregistre les abonnements et pousse des notifications"""
+
+    def __init__(self):
+        self.connections = []
+        self.subscriptions = []
+        self.server = None
+
+    async def handler(self, ws, *_):
+        received = []
+        self.subscriptions.append(received)
+        self.connections.append(ws)
+        try:
+            async for raw in ws:
+                received.append(json.loads(raw))
+        except websockets.ConnectionClosed:
+            pass
+
+    async def start(self) -> str:
+        self.server = await websockets.serve(self.handler, "127.0.0.1", 0)
+        port = self.server.sockets[0].getsockname()[1]
+        return f"ws://127.0.0.1:{port}"
+
+    async def notify(self, method, params):
+        await self.connections[-1].send(json.dumps({"jsonrpc": "2.0", "method": method, "params": params}))
+
+    async def close(self):
+        self.server.close()
+        await self.server.wait_closed()
+
+async def wait_until(predicate, timeout=5.0):
+    deadline = asyncio.get_running_loop().time() + timeout
+    while not predicate():
+        assert asyncio.get_running_loop().time() < deadline, "condition not met before timeout"
+        await asyncio.sleep(0.01)
+
+def methods(messages):
+    return [message["method"] for message in messages]
+
+async def make_client():
+    kaspad = FakeKaspad()
+    url = await kaspad.start()
+    client = KaspaNotificationClient(url, cache=FakeCache(), hub=FakeHub(), kaspa_service=FakeKaspaService())
+    client.min_reconnect_delay = 0.05
+    await client.track_addresses([ADDRESS])
+    return kaspad, client
+
+def test_subscribe_handshake_and_resync():
+    async def scenario():
+        kaspad, client = await make_client()
+        client.start()
+        try:
+            await wait_until(lambda: kaspad.subscriptions and len(kaspad.subscriptions[0]) == 3)
+            handshake = kaspad.subscriptions[0]
+            assert methods(handshake) == ["notifyBlockAdded", "notifyVirtualDaaScoreChanged", "notifyUtxosChanged"]
+            assert handshake[2]["params"] == {"addresses": [ADDRESS]}
+            assert len({message["id"] for message in handshake}) == 3
+
+            await wait_until(lambda: client.hub.of("resync"))
+            assert client.hub.of("resync") == [{"virtual_daa_score": 1000}]
+            assert client.cache.deleted[0] == BLOCK_SNAPSHOT_KEYS
+            assert client.connected
+
+            # Nouvelle adresse suivie: abonnement immédiat sur la connexion ouverte
+            await client.track_addresses(["kaspa:qnew"])
+            await wait_until(lambda: len(kaspad.subscriptions[0]) == 4)
+            assert kaspad.subscriptions[0][3]["params"] == {"addresses": ["kaspa:qnew"]}
+        finally:
+            await client.stop()
+            await kaspad.close()
+
+    asyncio.run(scenario())
+
+def test_notifications_are_dispatched():
+    async def scenario():
+        kaspad, client = await make_client()
+        seen_blocks = []
+        client.add_block_listener(seen_blocks.append)
+        client.start()
+        try:
+            await wait_until(lambda: client.hub.of("resync"))
+
+            block = {
+                "header": {"daaScore": "1001", "blueScore": "900", "timestamp": "1700000000000"},
+                "transactions": [{}, {}],
+                "verboseData": {"hash": "abc"}
+            }
+            await kaspad.notify("blockAddedNotification", {"block": block})
+            await kaspad.notify("virtualDaaScoreChangedNotification", {"virtualDaaScore": "1002"})
+            await kaspad.notify("utxosChangedNotification", {
+                "added": [{"address": ADDRESS}, {"address": "kaspa:qother"}],
+                "removed": []
+            })
+            await wait_until(lambda: client.hub.of("utxos_changed"))
+
+            summary = {"hash": "abc", "daa_score": "1001", "blue_score": "900", "timestamp": "1700000000000", "tx_count": 2}
+            assert client.hub.of("block_added") == [summary]
+            assert client.cache.values["dashboard:block"] == summary
+            assert seen_blocks == [block]
+            assert client.last_block_hash == "abc"
+
+            assert client.hub.of("virtual_daa_score") == [{"virtual_daa_score": 1002}]
+            assert client.virtual_daa_score == 1002
+
+            # Seules les adresses suivies sont relayées
+            assert client.hub.of("utxos_changed") == [{"addresses": [ADDRESS]}]
+        finally:
+            await client.stop()
+            await kaspad.close()
+
+    asyncio.run(scenario())
+
+def test_reconnects_and_resyncs_after_drop():
+    async def scenario():
+        kaspad, client = await make_client()
+        client.start()
+        try:
+            await wait_until(lambda: client.hub.of("resync"))
+
+            # Le nœud a avancé pendant la coupure
+            client.kaspa_service.daa_score = 2000
+            await kaspad.connections[0].close()
+
+            await wait_until(lambda: len(kaspad.subscriptions) == 2 and len(kaspad.subscriptions[1]) == 3)
+            assert methods(kaspad.subscriptions[1]) == [
+                "notifyBlockAdded", "notifyVirtualDaaScoreChanged", "notifyUtxosChanged"
+            ]
+            await wait_until(lambda: len(client.hub.of("resync")) == 2)
+            assert client.hub.of("resync")[1] == {"virtual_daa_score": 2000}
+            assert client.virtual_daa_score == 2000
+            assert client.cache.deleted.count(BLOCK_SNAPSHOT_KEYS) == 2
+
+            # Le flux reprend sur la nouvelle connexion
+            await kaspad.notify("virtualDaaScoreChangedNotification", {"virtualDaaScore": "2001"})
+            await wait_until(lambda: client.virtual_daa_score == 2001)
+        finally:
+            await client.stop()
+            await kaspad.close()
+
+    asyncio.run(scenario())
@@ -0,0 +1,141 @@
+import asyncio
+import logging
+import time
+
+import pytest
+
+from app.core.exceptions import PriceException
+from app.services.price_engine import PriceEngine
+from app.services.price_sources import PriceSource, SourceQuote
+
+KAS_USD = ("KAS", "usd")
+
+class FakeSource(PriceSource):
+    """Source locale: prix fixe, latence et échec configurables"""
+
+    def __init__(self, name, price=1.0, delay=0.0, fail=False):
+        self.name = name
+        self.price = price
+        self.delay = delay
+        self.fail = fail
+        self.calls = []
+
+    async def fetch(self, client, pairs):
+        self.calls.append(set(pairs))
+        await asyncio.sleep(self.delay)
+        if self.fail:
+            raise PriceException(f"{self.name} unavailable")
+        return {pair: SourceQuote(self.price, change_24h=1.5) for pair in pairs}
+
+def make_engine(*sources, deadline=0.1, pairs=(KAS_USD,)):
+    engine = PriceEngine(sources=list(sources))
+    engine.deadline = deadline
+    engine.batch_window = 0.02
+    engine.wanted = set(pairs)
+    return engine
+
+def run(engine, coroutine):
+    async def scenario():
+        try:
+            return await coroutine()
+        finally:
+            await engine.stop()
+    return asyncio.run(scenario())
+
+def test_deadline_cuts_off_slow_source_which_completes_in_background():
+    fast, other, slow = FakeSource("fast", 1.00), FakeSource("other", 1.01), FakeSource("slow", 1.02, delay=0.3)
+    engine = make_engine(fast, other, slow)
+
+    async def scenario():
+        started = time.perf_counter()
+        await engine.refresh()
+        elapsed = time.perf_counter() - started
+        first = engine.quotes[KAS_USD]
+
+        await asyncio.sleep(0.35)
+        return elapsed, first, engine.quotes[KAS_USD]
+
+    elapsed, first, merged = run(engine, scenario)
+    assert elapsed < 0.25
+    assert first.sources == ["fast", "other"]
+    assert first.price == pytest.approx(1.005)
+    assert engine.get_stats()["sources"]["slow"]["late"] == 1
+    # La source lente a complété la table après l'échéance
+    assert merged.sources == ["fast", "other", "slow"]
+    assert merged.price == pytest.approx(1.01)
+
+def test_waits_for_first_answer_when_every_source_misses_deadline():
+    first, second = FakeSource("first", 2.0, delay=0.15), FakeSource("second", 3.0, delay=0.5)
+    engine = make_engine(first, second, deadline=0.05)
+
+    async def scenario():
+        started = time.perf_counter()
+        await engine.refresh()
+        return time.perf_counter() - started
+
+    elapsed = run(engine, scenario)
+    assert 0.15 <= elapsed < 0.4
+    assert engine.quotes[KAS_USD].sources == ["first"]
+    assert engine.quotes[KAS_USD].price == 2.0
+
+def test_outlier_rejected_with_three_sources(caplog):
+    pairs = [("KAS", "usd"), ("KAS", "eur"), ("KAS", "btc")]
+    sources = FakeSource("a", 1.00), FakeSource("b", 1.02), FakeSource("bad", 2.00)
+    engine = make_engine(*sources, pairs=pairs)
+
+    with caplog.at_level(logging.WARNING, logger="app.services.price_engine"):
+        run(engine, engine.refresh)
+
+    for pair in pairs:
+        assert engine.quotes[pair].sources == ["a", "b"]
+        assert engine.quotes[pair].price == pytest.approx(1.01)
+        # Métadonnées de la première source retenue
+        assert engine.quotes[pair].change_24h == 1.5
+    warnings = [record.getMessage() for record in caplog.records if "outlier" in record.getMessage()]
+    assert len(warnings) == 1
+    assert "bad" in warnings[0] and "3 pair(s)" in warnings[0]
+    assert engine.get_stats()["outliers"] == {"bad": 3}
+
+def test_two_sources_are_not_filtered():
+    engine = make_engine(FakeSource("a", 1.0), FakeSource("b", 2.0))
+    run(engine, engine.refresh)
+    assert engine.quotes[KAS_USD].price == pytest.approx(1.5)
+    assert engine.quotes[KAS_USD].sources == ["a", "b"]
+
+def test_all_sources_failing_raises():
+    engine = make_engine(FakeSource("a", fail=True), FakeSource("b", fail=True, delay=0.2))
+    with pytest.raises(PriceException):
+        run(engine, engine.refresh)
+    stats = engine.get_stats()["sources"]
+    assert stats["a"]["errors"] == 1 and stats["b"]["errors"] == 1
+
+def test_concurrent_get_quotes_share_one_upstream_call():
+    sources = FakeSource("a", 1.0, delay=0.05), FakeSource("b", 1.0)
+    engine = make_engine(*sources, pairs=())
+
+    async def scenario():
+        return await asyncio.gather(*(
+            engine.get_quotes({("KAS", currency)})
+            for currency in ("usd", "eur", "usd", "btc", "eur", "usd", "usd", "btc")
+        ))
+
+    results = run(engine, scenario)
+    assert all(len(result) == 1 for result in results)
+    for source in sources:
+        # Un seul appel, portant toutes les paires demandées pendant la fenêtre
+        assert len(source.calls) == 1
+        assert source.calls[0] == {("KAS", "usd"), ("KAS", "eur"), ("KAS", "btc")}
+    assert engine.refreshes == 1
+
+def test_stale_quotes_served_when_refresh_fails():
+    source = FakeSource("a", 1.0)
+    engine = make_engine(source)
+
+    async def scenario():
+        await engine.refresh()
+        engine.quotes[KAS_USD].fetched_at -= engine.max_age + 1
+        source.fail = True
+        return await engine.get_quotes({KAS_USD})
+
+    quotes = run(engine, scenario)
+    assert quotes[KAS_USD].price == 1.0
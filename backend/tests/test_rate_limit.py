@@ -0,0 +1,44 @@
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.core.config import settings
+from app.core.rate_limit import RateLimiter, RateLimitMiddleware
+
+class OfflineCache:
+    connected = False
+    redis_client = None
+
+def make_client(monkeypatch, routes=None) -> TestClient:
+    monkeypatch.setattr(settings, "RATE_LIMIT_PER_MINUTE", 2)
+    monkeypatch.setattr(settings, "RATE_LIMIT_ROUTES", routes or {})
+    app = FastAPI()
+
+    @app.get("/prices")
+    async def prices():
+        return {}
+
+    @app.get("/wallets/{wallet_id}")
+    async def wallet(wallet_id: str):
+        return {}
+
+    app.add_middleware(RateLimitMiddleware, limiter=RateLimiter(OfflineCache()))
+    return TestClient(app)
+
+def test_unconfigured_routes_have_their_own_bucket(monkeypatch):
+    client = make_client(monkeypatch)
+    assert [client.get("/prices").status_code for _ in range(3)] == [200, 200, 429]
+    # Autre route: compteur distinct, à la limite par défaut
+    response = client.get("/wallets/a")
+    assert response.status_code == 200
+    assert response.headers["x-ratelimit-limit"] == "2"
+
+def test_route_template_groups_path_parameters(monkeypatch):
+    client = make_client(monkeypatch)
+    statuses = [client.get(f"/wallets/{wallet_id}").status_code for wallet_id in ("a", "b", "c")]
+    assert statuses == [200, 200, 429]
+
+def test_configured_prefix_shares_its_limit(monkeypatch):
+    client = make_client(monkeypatch, {"/wallets": 1})
+    assert client.get("/wallets/a").status_code == 200
+    assert client.get("/wallets/b").status_code == 429
+    assert client.get("/prices").status_code == 200
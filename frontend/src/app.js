@@ -153,11 +153,20 @@ class KaspaZofApp {
 
     async loadDashboard() {
         try {
-            // Load all dashboard components in parallel
+            // Fetch all dashboard widgets in a single request
+            let widgets = {};
+            try {
+                const response = await api.getDashboard(['system', 'price', 'node']);
+                widgets = response.data || {};
+            } catch (error) {
+                console.error('Failed to load aggregated dashboard:', error);
+            }
+
+            // Widgets missing from the aggregated response are fetched individually
             const promises = [
-                this.loadSystemStatus(),
-                this.loadPriceInfo(),
-                this.loadNodeStatus(),
+                this.loadSystemStatus(widgets.system),
+                this.loadPriceInfo(widgets.price),
+                this.loadNodeStatus(widgets.node),
                 this.loadMiningStats()
             ];
 
@@ -167,9 +176,9 @@ class KaspaZofApp {
         }
     }
 
-    async loadSystemStatus() {
+    async loadSystemStatus(data = null) {
         try {
-            const response = await api.getSystemInfo();
+            const response = data ? { success: true, data } : await api.getSystemInfo();
             const container = document.getElementById('system-status');
             
             if (response.success && response.data) {
@@ -211,9 +220,9 @@ class KaspaZofApp {
         }
     }
 
-    async loadPriceInfo() {
+    async loadPriceInfo(data = null) {
         try {
-            const response = await api.getCurrentPrice();
+            const response = data ? { success: true, data } : await api.getCurrentPrice();
             const container = document.getElementById('price-info');
             
             if (response.success && response.data) {
@@ -241,9 +250,9 @@ class KaspaZofApp {
         }
     }
 
-    async loadNodeStatus() {
+    async loadNodeStatus(data = null) {
         try {
-            const response = await api.getNodeStatus();
+            const response = data ? { success: true, data } : await api.getNodeStatus();
             const container = document.getElementById('node-status');
             
             if (response.success && response.data) {
@@ -38,6 +38,12 @@ class ApiService {
         }
     }
 
+    // Dashboard endpoint (all widgets in one request)
+    async getDashboard(fields = null) {
+        const endpoint = fields ? `/dashboard?fields=${fields.join(',')}` : '/dashboard';
+        return this.request(endpoint);
+    }
+
     // System endpoints
     async getSystemInfo() {
         return this.request('/system/info');
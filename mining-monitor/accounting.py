@@ -0,0 +1,200 @@
+"""
+Comptabilité des blocs trouvés
+Dans Kaspa, un bloc n'est pas payé par sa propre coinbase: c'est la coinbase
+du bloc de chaîne qui le fusionne qui verse la récompense de chaque bloc bleu
+de son mergeset (une sortie par bloc). On suit donc la chaîne sélectionnée
+(getVirtualChainFromBlock) et chaque sortie payant MINING_ADDRESS compte pour
+un bloc trouvé, rattaché au bloc qui l'a payé (paid_in_block). Les blocs
+retirés de la chaîne annulent leurs paiements
+"""
+
+import logging
+from collections import OrderedDict, deque
+from datetime import datetime, timezone
+from typing import Callable, Dict, List, Optional, Tuple
+
+import psycopg2
+from psycopg2.extras import execute_values
+
+logger = logging.getLogger(__name__)
+
+SOMPI_PER_KAS = 100_000_000
+
+INSERT_BLOCKS_FOUND = """
+INSERT INTO blocks_found (timestamp, block_hash, block_height, difficulty, reward, mining_address, miner_id)
+VALUES %s
+"""
+
+# blocks_found.block_hash contient le bloc de chaîne payeur (paid_in_block)
+DELETE_BLOCKS_FOUND = "DELETE FROM blocks_found WHERE block_hash = ANY(%s)"
+
+def coinbase_payouts(block: Dict, address: str) -> List[int]:
+    """Montants (sompi) des sorties de la coinbase du bloc versées à l'adresse, une par bloc payé"""
+    transactions = block.get("transactions") or []
+    if not transactions:
+        return []
+    payouts = []
+    for output in transactions[0].get("outputs") or []:
+        verbose = output.get("verboseData") or {}
+        if verbose.get("scriptPublicKeyAddress") == address:
+            payouts.append(int(output.get("amount", 0)))
+    return payouts
+
+class FoundBlock:
+    """Récompense d'un de nos blocs, versée par la coinbase du bloc de chaîne paid_in_block"""
+
+    __slots__ = ("paid_in_block", "daa_score", "timestamp", "difficulty", "reward")
+
+    def __init__(self, paid_in_block: str, daa_score: int, timestamp: datetime, difficulty: float, reward: int):
+        self.paid_in_block = paid_in_block
+        self.daa_score = daa_score
+        self.timestamp = timestamp
+        self.difficulty = difficulty
+        self.reward = reward
+
+    def to_dict(self) -> Dict:
+        return {
+            "paid_in_block": self.paid_in_block,
+            "daa_score": self.daa_score,
+            "timestamp": self.timestamp,
+            "difficulty": self.difficulty,
+            "reward": self.reward / SOMPI_PER_KAS
+        }
+
+class BlockScanner:
+    """Suit la chaîne sélectionnée depuis le dernier curseur et repère les paiements de nos blocs"""
+
+    def __init__(self, rpc_call: Callable[..., Dict], address: str, history_size: int = 10000):
+        self.rpc_call = rpc_call
+        self.address = address
+        self.cursor: Optional[str] = None
+        # Paiements récents par bloc de chaîne, pour les annuler si ce bloc quitte la chaîne
+        self._payouts: "OrderedDict[str, List[FoundBlock]]" = OrderedDict()
+        self.history_size = history_size
+
+    def scan(self) -> Tuple[List[FoundBlock], List[FoundBlock]]:
+        """Retourne (paiements des blocs entrés dans la chaîne, paiements annulés par ceux qui en sortent)"""
+        if not self.address:
+            return [], []
+        if self.cursor is None:
+            # Premier passage: on ne compte que les blocs à venir
+            dag_info = self.rpc_call("getBlockDagInfo")
+            self.cursor = dag_info.get("sink") or (dag_info.get("tipHashes") or [None])[0]
+            return [], []
+
+        chain = self.rpc_call("getVirtualChainFromBlock", {
+            "startHash": self.cursor,
+            "includeAcceptedTransactionIds": False
+        })
+        orphaned = []
+        for block_hash in chain.get("removedChainBlockHashes") or []:
+            orphaned.extend(self._payouts.pop(block_hash, []))
+        added = chain.get("addedChainBlockHashes") or []
+        if not added:
+            return [], orphaned
+
+        # Corps des blocs en un appel; ceux hors du futur du curseur (réorganisation) un par un
+        result = self.rpc_call("getBlocks", {
+            "lowHash": self.cursor,
+            "includeBlocks": True,
+            "includeTransactions": True
+        })
+        blocks = {
+            (block.get("verboseData") or {}).get("hash"): block
+            for block in result.get("blocks") or []
+        }
+
+        found = []
+        for block_hash in added:
+            block = blocks.get(block_hash)
+            if block is None:
+                block = self.rpc_call("getBlock", {"hash": block_hash, "includeTransactions": True}).get("block") or {}
+            payouts = self._payouts_of(block_hash, block)
+            if payouts:
+                self._payouts[block_hash] = payouts
+                if len(self._payouts) > self.history_size:
+                    self._payouts.popitem(last=False)
+                found.extend(payouts)
+            self.cursor = block_hash
+        return found, orphaned
+
+    def _payouts_of(self, block_hash: str, block: Dict) -> List[FoundBlock]:
+        header = block.get("header") or {}
+        verbose = block.get("verboseData") or {}
+        timestamp = datetime.fromtimestamp(int(header.get("timestamp", 0)) / 1000, tz=timezone.utc)
+        return [
+            FoundBlock(
+                block_hash,
+                int(header.get("daaScore", 0)),
+                timestamp,
+                float(verbose.get("difficulty", 0)),
+                amount
+            )
+            for amount in coinbase_payouts(block, self.address)
+        ]
+
+class BlockFoundWriter:
+    """Tampon borné de lignes blocks_found, écrites en un seul INSERT par lot"""
+
+    def __init__(self, database_url: str, address: str, max_pending: int = 10000):
+        self.database_url = database_url
+        self.address = address
+        self.pending = deque(maxlen=max_pending)
+        # Blocs payeurs sortis de la chaîne dont les lignes déjà écrites sont à supprimer
+        self.retracted = set()
+        self._conn = None
+
+    def add(self, blocks: List[FoundBlock]):
+        if len(self.pending) + len(blocks) > self.pending.maxlen:
+            logger.warning("Tampon blocks_found plein: les plus anciennes lignes sont abandonnées")
+        for block in blocks:
+            self.pending.append((
+                block.timestamp,
+                block.paid_in_block,
+                block.daa_score,
+                block.difficulty,
+                block.reward / SOMPI_PER_KAS,
+                self.address,
+                None
+            ))
+
+    def retract(self, blocks: List[FoundBlock]):
+        """Annule les paiements de blocs sortis de la chaîne (en attente ou déjà écrits)"""
+        hashes = {block.paid_in_block for block in blocks}
+        kept = [row for row in self.pending if row[1] not in hashes]
+        self.pending.clear()
+        self.pending.extend(kept)
+        if self.database_url:
+            self.retracted.update(hashes)
+
+    def flush(self) -> int:
+        """Écrit les lignes en attente; elles sont conservées en cas d'échec"""
+        if not self.database_url or not (self.pending or self.retracted):
+            return 0
+        rows = list(self.pending)
+        retracted = list(self.retracted)
+        try:
+            if self._conn is None or self._conn.closed:
+                self._conn = psycopg2.connect(self.database_url)
+            with self._conn, self._conn.cursor() as cursor:
+                if retracted:
+                    cursor.execute(DELETE_BLOCKS_FOUND, (retracted,))
+                if rows:
+                    execute_values(cursor, INSERT_BLOCKS_FOUND, rows)
+        except psycopg2.Error as e:
+            logger.error(f"Écriture blocks_found échouée ({len(rows)} lignes en attente): {e}")
+            self.close()
+            return 0
+
+        self.retracted.difference_update(retracted)
+        for _ in rows:
+            self.pending.popleft()
+        return len(rows)
+
+    def close(self):
+        if self._conn is not None:
+            try:
+                self._conn.close()
+            except psycopg2.Error:
+                pass
+            self._conn = None
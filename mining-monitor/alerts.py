@@ -0,0 +1,329 @@
+"""
+Évaluation des alertes en continu
+Les règles Prometheus de monitoring/mining_rules.yml sont chargées et
+évaluées à chaque collecte (sous-ensemble PromQL: comparaisons entre
+métriques, constantes, métrique x facteur et increase(métrique[durée])).
+Les fenêtres glissantes sont échantillonnées par paliers: mémoire bornée
+par règle, quelle que soit la fréquence de collecte
+"""
+
+import json
+import logging
+import re
+import threading
+import time
+from collections import deque
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+
+import psycopg2
+import requests
+import yaml
+from psycopg2.extras import Json, execute_values
+
+logger = logging.getLogger(__name__)
+
+INSERT_MINING_EVENTS = """
+INSERT INTO mining_events (timestamp, event_type, description, miner_id, data)
+VALUES %s
+"""
+
+DURATION_UNITS = {"s": 1, "m": 60, "h": 3600, "d": 86400}
+COMPARISON = re.compile(r"^(?P<lhs>.+?)\s*(?P<op><=|>=|==|!=|<|>)\s*(?P<rhs>.+)$")
+NUMBER = re.compile(r"^[-+]?\d+(\.\d+)?([eE][-+]?\d+)?$")
+METRIC = re.compile(r"^[a-zA-Z_:][a-zA-Z0-9_:]*$")
+SCALED = re.compile(r"^(?P<metric>[a-zA-Z_:][a-zA-Z0-9_:]*)\s*\*\s*(?P<factor>[-+]?\d+(\.\d+)?)$")
+INCREASE = re.compile(r"^increase\(\s*(?P<metric>[a-zA-Z_:][a-zA-Z0-9_:]*)\[(?P<window>\d+[smhd])\]\s*\)$")
+
+OPERATORS = {
+    "<": lambda a, b: a < b,
+    "<=": lambda a, b: a <= b,
+    ">": lambda a, b: a > b,
+    ">=": lambda a, b: a >= b,
+    "==": lambda a, b: a == b,
+    "!=": lambda a, b: a != b
+}
+
+class UnsupportedExpression(ValueError):
+    pass
+
+def parse_duration(value: str) -> float:
+    if not value:
+        return 0.0
+    return float(value[:-1]) * DURATION_UNITS[value[-1]]
+
+class WindowIncrease:
+    """
+    increase() sur fenêtre glissante: au plus `resolution` repères (t, cumul).
+    Compteur (suffixe _total): une baisse est une remise à zéro.
+    Jauge: variation simple (delta()), une baisse n'est pas un redémarrage
+    """
+
+    __slots__ = ("window", "step", "counter", "marks", "cumulative", "last", "samples")
+
+    def __init__(self, window: float, counter: bool = True, resolution: int = 60):
+        self.window = window
+        self.counter = counter
+        self.step = window / resolution
+        self.marks = deque(maxlen=resolution + 2)
+        self.cumulative = 0.0
+        self.last: Optional[float] = None
+        self.samples = 0
+
+    def add(self, timestamp: float, value: float):
+        if self.last is not None:
+            if self.counter and value < self.last:
+                # Remise à zéro du compteur (sémantique PromQL)
+                self.cumulative += value
+            else:
+                self.cumulative += value - self.last
+        self.last = value
+        self.samples += 1
+        if not self.marks or timestamp - self.marks[-1][0] >= self.step:
+            self.marks.append((timestamp, self.cumulative))
+        # Conserver un repère au début de la fenêtre
+        while len(self.marks) > 1 and self.marks[1][0] <= timestamp - self.window:
+            self.marks.popleft()
+
+    def value(self) -> Optional[float]:
+        if self.samples < 2:
+            return None
+        return self.cumulative - self.marks[0][1]
+
+class Operand:
+    def __init__(self, text: str):
+        text = text.strip()
+        while text.startswith("(") and text.endswith(")"):
+            text = text[1:-1].strip()
+        self.metric: Optional[str] = None
+        self.constant: Optional[float] = None
+        self.factor = 1.0
+        self.increase: Optional[WindowIncrease] = None
+
+        if NUMBER.match(text):
+            self.constant = float(text)
+        elif METRIC.match(text):
+            self.metric = text
+        elif SCALED.match(text):
+            match = SCALED.match(text)
+            self.metric = match["metric"]
+            self.factor = float(match["factor"])
+        elif INCREASE.match(text):
+            match = INCREASE.match(text)
+            self.metric = match["metric"]
+            # Sur une jauge (ex. difficulté), les petites baisses ne sont pas des remises à zéro
+            self.increase = WindowIncrease(parse_duration(match["window"]), counter=self.metric.endswith("_total"))
+        else:
+            raise UnsupportedExpression(text)
+
+    def observe(self, timestamp: float, sample: Dict[str, float]):
+        if self.increase is not None and self.metric in sample:
+            self.increase.add(timestamp, sample[self.metric])
+
+    def value(self, sample: Dict[str, float]) -> Optional[float]:
+        if self.constant is not None:
+            return self.constant
+        if self.increase is not None:
+            return self.increase.value()
+        value = sample.get(self.metric)
+        return None if value is None else value * self.factor
+
+class AlertRule:
+    def __init__(self, name: str, expr: str, for_: str = None, labels: Dict = None, annotations: Dict = None):
+        match = COMPARISON.match(expr.strip())
+        if not match:
+            raise UnsupportedExpression(expr)
+        self.name = name
+        self.expr = expr.strip()
+        self.lhs = Operand(match["lhs"])
+        self.op = match["op"]
+        self.rhs = Operand(match["rhs"])
+        self.for_seconds = parse_duration(for_)
+        self.labels = labels or {}
+        self.annotations = annotations or {}
+        self.state = "inactive"
+        self.active_since: Optional[float] = None
+        self.value: Optional[float] = None
+
+    def evaluate(self, timestamp: float, sample: Dict[str, float]) -> Optional[Dict]:
+        """Met à jour l'état; renvoie un événement lors des passages firing/resolved"""
+        self.lhs.observe(timestamp, sample)
+        self.rhs.observe(timestamp, sample)
+        lhs = self.lhs.value(sample)
+        rhs = self.rhs.value(sample)
+        # Absence de donnée: condition fausse (comme une série absente)
+        active = lhs is not None and rhs is not None and OPERATORS[self.op](lhs, rhs)
+        self.value = lhs
+
+        if not active:
+            was_firing = self.state == "firing"
+            self.state = "inactive"
+            self.active_since = None
+            return self._event("resolved", timestamp) if was_firing else None
+
+        if self.state == "inactive":
+            self.state = "pending"
+            self.active_since = timestamp
+        if self.state == "pending" and timestamp - self.active_since >= self.for_seconds:
+            self.state = "firing"
+            return self._event("firing", timestamp)
+        return None
+
+    def _render(self, template: str) -> str:
+        value = "" if self.value is None else f"{self.value:g}"
+        return re.sub(r"\{\{\s*\$value\s*\}\}", value, template)
+
+    def _event(self, status: str, timestamp: float) -> Dict:
+        return {
+            "alert": self.name,
+            "status": status,
+            "severity": self.labels.get("severity", "warning"),
+            "summary": self._render(self.annotations.get("summary", self.name)),
+            "description": self._render(self.annotations.get("description", "")),
+            "value": self.value,
+            "expr": self.expr,
+            "timestamp": datetime.fromtimestamp(timestamp, timezone.utc).isoformat()
+        }
+
+    def snapshot(self) -> Dict:
+        return {
+            "alert": self.name,
+            "expr": self.expr,
+            "for_seconds": self.for_seconds,
+            "state": self.state,
+            "value": self.value,
+            "active_since": datetime.fromtimestamp(self.active_since, timezone.utc) if self.active_since else None
+        }
+
+class AlertEvaluator:
+    def __init__(self, rules: List[AlertRule]):
+        self.rules = rules
+
+    @classmethod
+    def from_file(cls, path: str) -> "AlertEvaluator":
+        """Charge les règles supportées d'un fichier de règles Prometheus"""
+        try:
+            with open(path) as f:
+                document = yaml.safe_load(f) or {}
+        except (OSError, yaml.YAMLError) as e:
+            logger.warning(f"Règles d'alerte non chargées ({path}): {e}")
+            return cls([])
+
+        rules = []
+        for group in document.get("groups", []):
+            for rule in group.get("rules", []):
+                if "alert" not in rule:
+                    continue
+                try:
+                    rules.append(AlertRule(
+                        rule["alert"],
+                        str(rule["expr"]),
+                        rule.get("for"),
+                        rule.get("labels"),
+                        rule.get("annotations")
+                    ))
+                except UnsupportedExpression as e:
+                    logger.info(f"Règle {rule['alert']} ignorée (expression non évaluable localement: {e})")
+        logger.info(f"{len(rules)} règle(s) d'alerte évaluée(s) localement")
+        return cls(rules)
+
+    def evaluate(self, sample: Dict[str, float], timestamp: float = None) -> List[Dict]:
+        if timestamp is None:
+            timestamp = time.time()
+        events = []
+        for rule in self.rules:
+            event = rule.evaluate(timestamp, sample)
+            if event:
+                events.append(event)
+        return events
+
+    def snapshot(self) -> List[Dict]:
+        return [rule.snapshot() for rule in self.rules]
+
+class AlertNotifier:
+    """Diffusion des événements d'alerte: mining_events, webhook et flux du backend"""
+
+    def __init__(
+        self,
+        database_url: str,
+        webhook_url: str,
+        feed_url: str,
+        feed_token: str,
+        max_pending: int = 1000,
+        timeout: int = 5
+    ):
+        self.database_url = database_url
+        self.webhook_url = webhook_url
+        self.feed_url = feed_url
+        self.feed_token = feed_token
+        self.timeout = timeout
+        self.session = requests.Session()
+        # Une file par destination: un échec n'en bloque pas une autre
+        self.pending = {
+            name: deque(maxlen=max_pending)
+            for name, enabled in (("database", database_url), ("webhook", webhook_url), ("feed", feed_url))
+            if enabled
+        }
+        self._conn = None
+        # Un seul envoi à la fois (tâche de diffusion et arrêt du service)
+        self._lock = threading.Lock()
+
+    def add(self, events: List[Dict]):
+        for queue in self.pending.values():
+            queue.extend(events)
+
+    def flush(self):
+        """Envoie les événements en attente (conservés en cas d'échec)"""
+        senders = {"database": self._write_events, "webhook": self._post_webhook, "feed": self._post_feed}
+        with self._lock:
+            self._flush(senders)
+
+    def _flush(self, senders):
+        for name, queue in self.pending.items():
+            if not queue:
+                continue
+            events = list(queue)
+            try:
+                senders[name](events)
+            except (psycopg2.Error, requests.RequestException) as e:
+                logger.warning(f"Diffusion des alertes vers {name} échouée ({len(events)} en attente): {e}")
+                if name == "database":
+                    self.close()
+                continue
+            # add() peut avoir ajouté (et la file bornée évincé) des événements
+            # pendant l'envoi: on ne retire en tête que ceux réellement envoyés
+            sent = {id(event) for event in events}
+            while queue and id(queue[0]) in sent:
+                queue.popleft()
+
+    def _write_events(self, events: List[Dict]):
+        rows = [
+            (event["timestamp"], f"alert_{event['status']}", event["summary"], None, Json(event))
+            for event in events
+        ]
+        if self._conn is None or self._conn.closed:
+            self._conn = psycopg2.connect(self.database_url, connect_timeout=self.timeout)
+        with self._conn, self._conn.cursor() as cursor:
+            execute_values(cursor, INSERT_MINING_EVENTS, rows)
+
+    def _post_webhook(self, events: List[Dict]):
+        response = self.session.post(self.webhook_url, json={"alerts": events}, timeout=self.timeout)
+        response.raise_for_status()
+
+    def _post_feed(self, events: List[Dict]):
+        headers = {"Authorization": f"Bearer {self.feed_token}"} if self.feed_token else {}
+        response = self.session.post(
+            self.feed_url,
+            data=json.dumps(events, default=str),
+            headers={"Content-Type": "application/json", **headers},
+            timeout=self.timeout
+        )
+        response.raise_for_status()
+
+    def close(self):
+        if self._conn is not None:
+            try:
+                self._conn.close()
+            except psycopg2.Error:
+                pass
+            self._conn = None
@@ -0,0 +1,104 @@
+"""
+Flux de blocs poussé par le backend
+Le backend est abonné aux notifications de kaspad (blockAdded, score DAA)
+et les relaie en Server-Sent Events sur /api/v1/stream: le moniteur s'y
+abonne pour collecter dès qu'un bloc arrive au lieu d'attendre le
+prochain cycle de 30 secondes
+"""
+
+import json
+import logging
+import random
+import threading
+from typing import Callable, Dict, Optional
+
+import requests
+
+logger = logging.getLogger(__name__)
+
+# Événements qui déclenchent une collecte
+TRIGGER_EVENTS = {"block_added", "resync"}
+
+class BlockFeed:
+    """Client SSE en thread dédié, reconnexion avec backoff et reprise via Last-Event-ID"""
+
+    def __init__(self, url: str, on_event: Callable[[str, Dict], None]):
+        self.url = url
+        self.on_event = on_event
+        self.connected = False
+        self.last_event_id: Optional[str] = None
+        self.events = 0
+        self.min_reconnect_delay = 1.0
+        self.max_reconnect_delay = 30.0
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._response: Optional[requests.Response] = None
+
+    def start(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="block-feed", daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        # Débloque la lecture en cours
+        if self._response is not None:
+            self._response.close()
+
+    def _run(self):
+        delay = self.min_reconnect_delay
+        while not self._stop.is_set():
+            try:
+                self._consume()
+                delay = self.min_reconnect_delay
+            except (requests.RequestException, ValueError) as e:
+                if not self._stop.is_set():
+                    logger.warning(f"Flux de blocs interrompu: {e}")
+            finally:
+                self.connected = False
+                self._response = None
+            # Backoff exponentiel avec gigue
+            self._stop.wait(delay + random.uniform(0, delay / 2))
+            delay = min(delay * 2, self.max_reconnect_delay)
+
+    def _consume(self):
+        headers = {"Accept": "text/event-stream"}
+        if self.last_event_id:
+            headers["Last-Event-ID"] = self.last_event_id
+        # Lecture sans délai maximal: le backend envoie des heartbeats
+        with requests.get(self.url, headers=headers, stream=True, timeout=(5, 60)) as response:
+            response.raise_for_status()
+            self._response = response
+            self.connected = True
+            logger.info(f"Flux de blocs connecté: {self.url}")
+
+            event, data = None, []
+            # chunk_size=None: chaque morceau HTTP est traité dès réception
+            for line in response.iter_lines(chunk_size=None, decode_unicode=True):
+                if self._stop.is_set():
+                    return
+                if line is None:
+                    continue
+                if not line:
+                    # Fin de trame
+                    if event in TRIGGER_EVENTS and data:
+                        self._emit(event, "\n".join(data))
+                    event, data = None, []
+                elif line.startswith("id:"):
+                    self.last_event_id = line[3:].strip()
+                elif line.startswith("event:"):
+                    event = line[6:].strip()
+                elif line.startswith("data:"):
+                    data.append(line[5:].strip())
+
+    def _emit(self, event: str, data: str):
+        try:
+            message = json.loads(data)
+        except ValueError:
+            return
+        self.events += 1
+        try:
+            self.on_event(event, message.get("payload") or {})
+        except Exception as e:
+            logger.warning(f"Traitement de l'événement {event} échoué: {e}")
@@ -0,0 +1,94 @@
+"""
+Estimation du hashrate réseau et du rythme de blocs Kaspa
+Fenêtre glissante d'échantillons (score DAA, nombre de blocs, difficulté)
+avec sommes incrémentales: chaque ajout est en O(1)
+"""
+
+from collections import deque
+from typing import Dict, Optional
+
+# Travail attendu (en hashes) par unité de difficulté et par bloc
+HASHES_PER_DIFFICULTY = 2.0
+
+
+class NetworkEstimator:
+    """Estimateur réseau sur fenêtre glissante (ring buffer)"""
+
+    def __init__(self, window: int = 120):
+        self.window = window
+        self.samples = deque(maxlen=window)
+        self._origin: Optional[float] = None
+        # Sommes glissantes pour la moyenne et la régression linéaire difficulté/temps
+        self._sum_t = 0.0
+        self._sum_d = 0.0
+        self._sum_tt = 0.0
+        self._sum_td = 0.0
+
+    def add_sample(self, timestamp: float, daa_score: int, block_count: int, difficulty: float):
+        """Ajoute un échantillon (timestamp en secondes)"""
+        if self.samples and timestamp <= self.samples[-1][0]:
+            return
+        if self._origin is None:
+            self._origin = timestamp
+
+        if len(self.samples) == self.window:
+            self._update_sums(self.samples[0], -1)
+
+        sample = (timestamp, daa_score, block_count, difficulty)
+        self.samples.append(sample)
+        self._update_sums(sample, 1)
+
+    def _update_sums(self, sample, sign: int):
+        # Temps relatif à l'origine pour garder la précision des carrés
+        t = sample[0] - self._origin
+        d = sample[3]
+        self._sum_t += sign * t
+        self._sum_d += sign * d
+        self._sum_tt += sign * t * t
+        self._sum_td += sign * t * d
+
+    def _elapsed(self) -> float:
+        return self.samples[-1][0] - self.samples[0][0] if len(self.samples) > 1 else 0.0
+
+    def daa_rate(self) -> float:
+        """Incréments de score DAA par seconde (blocs fusionnés dans la chaîne)"""
+        elapsed = self._elapsed()
+        if elapsed <= 0:
+            return 0.0
+        return (self.samples[-1][1] - self.samples[0][1]) / elapsed
+
+    def blocks_per_second(self) -> float:
+        """Blocs ajoutés au DAG par seconde"""
+        elapsed = self._elapsed()
+        if elapsed <= 0:
+            return 0.0
+        return (self.samples[-1][2] - self.samples[0][2]) / elapsed
+
+    def mean_difficulty(self) -> float:
+        return self._sum_d / len(self.samples) if self.samples else 0.0
+
+    def network_hashrate(self) -> float:
+        """Hashrate réseau estimé (H/s) = difficulté moyenne x travail par bloc x rythme DAA"""
+        return self.mean_difficulty() * HASHES_PER_DIFFICULTY * self.daa_rate()
+
+    def difficulty_trend(self) -> float:
+        """Variation relative de la difficulté par heure (pente de régression / moyenne)"""
+        n = len(self.samples)
+        if n < 2:
+            return 0.0
+        denominator = n * self._sum_tt - self._sum_t ** 2
+        mean = self.mean_difficulty()
+        if denominator <= 0 or mean <= 0:
+            return 0.0
+        slope = (n * self._sum_td - self._sum_t * self._sum_d) / denominator
+        return slope * 3600 / mean
+
+    def snapshot(self) -> Dict[str, float]:
+        return {
+            "network_hashrate": self.network_hashrate(),
+            "blocks_per_second": self.blocks_per_second(),
+            "daa_score_rate": self.daa_rate(),
+            "mean_difficulty": self.mean_difficulty(),
+            "difficulty_trend": self.difficulty_trend(),
+            "samples": len(self.samples)
+        }
@@ -0,0 +1,74 @@
+"""
+Export en streaming des tables de minage
+Curseur serveur PostgreSQL lu par lots, encodé en NDJSON, CSV ou Parquet
+au fil de l'eau: la mémoire reste constante quelle que soit la plage
+"""
+
+from datetime import datetime
+from typing import Iterator, Optional
+
+from shared.export import ENCODERS
+
+# Tables exportables, leurs colonnes et leur type (schéma Parquet)
+EXPORT_TABLES = {
+    "mining_stats": {
+        "timestamp": "timestamp",
+        "hashrate": "float64",
+        "difficulty": "float64",
+        "block_height": "int64",
+        "blocks_found": "int64",
+        "shares_submitted": "int64",
+        "peer_count": "int64",
+        "mining_address": "string",
+        "miner_id": "string"
+    },
+    "blocks_found": {
+        "timestamp": "timestamp",
+        "block_hash": "string",
+        "block_height": "int64",
+        "difficulty": "float64",
+        "reward": "float64",
+        "mining_address": "string",
+        "miner_id": "string"
+    },
+    "mining_events": {
+        "timestamp": "timestamp",
+        "event_type": "string",
+        "description": "string",
+        "miner_id": "string",
+        "data": "json"
+    }
+}
+
+def stream_table(
+    conn,
+    table: str,
+    fmt: str,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    batch_size: int = 2000
+) -> Iterator[bytes]:
+    """Lit la table via un curseur serveur nommé et produit les octets encodés (ferme la connexion)"""
+    columns = tuple(EXPORT_TABLES[table])
+    encoder = ENCODERS[fmt](columns, tuple(EXPORT_TABLES[table].values()))
+    try:
+        with conn.cursor(name=f"export_{table}") as cursor:
+            cursor.itersize = batch_size
+            cursor.execute(
+                f"SELECT {', '.join(columns)} FROM {table} "
+                "WHERE (%s IS NULL OR timestamp >= %s) AND (%s IS NULL OR timestamp <= %s) "
+                "ORDER BY timestamp",
+                (start, start, end, end)
+            )
+            while True:
+                rows = cursor.fetchmany(batch_size)
+                if not rows:
+                    break
+                chunk = encoder.encode(rows)
+                if chunk:
+                    yield chunk
+        tail = encoder.close()
+        if tail:
+            yield tail
+    finally:
+        conn.close()
@@ -0,0 +1,179 @@
+"""
+Agrégation d'une flotte de mineurs
+État compact par mineur et métriques Prometheus étiquetées par mineur,
+avec un nombre d'étiquettes borné (les mineurs en excès sont agrégés sous "other")
+"""
+
+import re
+import time
+from typing import Dict, List, Optional, Set, Tuple
+
+from metrics import counter, gauge, remove_series, series
+
+# Étiquette commune aux mineurs au-delà de la limite de cardinalité
+OVERFLOW_LABEL = "other"
+
+# Longueur de miner_id dans mining_stats (VARCHAR(100))
+MAX_MINER_ID_LENGTH = 100
+
+_INVALID_ID_CHARS = re.compile(r"[^A-Za-z0-9_.:-]")
+
+miner_hashrate = gauge('kaspa_miner_hashrate', 'Hashrate par mineur en H/s', ['miner'])
+miner_temperature = gauge('kaspa_miner_temperature_celsius', 'Température maximale par mineur', ['miner'])
+miner_last_seen = gauge('kaspa_miner_last_seen_timestamp', 'Dernier rapport reçu par mineur', ['miner'])
+miner_shares = counter('kaspa_miner_shares_total', 'Shares par mineur et par résultat', ['miner', 'result'])
+fleet_miners = gauge('kaspa_fleet_miners', 'Nombre de mineurs actifs')
+fleet_hashrate = gauge('kaspa_fleet_hashrate', 'Hashrate total de la flotte en H/s')
+
+def normalize_miner_id(miner_id: str) -> str:
+    """Identifiant de mineur sûr pour une étiquette et la base"""
+    return _INVALID_ID_CHARS.sub("_", miner_id.strip())[:MAX_MINER_ID_LENGTH]
+
+class MinerState:
+    """État courant d'un mineur"""
+
+    __slots__ = (
+        "miner_id", "label", "hashrate", "shares_accepted", "shares_rejected",
+        "temperature", "last_seen", "source"
+    )
+
+    def __init__(self, miner_id: str, label: str, source: str):
+        self.miner_id = miner_id
+        self.label = label
+        self.hashrate = 0.0
+        # Totaux cumulés du mineur; None tant qu'aucun rapport ne les a fournis
+        self.shares_accepted: Optional[int] = None
+        self.shares_rejected: Optional[int] = None
+        self.temperature: Optional[float] = None
+        self.last_seen = 0.0
+        self.source = source
+
+    def to_dict(self) -> Dict:
+        return {
+            "miner_id": self.miner_id,
+            "hashrate": self.hashrate,
+            "shares_accepted": self.shares_accepted or 0,
+            "shares_rejected": self.shares_rejected or 0,
+            "temperature": self.temperature,
+            "last_seen": self.last_seen,
+            "source": self.source
+        }
+
+class MinerFleet:
+    """Registre des mineurs alimenté par push HTTP ou par scraping"""
+
+    def __init__(self, max_miners: int = 1024, max_labels: int = 64, stale_after: float = 300.0):
+        self.max_miners = max_miners
+        self.max_labels = max_labels
+        self.stale_after = stale_after
+        self.miners: Dict[str, MinerState] = {}
+        self._labels: Set[str] = set()
+
+    def _assign_label(self, miner_id: str) -> str:
+        if len(self._labels) < self.max_labels:
+            self._labels.add(miner_id)
+            return miner_id
+        return OVERFLOW_LABEL
+
+    def report(
+        self,
+        miner_id: str,
+        hashrate: float,
+        shares_accepted: Optional[int] = None,
+        shares_rejected: Optional[int] = None,
+        temperature: Optional[float] = None,
+        source: str = "push",
+        timestamp: float = None
+    ) -> Optional[Tuple[int, int]]:
+        """
+        Enregistre un rapport (compteurs de shares cumulés côté mineur).
+        Retourne les nouvelles shares (acceptées, rejetées), ou None si la flotte est pleine.
+        """
+        miner_id = normalize_miner_id(miner_id)
+        state = self.miners.get(miner_id)
+        if state is None:
+            if len(self.miners) >= self.max_miners:
+                return None
+            state = MinerState(miner_id, self._assign_label(miner_id), source)
+            self.miners[miner_id] = state
+
+        accepted = self._delta(state.shares_accepted, shares_accepted)
+        rejected = self._delta(state.shares_rejected, shares_rejected)
+        if shares_accepted is not None:
+            state.shares_accepted = shares_accepted
+        if shares_rejected is not None:
+            state.shares_rejected = shares_rejected
+
+        state.hashrate = max(float(hashrate), 0.0)
+        state.temperature = temperature
+        state.last_seen = timestamp or time.time()
+        state.source = source
+
+        if accepted:
+            series(miner_shares, state.label, "accepted").inc(accepted)
+        if rejected:
+            series(miner_shares, state.label, "rejected").inc(rejected)
+        return accepted, rejected
+
+    @staticmethod
+    def _delta(previous: Optional[int], current: Optional[int]) -> int:
+        if current is None or previous is None:
+            # Première observation (démarrage, mineur oublié puis revenu): le total sert de référence
+            return 0
+        # Compteur remis à zéro (redémarrage du mineur): la valeur courante est le delta
+        return current - previous if current >= previous else current
+
+    def prune(self, now: float = None) -> List[str]:
+        """Oublie les mineurs silencieux et libère leurs étiquettes"""
+        now = now or time.time()
+        stale = [
+            miner_id for miner_id, state in self.miners.items()
+            if now - state.last_seen > self.stale_after
+        ]
+        for miner_id in stale:
+            state = self.miners.pop(miner_id)
+            if state.label != OVERFLOW_LABEL:
+                self._labels.discard(state.label)
+                self._remove_series(state.label)
+        return stale
+
+    @staticmethod
+    def _remove_series(label: str):
+        for metric, labelvalues in (
+            (miner_hashrate, (label,)),
+            (miner_temperature, (label,)),
+            (miner_last_seen, (label,)),
+            (miner_shares, (label, "accepted")),
+            (miner_shares, (label, "rejected"))
+        ):
+            remove_series(metric, *labelvalues)
+
+    def total_hashrate(self) -> float:
+        return sum(state.hashrate for state in self.miners.values())
+
+    def export(self):
+        """Met à jour les jauges par étiquette (mineurs en excès agrégés)"""
+        hashrates: Dict[str, float] = {}
+        temperatures: Dict[str, float] = {}
+        last_seen: Dict[str, float] = {}
+        for state in self.miners.values():
+            label = state.label
+            hashrates[label] = hashrates.get(label, 0.0) + state.hashrate
+            last_seen[label] = max(last_seen.get(label, 0.0), state.last_seen)
+            if state.temperature is not None:
+                temperatures[label] = max(temperatures.get(label, state.temperature), state.temperature)
+
+        for label, value in hashrates.items():
+            miner_hashrate.labels(label).set(value)
+            miner_last_seen.labels(label).set(last_seen[label])
+        for label, value in temperatures.items():
+            miner_temperature.labels(label).set(value)
+        if OVERFLOW_LABEL not in hashrates:
+            self._remove_series(OVERFLOW_LABEL)
+
+        fleet_miners.set(len(self.miners))
+        fleet_hashrate.set(sum(hashrates.values()))
+
+    def snapshot(self, offset: int = 0, limit: int = 100) -> List[Dict]:
+        states = sorted(self.miners.values(), key=lambda state: state.miner_id)
+        return [state.to_dict() for state in states[offset:offset + limit]]
@@ -19,6 +19,7 @@ CREATE TABLE IF NOT EXISTS mining_stats (
 CREATE TABLE IF NOT EXISTS blocks_found (
     id SERIAL PRIMARY KEY,
     timestamp TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+    -- Bloc de chaîne dont la coinbase a versé la récompense (une ligne par sortie)
     block_hash VARCHAR(255) NOT NULL,
     block_height BIGINT NOT NULL,
     difficulty DECIMAL(30, 2) NOT NULL,
@@ -42,6 +43,7 @@ CREATE INDEX IF NOT EXISTS idx_mining_stats_timestamp ON mining_stats(timestamp)
 CREATE INDEX IF NOT EXISTS idx_mining_stats_miner_id ON mining_stats(miner_id);
 CREATE INDEX IF NOT EXISTS idx_blocks_found_timestamp ON blocks_found(timestamp);
 CREATE INDEX IF NOT EXISTS idx_blocks_found_height ON blocks_found(block_height);
+CREATE INDEX IF NOT EXISTS idx_blocks_found_hash ON blocks_found(block_hash);
 CREATE INDEX IF NOT EXISTS idx_mining_events_timestamp ON mining_events(timestamp);
 CREATE INDEX IF NOT EXISTS idx_mining_events_type ON mining_events(event_type);
 
@@ -5,40 +5,119 @@ Collecte les métriques de performance et les statistiques de minage
 """
 
 import asyncio
+import hmac
 import json
 import logging
+import math
 import os
+import threading
 import time
+from collections import deque
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional
 
 import requests
 import uvicorn
-from fastapi import FastAPI, HTTPException
-from prometheus_client import Counter, Gauge, Histogram, generate_latest
-from pydantic import BaseModel
+import psycopg2
+from fastapi import Depends, FastAPI, Header, HTTPException, Query, Request, Response
+from fastapi.encoders import jsonable_encoder
+from fastapi.exceptions import RequestValidationError
+from fastapi.responses import JSONResponse, PlainTextResponse, StreamingResponse
+from pydantic import BaseModel, ConfigDict, Field, ValidationError
+
+from accounting import BlockFoundWriter, BlockScanner
+from alerts import AlertEvaluator, AlertNotifier
+from block_feed import BlockFeed
+from estimator import HASHES_PER_DIFFICULTY, NetworkEstimator
+from export import EXPORT_TABLES, stream_table
+from fleet import MinerFleet, normalize_miner_id
+from profitability import emission_per_second, rank_scenarios, scenario_grid
+from metrics import MULTIPROC_DIR, REGISTRY, acquire_collector_role, counter, gauge, render
+from shared.export import EXPORT_MEDIA_TYPES, PARQUET_AVAILABLE
+from shared.loop_monitor import LoopMonitor
+from shared.profiler import ProfilerBusyError, SamplingProfiler, memory_diff
+from worker_state import WorkerState
 
 # Configuration
 KASPA_RPC_URL = os.getenv("KASPA_RPC_URL", "http://localhost:16210")
 KASPA_RPC_USER = os.getenv("KASPA_RPC_USER", "kaspa")
 KASPA_RPC_PASS = os.getenv("KASPA_RPC_PASS", "changeme123")
 MINING_ADDRESS = os.getenv("MINING_ADDRESS", "")
+DATABASE_URL = os.getenv("DATABASE_URL", "")
+RECENT_BLOCKS_SIZE = int(os.getenv("RECENT_BLOCKS_SIZE", "100"))
+ESTIMATOR_WINDOW = int(os.getenv("ESTIMATOR_WINDOW", "120"))
+FLEET_MAX_MINERS = int(os.getenv("FLEET_MAX_MINERS", "1024"))
+FLEET_MAX_LABELS = int(os.getenv("FLEET_MAX_LABELS", "64"))
+FLEET_STALE_AFTER = float(os.getenv("FLEET_STALE_AFTER", "300"))
+# Mineurs à interroger: "rig1=http://10.0.0.11:4000/stats,rig2=http://10.0.0.12:4000/stats"
+FLEET_MINER_URLS = os.getenv("FLEET_MINER_URLS", "")
+LOOP_MONITOR_ENABLED = os.getenv("LOOP_MONITOR_ENABLED", "true").lower() in ("1", "true", "yes")
+LOOP_LAG_INTERVAL = float(os.getenv("LOOP_LAG_INTERVAL", "0.5"))
+SLOW_CALLBACK_THRESHOLD = float(os.getenv("SLOW_CALLBACK_THRESHOLD", "0.1"))
+# Profilage à la demande (/admin/*), désactivé si le jeton est vide
+ADMIN_TOKEN = os.getenv("ADMIN_TOKEN", "")
+PROFILE_MAX_SECONDS = float(os.getenv("PROFILE_MAX_SECONDS", "60"))
+# Rentabilité: prix depuis le backend, récompense de bloc estimée si non fournie
+BACKEND_URL = os.getenv("BACKEND_URL", "http://localhost:8000")
+BLOCK_REWARD_KAS = float(os.getenv("BLOCK_REWARD_KAS", "0"))
+NETWORK_BPS = float(os.getenv("NETWORK_BPS", "10"))
+PRICE_CACHE_TTL = float(os.getenv("PRICE_CACHE_TTL", "60"))
+PROFITABILITY_MAX_SCENARIOS = int(os.getenv("PROFITABILITY_MAX_SCENARIOS", "1000000"))
+# Alertes évaluées à chaque collecte (image: /app/monitoring, dépôt: ../monitoring)
+ALERT_RULES_PATH = os.getenv("ALERT_RULES_PATH", next(
+    (path for path in (
+        os.path.join(os.path.dirname(os.path.abspath(__file__)), "monitoring", "mining_rules.yml"),
+        os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "monitoring", "mining_rules.yml")
+    ) if os.path.exists(path)),
+    "monitoring/mining_rules.yml"
+))
+ALERT_WEBHOOK_URL = os.getenv("ALERT_WEBHOOK_URL", "")
+# Flux WebSocket/SSE du backend (jeton ADMIN_TOKEN partagé)
+ALERT_FEED_URL = os.getenv("ALERT_FEED_URL", f"{BACKEND_URL}/api/v1/stream/mining-alerts")
+# Notifications de blocs relayées par le backend (vide: collecte périodique seule)
+BLOCK_FEED_URL = os.getenv("BLOCK_FEED_URL", f"{BACKEND_URL}/api/v1/stream")
+COLLECT_INTERVAL = float(os.getenv("COLLECT_INTERVAL", "30"))
+COLLECT_MIN_INTERVAL = float(os.getenv("COLLECT_MIN_INTERVAL", "2"))
+ALERT_RETRY_INTERVAL = float(os.getenv("ALERT_RETRY_INTERVAL", "30"))
+ALERT_DELIVERY_TIMEOUT = int(os.getenv("ALERT_DELIVERY_TIMEOUT", "5"))
+# Multiprocess: intervalle d'intégration des rapports reçus par les autres workers
+REPORT_SPOOL_INTERVAL = float(os.getenv("REPORT_SPOOL_INTERVAL", "1"))
 
 # Logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 # Métriques Prometheus
-mining_hashrate = Gauge('kaspa_mining_hashrate', 'Hashrate de minage en H/s')
-mining_blocks_found = Counter('kaspa_mining_blocks_found_total', 'Nombre de blocs trouvés')
-mining_shares_submitted = Counter('kaspa_mining_shares_submitted_total', 'Nombre de shares soumises')
-mining_difficulty = Gauge('kaspa_mining_difficulty', 'Difficulté actuelle du réseau')
-node_block_height = Gauge('kaspa_node_block_height', 'Hauteur du bloc actuel')
-node_peer_count = Gauge('kaspa_node_peer_count', 'Nombre de peers connectés')
-mining_uptime = Gauge('kaspa_mining_uptime_seconds', 'Temps de fonctionnement du minage')
+mining_hashrate = gauge('kaspa_mining_hashrate', 'Hashrate de minage en H/s')
+mining_blocks_found = counter('kaspa_mining_blocks_found_total', 'Nombre de blocs trouvés')
+mining_shares_submitted = counter('kaspa_mining_shares_submitted_total', 'Nombre de shares soumises')
+mining_difficulty = gauge('kaspa_mining_difficulty', 'Difficulté actuelle du réseau')
+node_block_height = gauge('kaspa_node_block_height', 'Hauteur du bloc actuel')
+node_peer_count = gauge('kaspa_node_peer_count', 'Nombre de peers connectés')
+mining_uptime = gauge('kaspa_mining_uptime_seconds', 'Temps de fonctionnement du minage')
+network_hashrate = gauge('kaspa_network_hashrate', 'Hashrate réseau estimé en H/s')
+network_blocks_per_second = gauge('kaspa_network_blocks_per_second', 'Blocs ajoutés au DAG par seconde')
+network_daa_score_rate = gauge('kaspa_network_daa_score_rate', 'Progression du score DAA par seconde')
+network_difficulty_trend = gauge('kaspa_network_difficulty_trend', 'Variation relative de la difficulté par heure')
+alert_firing = gauge('kaspa_mining_alert_firing', 'Alerte active (1) ou non (0)', ['alert'])
+loop_monitor = LoopMonitor(
+    registry=REGISTRY,
+    interval=LOOP_LAG_INTERVAL,
+    slow_callback_threshold=SLOW_CALLBACK_THRESHOLD
+)
 
 app = FastAPI(title="KaspaZof Mining Monitor", version="1.0.0")
 
+@app.exception_handler(RequestValidationError)
+async def validation_exception_handler(request: Request, exc: RequestValidationError):
+    """422 habituel; une entrée inf/NaN est renvoyée en texte (sinon JSON invalide et 500)"""
+    errors = [
+        {**error, "input": str(error["input"])}
+        if isinstance(error.get("input"), float) and not math.isfinite(error["input"]) else error
+        for error in exc.errors()
+    ]
+    return JSONResponse(status_code=422, content={"detail": jsonable_encoder(errors)})
+
 class MiningStats(BaseModel):
     hashrate: float
     blocks_found: int
@@ -46,6 +125,38 @@ class MiningStats(BaseModel):
     difficulty: float
     uptime: int
     last_block_time: Optional[datetime]
+    network_hashrate: float = 0.0
+    blocks_per_second: float = 0.0
+    difficulty_trend: float = 0.0
+
+class MinerReport(BaseModel):
+    miner_id: str = Field(..., min_length=1, max_length=100)
+    hashrate: float = Field(..., ge=0)
+    shares_accepted: Optional[int] = Field(None, ge=0)
+    shares_rejected: Optional[int] = Field(None, ge=0)
+    temperature: Optional[float] = None
+
+class HardwareProfile(BaseModel):
+    # inf/NaN traverseraient gt/ge et fausseraient toute la grille
+    model_config = ConfigDict(allow_inf_nan=False)
+    
+    name: str = Field("rig", min_length=1, max_length=100)
+    hashrate: float = Field(..., gt=0, description="Hashrate en H/s")
+    power: float = Field(0.0, ge=0, description="Consommation en W")
+    cost: float = Field(0.0, ge=0, description="Coût du matériel (devise de cotation)")
+
+class ProfitabilityRequest(BaseModel):
+    model_config = ConfigDict(allow_inf_nan=False)
+    
+    hardware: List[HardwareProfile] = Field(..., min_length=1)
+    electricity_costs: List[float] = Field([0.10], min_length=1, description="Prix du kWh")
+    prices: Optional[List[float]] = Field(None, min_length=1, description="Prix KAS (défaut: prix actuel)")
+    price_multipliers: List[float] = Field([1.0], min_length=1, description="Multiplicateurs du prix actuel")
+    difficulty_growth: List[float] = Field([0.0], min_length=1, description="Croissance mensuelle de la difficulté")
+    pool_fee: float = Field(0.0, ge=0, lt=1)
+    horizon_days: int = Field(365, ge=1, le=3650)
+    currency: str = Field("usd", min_length=3, max_length=5)
+    limit: int = Field(50, ge=1, le=10000)
 
 class KaspaRPCClient:
     """Client RPC pour communiquer avec le nœud Kaspa"""
@@ -89,6 +200,30 @@ class MiningMonitor:
     def __init__(self):
         self.rpc = KaspaRPCClient(KASPA_RPC_URL, KASPA_RPC_USER, KASPA_RPC_PASS)
         self.start_time = time.time()
+        self.estimator = NetworkEstimator(ESTIMATOR_WINDOW)
+        self.fleet = MinerFleet(FLEET_MAX_MINERS, FLEET_MAX_LABELS, FLEET_STALE_AFTER)
+        self.miner_urls = self.parse_miner_urls(FLEET_MINER_URLS)
+        self.scrape_session = requests.Session()
+        self.block_scanner = BlockScanner(self.rpc.call, MINING_ADDRESS)
+        self.block_writer = BlockFoundWriter(DATABASE_URL, MINING_ADDRESS)
+        self.recent_blocks = deque(maxlen=RECENT_BLOCKS_SIZE)
+        self.block_feed = BlockFeed(BLOCK_FEED_URL, self.on_feed_event) if BLOCK_FEED_URL else None
+        self.block_signal = asyncio.Event()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self.alerts = AlertEvaluator.from_file(ALERT_RULES_PATH)
+        self.alert_notifier = AlertNotifier(
+            DATABASE_URL,
+            ALERT_WEBHOOK_URL,
+            # Le backend refuse le relais sans jeton d'administration
+            ALERT_FEED_URL if ADMIN_TOKEN else "",
+            ADMIN_TOKEN,
+            timeout=ALERT_DELIVERY_TIMEOUT
+        )
+        self.alert_signal = asyncio.Event()
+        # Seul le collecteur tient l'état; les autres workers lisent son instantané
+        self.is_collector = True
+        self.shared_state = WorkerState(MULTIPROC_DIR)
+        self._state_dirty = False
         self.stats = {
             "hashrate": 0.0,
             "blocks_found": 0,
@@ -96,51 +231,284 @@ class MiningMonitor:
             "difficulty": 0.0,
             "last_block_time": None
         }
+        # Blocs trouvés depuis le démarrage, jamais décrémenté (comme le compteur
+        # Prometheus): une baisse passerait pour une remise à zéro aux règles d'alerte
+        self.blocks_found_total = 0
     
     async def collect_metrics(self):
         """Collecter les métriques de minage"""
         try:
+            # Appels RPC bloquants (requests): hors de la boucle d'événements
             # Informations du nœud
-            node_info = self.rpc.call("getInfo")
+            node_info = await asyncio.to_thread(self.rpc.call, "getInfo")
             if node_info:
                 node_block_height.set(node_info.get("blockCount", 0))
                 node_peer_count.set(node_info.get("peerCount", 0))
             
             # Informations de minage
-            mining_info = self.rpc.call("getMiningInfo")
+            difficulty = self.stats["difficulty"]
+            mining_info = await asyncio.to_thread(self.rpc.call, "getMiningInfo")
             if mining_info:
                 difficulty = mining_info.get("difficulty", 0)
                 mining_difficulty.set(difficulty)
                 self.stats["difficulty"] = difficulty
             
-            # Statistiques du pool (si disponible)
+            # Estimation réseau (score DAA, nombre de blocs, difficulté)
+            dag_info = await asyncio.to_thread(self.rpc.call, "getBlockDagInfo")
+            if dag_info:
+                self.update_network_estimates(dag_info)
+            
+            # Blocs trouvés (coinbase payant MINING_ADDRESS)
+            await asyncio.to_thread(self.account_blocks)
+            
+            # Flotte locale: scraping des mineurs puis agrégation
+            await self.scrape_miners()
+            self.fleet.prune()
+            self.fleet.export()
+            
+            # Statistiques du pool (si disponible, sinon hashrate de la flotte)
             try:
-                pool_stats = self.rpc.call("getPoolStats")
+                pool_stats = await asyncio.to_thread(self.rpc.call, "getPoolStats")
                 if pool_stats:
                     hashrate = pool_stats.get("hashrate", 0)
                     mining_hashrate.set(hashrate)
                     self.stats["hashrate"] = hashrate
-            except:
-                pass  # Pool stats pas toujours disponibles
+            except Exception as e:
+                logger.debug(f"Pool stats indisponibles: {e}")
+                if self.fleet.miners:
+                    hashrate = self.fleet.total_hashrate()
+                    mining_hashrate.set(hashrate)
+                    self.stats["hashrate"] = hashrate
             
             # Temps de fonctionnement
             uptime = time.time() - self.start_time
             mining_uptime.set(uptime)
             
+            # Règles d'alerte sur l'échantillon courant
+            sample = {
+                "kaspa_mining_hashrate": self.stats["hashrate"],
+                "kaspa_mining_blocks_found_total": self.blocks_found_total,
+                "kaspa_mining_shares_submitted_total": self.stats["shares_submitted"],
+                "kaspa_mining_difficulty": difficulty,
+                "kaspa_mining_uptime_seconds": uptime,
+                **self.network_sample()
+            }
+            if node_info:
+                sample["kaspa_node_block_height"] = node_info.get("blockCount", 0)
+                sample["kaspa_node_peer_count"] = node_info.get("peerCount", 0)
+            await self.evaluate_alerts(sample)
+            await self.publish_state()
+            
             logger.info(f"Métriques collectées - Difficulté: {difficulty}, Hauteur: {node_info.get('blockCount', 0)}")
             
         except Exception as e:
             logger.error(f"Erreur lors de la collecte des métriques: {e}")
     
+    def network_sample(self) -> Dict[str, float]:
+        if not self.estimator.samples:
+            return {}
+        estimates = self.estimator.snapshot()
+        return {
+            "kaspa_network_hashrate": estimates["network_hashrate"],
+            "kaspa_network_blocks_per_second": estimates["blocks_per_second"],
+            "kaspa_network_difficulty_trend": estimates["difficulty_trend"]
+        }
+    
+    async def evaluate_alerts(self, sample: Dict[str, float]):
+        """Évalue les règles; la diffusion (base, webhook, flux) est faite par alert_delivery_loop"""
+        events = self.alerts.evaluate(sample)
+        for event in events:
+            alert_firing.labels(alert=event["alert"]).set(1 if event["status"] == "firing" else 0)
+            logger.warning(f"🚨 Alerte {event['alert']} {event['status']}: {event['summary']}")
+        if events:
+            self.alert_notifier.add(events)
+            self.alert_signal.set()
+    
+    async def alert_delivery_loop(self):
+        """Diffuse les alertes hors du cycle de collecte: une destination lente ou injoignable ne le retarde pas"""
+        while True:
+            try:
+                await asyncio.wait_for(self.alert_signal.wait(), ALERT_RETRY_INTERVAL)
+            except asyncio.TimeoutError:
+                pass
+            self.alert_signal.clear()
+            if any(self.alert_notifier.pending.values()):
+                await asyncio.to_thread(self.alert_notifier.flush)
+    
+    def account_blocks(self):
+        """Détecte nos blocs depuis le dernier passage et les enregistre par lot"""
+        try:
+            found, orphaned = self.block_scanner.scan()
+        except Exception as e:
+            logger.warning(f"Parcours des blocs échoué: {e}")
+            found, orphaned = [], []
+        
+        if orphaned:
+            # Le compteur Prometheus reste monotone; les statistiques et la base sont corrigées
+            retracted = {block.paid_in_block for block in orphaned}
+            self.stats["blocks_found"] -= len(orphaned)
+            kept = [block for block in self.recent_blocks if block.paid_in_block not in retracted]
+            self.recent_blocks.clear()
+            self.recent_blocks.extend(kept)
+            self.block_writer.retract(orphaned)
+            logger.warning(f"{len(orphaned)} paiement(s) annulé(s): bloc payeur sorti de la chaîne")
+        
+        if found:
+            mining_blocks_found.inc(len(found))
+            self.blocks_found_total += len(found)
+            self.stats["blocks_found"] += len(found)
+            self.stats["last_block_time"] = max(block.timestamp for block in found)
+            self.recent_blocks.extend(found)
+            self.block_writer.add(found)
+            logger.info(f"⛏️ {len(found)} bloc(s) trouvé(s)")
+        
+        self.block_writer.flush()
+    
+    def update_network_estimates(self, dag_info: Dict):
+        """Alimente l'estimateur et exporte les estimations réseau"""
+        try:
+            self.estimator.add_sample(
+                time.time(),
+                int(dag_info.get("virtualDaaScore", 0)),
+                int(dag_info.get("blockCount", 0)),
+                float(dag_info.get("difficulty", 0))
+            )
+        except (TypeError, ValueError) as e:
+            logger.warning(f"Échantillon DAG invalide: {e}")
+            return
+        
+        estimates = self.estimator.snapshot()
+        network_hashrate.set(estimates["network_hashrate"])
+        network_blocks_per_second.set(estimates["blocks_per_second"])
+        network_daa_score_rate.set(estimates["daa_score_rate"])
+        network_difficulty_trend.set(estimates["difficulty_trend"])
+    
+    @staticmethod
+    def parse_miner_urls(value: str) -> Dict[str, str]:
+        urls = {}
+        for item in value.split(","):
+            miner_id, sep, url = item.strip().partition("=")
+            if sep and miner_id and url:
+                urls[miner_id.strip()] = url.strip()
+        return urls
+    
+    def record_miner_report(self, report: MinerReport, source: str = "push") -> bool:
+        """Intègre un rapport de mineur; False si la flotte a atteint sa taille maximale"""
+        shares = self.fleet.report(
+            report.miner_id,
+            report.hashrate,
+            report.shares_accepted,
+            report.shares_rejected,
+            report.temperature,
+            source=source
+        )
+        if shares is None:
+            return False
+        submitted = sum(shares)
+        if submitted:
+            mining_shares_submitted.inc(submitted)
+            self.stats["shares_submitted"] += submitted
+        self._state_dirty = True
+        return True
+    
+    def state(self) -> Dict:
+        """Instantané servi par les endpoints (lu depuis le collecteur hors de celui-ci)"""
+        if not self.is_collector:
+            state = self.shared_state.read()
+            if state is None:
+                raise HTTPException(status_code=503, detail="État du collecteur indisponible")
+            return state
+        return {
+            "start_time": self.start_time,
+            "stats": dict(self.stats),
+            "estimates": self.estimator.snapshot(),
+            "alerts": self.alerts.snapshot(),
+            "pending_notifications": {name: len(queue) for name, queue in self.alert_notifier.pending.items()},
+            "fleet_total": len(self.fleet.miners),
+            "fleet_hashrate": self.fleet.total_hashrate(),
+            "miners": self.fleet.snapshot(0, self.fleet.max_miners),
+            "blocks": [block.to_dict() for block in reversed(self.recent_blocks)],
+            "pending_writes": len(self.block_writer.pending)
+        }
+    
+    async def publish_state(self):
+        """Publie l'instantané pour les autres workers (multiprocess uniquement)"""
+        if not self.shared_state.enabled:
+            return
+        self._state_dirty = False
+        # Construit dans la boucle, sérialisé dans un thread
+        state = self.state()
+        try:
+            await asyncio.to_thread(self.shared_state.publish, state)
+        except OSError as e:
+            logger.warning(f"Publication de l'état échouée: {e}")
+    
+    async def report_spool_loop(self):
+        """Intègre les rapports de mineurs reçus par les autres workers"""
+        while True:
+            await asyncio.sleep(REPORT_SPOOL_INTERVAL)
+            try:
+                records = await asyncio.to_thread(self.shared_state.drain)
+            except OSError as e:
+                logger.warning(f"Lecture des rapports en attente échouée: {e}")
+                continue
+            for record in records:
+                try:
+                    self.record_miner_report(MinerReport(**record["report"]), source=record.get("source", "push"))
+                except (KeyError, TypeError, ValueError) as e:
+                    logger.warning(f"Rapport de mineur invalide ignoré: {e}")
+            if records:
+                self.fleet.export()
+            if self._state_dirty:
+                await self.publish_state()
+    
+    def fetch_miner(self, miner_id: str, url: str) -> Optional[MinerReport]:
+        """Interroge l'API d'un mineur (JSON: hashrate, shares_accepted, shares_rejected, temperature)"""
+        try:
+            response = self.scrape_session.get(url, timeout=5)
+            response.raise_for_status()
+            return MinerReport(miner_id=miner_id, **response.json())
+        except Exception as e:
+            logger.warning(f"Mineur {miner_id} injoignable: {e}")
+            return None
+    
+    async def scrape_miners(self):
+        """Interroge tous les mineurs configurés en parallèle"""
+        if not self.miner_urls:
+            return
+        reports = await asyncio.gather(*(
+            asyncio.to_thread(self.fetch_miner, miner_id, url)
+            for miner_id, url in self.miner_urls.items()
+        ))
+        for report in reports:
+            if report is not None:
+                self.record_miner_report(report, source="scrape")
+    
+    def on_feed_event(self, event: str, payload: Dict):
+        """Appelé depuis le thread du flux: réveille la boucle de collecte"""
+        if self._loop is not None:
+            self._loop.call_soon_threadsafe(self.block_signal.set)
+    
     async def monitor_loop(self):
-        """Boucle de monitoring principal"""
+        """Boucle de monitoring principal: à chaque nouveau bloc, sinon toutes les COLLECT_INTERVAL secondes"""
+        self._loop = asyncio.get_running_loop()
+        if self.block_feed:
+            self.block_feed.start()
         while True:
+            started = time.monotonic()
+            self.block_signal.clear()
             try:
                 await self.collect_metrics()
-                await asyncio.sleep(30)  # Collecter toutes les 30 secondes
+                interval = COLLECT_INTERVAL
             except Exception as e:
                 logger.error(f"Erreur dans la boucle de monitoring: {e}")
-                await asyncio.sleep(60)
+                interval = 60
+            # Au plus une collecte par COLLECT_MIN_INTERVAL, même à 10 blocs/s
+            await asyncio.sleep(max(COLLECT_MIN_INTERVAL - (time.monotonic() - started), 0))
+            try:
+                await asyncio.wait_for(self.block_signal.wait(), max(interval - (time.monotonic() - started), 0))
+            except asyncio.TimeoutError:
+                pass
 
 # Instance globale du moniteur
 monitor = MiningMonitor()
@@ -148,15 +516,38 @@ monitor = MiningMonitor()
 @app.on_event("startup")
 async def startup_event():
     """Démarrer le monitoring au lancement de l'app"""
+    # Chaque worker surveille sa propre boucle
+    if LOOP_MONITOR_ENABLED:
+        loop_monitor.start()
+    monitor.is_collector = acquire_collector_role()
+    if not monitor.is_collector:
+        logger.info("Collecte assurée par un autre worker")
+        return
     asyncio.create_task(monitor.monitor_loop())
+    asyncio.create_task(monitor.alert_delivery_loop())
+    if monitor.shared_state.enabled:
+        asyncio.create_task(monitor.report_spool_loop())
     logger.info("🚀 Service de monitoring du minage démarré")
 
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Écrire les blocs trouvés encore en attente"""
+    if not monitor.is_collector:
+        return
+    if monitor.block_feed:
+        monitor.block_feed.stop()
+    await asyncio.to_thread(monitor.block_writer.flush)
+    monitor.block_writer.close()
+    await asyncio.to_thread(monitor.alert_notifier.flush)
+    monitor.alert_notifier.close()
+    await loop_monitor.stop()
+
 @app.get("/health")
 async def health_check():
     """Vérification de santé du service"""
     try:
         # Tester la connexion RPC
-        node_info = monitor.rpc.call("getInfo")
+        node_info = await asyncio.to_thread(monitor.rpc.call, "getInfo")
         return {
             "status": "healthy",
             "kaspa_node": "connected" if node_info else "disconnected",
@@ -168,22 +559,266 @@ async def health_check():
 @app.get("/stats", response_model=MiningStats)
 async def get_mining_stats():
     """Obtenir les statistiques de minage actuelles"""
-    uptime = int(time.time() - monitor.start_time)
+    state = monitor.state()
+    stats = state["stats"]
+    estimates = state["estimates"]
     
     return MiningStats(
-        hashrate=monitor.stats["hashrate"],
-        blocks_found=monitor.stats["blocks_found"],
-        shares_submitted=monitor.stats["shares_submitted"],
-        difficulty=monitor.stats["difficulty"],
-        uptime=uptime,
-        last_block_time=monitor.stats["last_block_time"]
+        hashrate=stats["hashrate"],
+        blocks_found=stats["blocks_found"],
+        shares_submitted=stats["shares_submitted"],
+        difficulty=stats["difficulty"],
+        uptime=int(time.time() - state["start_time"]),
+        last_block_time=stats["last_block_time"],
+        network_hashrate=estimates["network_hashrate"],
+        blocks_per_second=estimates["blocks_per_second"],
+        difficulty_trend=estimates["difficulty_trend"]
+    )
+
+@app.get("/alerts")
+async def get_alerts():
+    """État des règles d'alerte évaluées localement"""
+    state = monitor.state()
+    return {
+        "rules_path": ALERT_RULES_PATH,
+        "rules": state["alerts"],
+        "pending_notifications": state["pending_notifications"]
+    }
+
+@app.post("/miners/report")
+async def report_miner(report: MinerReport):
+    """Recevoir le rapport d'un mineur (push)"""
+    if not monitor.is_collector:
+        # Transmis au collecteur; la limite est vérifiée sur son dernier instantané
+        state = monitor.state()
+        known = {miner["miner_id"] for miner in state["miners"]}
+        if state["fleet_total"] >= FLEET_MAX_MINERS and normalize_miner_id(report.miner_id) not in known:
+            raise HTTPException(status_code=429, detail="Nombre maximal de mineurs atteint")
+        await asyncio.to_thread(monitor.shared_state.spool, {"report": report.model_dump(), "source": "push"})
+        return {"status": "ok"}
+    if not monitor.record_miner_report(report):
+        raise HTTPException(status_code=429, detail="Nombre maximal de mineurs atteint")
+    return {"status": "ok"}
+
+@app.get("/miners")
+async def get_miners(offset: int = 0, limit: int = 100):
+    """Lister les mineurs actifs de la flotte"""
+    state = monitor.state()
+    return {
+        "total": state["fleet_total"],
+        "total_hashrate": state["fleet_hashrate"],
+        "miners": state["miners"][offset:offset + min(limit, 1000)]
+    }
+
+@app.get("/blocks/found")
+async def get_found_blocks(limit: int = 20):
+    """Derniers blocs trouvés, du plus récent au plus ancien"""
+    state = monitor.state()
+    return {
+        "total": state["stats"]["blocks_found"],
+        "pending_writes": state["pending_writes"],
+        "blocks": state["blocks"][:limit]
+    }
+
+@app.get("/export/{table}")
+def export_table(
+    table: str,
+    format: str = Query("ndjson", pattern="^(ndjson|csv|parquet)$"),
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None
+):
+    """Exporter une table de minage en streaming (NDJSON, CSV ou Parquet)"""
+    if table not in EXPORT_TABLES:
+        raise HTTPException(status_code=404, detail=f"Table inconnue: {table}")
+    if format == "parquet" and not PARQUET_AVAILABLE:
+        raise HTTPException(status_code=400, detail="Export Parquet indisponible (pyarrow absent)")
+    if not DATABASE_URL:
+        raise HTTPException(status_code=503, detail="Base de données non configurée")
+    
+    try:
+        conn = psycopg2.connect(DATABASE_URL)
+    except psycopg2.Error as e:
+        raise HTTPException(status_code=503, detail=f"Base de données indisponible: {e}")
+    
+    return StreamingResponse(
+        stream_table(conn, table, format, start, end),
+        media_type=EXPORT_MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="{table}.{format}"'}
+    )
+
+_price_cache: Dict[str, tuple] = {}
+
+def fetch_kas_price(currency: str) -> float:
+    """Prix KAS depuis le backend (mis en cache PRICE_CACHE_TTL secondes)"""
+    cached = _price_cache.get(currency)
+    if cached and time.time() - cached[1] < PRICE_CACHE_TTL:
+        return cached[0]
+    response = requests.get(
+        f"{BACKEND_URL}/api/v1/prices/current",
+        params={"vs": currency},
+        timeout=5
     )
+    response.raise_for_status()
+    price = float(response.json()["data"]["KAS"][currency]["price"])
+    _price_cache[currency] = (price, time.time())
+    return price
+
+def network_inputs() -> Dict:
+    """Hashrate réseau et émission courants (estimateur, sinon difficulté du nœud)"""
+    state = monitor.state()
+    estimates = state["estimates"]
+    daa_rate = estimates["daa_score_rate"] or NETWORK_BPS
+    difficulty = state["stats"]["difficulty"] or estimates["mean_difficulty"]
+    hashrate = estimates["network_hashrate"] or difficulty * HASHES_PER_DIFFICULTY * daa_rate
+    emission = BLOCK_REWARD_KAS * daa_rate if BLOCK_REWARD_KAS else emission_per_second()
+    return {
+        "difficulty": difficulty,
+        "network_hashrate": hashrate,
+        "blocks_per_second": daa_rate,
+        "block_reward": emission / daa_rate,
+        "emission_per_second": emission
+    }
+
+async def run_profitability(request: ProfitabilityRequest) -> Dict:
+    if any(cost < 0 for cost in request.electricity_costs):
+        raise HTTPException(status_code=400, detail="Prix du kWh négatif")
+    if any(growth <= -1 for growth in request.difficulty_growth):
+        raise HTTPException(status_code=400, detail="Croissance de difficulté invalide (> -1 requis)")
+    
+    network = network_inputs()
+    if network["network_hashrate"] <= 0:
+        raise HTTPException(status_code=503, detail="Données réseau indisponibles")
+    
+    currency = request.currency.lower()
+    if request.prices:
+        prices = request.prices
+    else:
+        try:
+            current = await asyncio.to_thread(fetch_kas_price, currency)
+        except (requests.RequestException, KeyError, ValueError) as e:
+            raise HTTPException(status_code=503, detail=f"Prix indisponible: {e}")
+        prices = [current * multiplier for multiplier in request.price_multipliers]
+    if any(price < 0 for price in prices):
+        raise HTTPException(status_code=400, detail="Prix négatif")
+    
+    scenarios = len(request.hardware) * len(request.electricity_costs) * len(prices) * len(request.difficulty_growth)
+    if scenarios > PROFITABILITY_MAX_SCENARIOS:
+        raise HTTPException(status_code=400, detail=f"Trop de scénarios ({scenarios} > {PROFITABILITY_MAX_SCENARIOS})")
+    
+    def compute():
+        start = time.perf_counter()
+        grid = scenario_grid(
+            [hw.hashrate for hw in request.hardware],
+            [hw.power for hw in request.hardware],
+            [hw.cost for hw in request.hardware],
+            request.electricity_costs,
+            prices,
+            request.difficulty_growth,
+            network["network_hashrate"],
+            network["emission_per_second"],
+            request.pool_fee,
+            request.horizon_days
+        )
+        results = rank_scenarios(
+            grid,
+            [hw.name for hw in request.hardware],
+            request.electricity_costs,
+            prices,
+            request.difficulty_growth,
+            request.limit
+        )
+        profitable = int((grid["horizon_profit"] > 0).sum())
+        return results, profitable, (time.perf_counter() - start) * 1000
+    
+    # Calcul hors de la boucle d'événements (grandes grilles)
+    results, profitable, compute_ms = await asyncio.to_thread(compute)
+    return {
+        "network": network,
+        "currency": currency,
+        "horizon_days": request.horizon_days,
+        "scenarios": scenarios,
+        "profitable_scenarios": profitable,
+        "compute_ms": round(compute_ms, 3),
+        "results": results
+    }
+
+@app.get("/profitability")
+async def get_profitability(
+    hashrate: float = Query(..., gt=0, description="Hashrate en H/s"),
+    power: float = Query(0.0, ge=0, description="Consommation en W"),
+    electricity_cost: float = Query(0.10, ge=0, description="Prix du kWh"),
+    price: Optional[float] = Query(None, ge=0, description="Prix KAS (défaut: prix actuel)"),
+    pool_fee: float = Query(0.0, ge=0, lt=1),
+    horizon_days: int = Query(365, ge=1, le=3650),
+    currency: str = Query("usd", min_length=3, max_length=5)
+):
+    """Rentabilité attendue d'un matériel aux conditions actuelles du réseau"""
+    # FastAPI accepte inf/nan en paramètre de requête: le modèle les refuse (422)
+    try:
+        request = ProfitabilityRequest(
+            hardware=[HardwareProfile(hashrate=hashrate, power=power)],
+            electricity_costs=[electricity_cost],
+            prices=[price] if price is not None else None,
+            pool_fee=pool_fee,
+            horizon_days=horizon_days,
+            currency=currency
+        )
+    except ValidationError as e:
+        raise RequestValidationError(e.errors())
+    result = await run_profitability(request)
+    result["result"] = result.pop("results")[0]
+    return result
+
+@app.post("/profitability")
+async def post_profitability(request: ProfitabilityRequest):
+    """Grille de scénarios matériel x électricité x prix x croissance de la difficulté"""
+    return await run_profitability(request)
+
+def require_admin_token(authorization: Optional[str] = Header(None)):
+    """Jeton d'administration (Authorization: Bearer <ADMIN_TOKEN>)"""
+    if not ADMIN_TOKEN:
+        raise HTTPException(status_code=404, detail="Not Found")
+    scheme, _, token = (authorization or "").partition(" ")
+    if scheme.lower() != "bearer" or not hmac.compare_digest(token.encode(), ADMIN_TOKEN.encode()):
+        raise HTTPException(status_code=401, detail="Jeton d'administration invalide")
+
+@app.get("/admin/profile", dependencies=[Depends(require_admin_token)])
+async def profile_cpu(
+    seconds: float = Query(10.0, gt=0, le=PROFILE_MAX_SECONDS),
+    format: str = Query("collapsed", pattern="^(collapsed|speedscope)$"),
+    interval: float = Query(0.01, ge=0.001, le=1.0),
+    idle: bool = False
+):
+    """Profil statistique de tous les threads du worker qui traite la requête"""
+    profiler = SamplingProfiler(interval=interval, include_idle=idle)
+    try:
+        profile = await asyncio.to_thread(profiler.run, seconds, threading.get_ident())
+    except ProfilerBusyError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    
+    if format == "speedscope":
+        return JSONResponse(
+            profile.speedscope(f"mining-monitor {seconds}s"),
+            headers={"Content-Disposition": 'attachment; filename="mining-monitor.speedscope.json"'}
+        )
+    return PlainTextResponse(profile.collapsed())
+
+@app.get("/admin/profile/memory", dependencies=[Depends(require_admin_token)])
+async def profile_memory(
+    seconds: float = Query(10.0, gt=0, le=PROFILE_MAX_SECONDS),
+    top: int = Query(50, ge=1, le=500)
+):
+    """Croissance mémoire (différence d'instantanés tracemalloc) pendant la fenêtre"""
+    try:
+        return await asyncio.to_thread(memory_diff, seconds, top)
+    except ProfilerBusyError as e:
+        raise HTTPException(status_code=409, detail=str(e))
 
 @app.get("/node/info")
 async def get_node_info():
     """Obtenir les informations du nœud Kaspa"""
     try:
-        return monitor.rpc.call("getInfo")
+        return await asyncio.to_thread(monitor.rpc.call, "getInfo")
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Erreur RPC: {e}")
 
@@ -191,14 +826,18 @@ async def get_node_info():
 async def get_mining_info():
     """Obtenir les informations de minage"""
     try:
-        return monitor.rpc.call("getMiningInfo")
+        return await asyncio.to_thread(monitor.rpc.call, "getMiningInfo")
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Erreur RPC: {e}")
 
 @app.get("/metrics")
-async def get_prometheus_metrics():
-    """Endpoint pour les métriques Prometheus"""
-    return generate_latest().decode('utf-8')
+async def get_prometheus_metrics(request: Request):
+    """Endpoint pour les métriques Prometheus (texte 0.0.4 ou OpenMetrics)"""
+    # Hors du collecteur la flotte est vide: l'exporter écraserait ses jauges
+    if monitor.is_collector:
+        monitor.fleet.export()
+    content, content_type = render(request.headers.get("accept"))
+    return Response(content=content, headers={"Content-Type": content_type})
 
 @app.get("/")
 async def root():
@@ -211,6 +850,11 @@ async def root():
             "stats": "/stats",
             "node_info": "/node/info",
             "mining_info": "/mining/info",
+            "miners": "/miners",
+            "blocks_found": "/blocks/found",
+            "export": "/export/{table}",
+            "profitability": "/profitability",
+            "alerts": "/alerts",
             "metrics": "/metrics"
         }
     }
@@ -221,5 +865,6 @@ if __name__ == "__main__":
         host="0.0.0.0",
         port=8080,
         reload=False,
+        workers=int(os.getenv("UVICORN_WORKERS", "1")),
         log_level="info"
     )
\ No newline at end of file
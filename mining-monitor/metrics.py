@@ -0,0 +1,100 @@
+"""
+Registre Prometheus du moniteur
+Registre dédié (pas de registre global), mode multiprocess si
+PROMETHEUS_MULTIPROC_DIR est défini, et sortie texte 0.0.4 ou OpenMetrics
+selon l'en-tête Accept.
+En multiprocess, les fichiers mmap ne perdent jamais une série: une série
+retirée y est marquée NaN et n'est plus exposée. Le répertoire doit être
+vidé au démarrage du conteneur (valeurs des processus précédents)
+"""
+
+import fcntl
+import math
+import os
+from typing import Optional, Tuple
+
+from prometheus_client import (
+    CollectorRegistry, Counter, Gauge, GCCollector, PlatformCollector, ProcessCollector,
+    disable_created_metrics
+)
+from prometheus_client.exposition import choose_encoder
+from prometheus_client.multiprocess import MultiProcessCollector
+
+MULTIPROC_DIR = os.getenv("PROMETHEUS_MULTIPROC_DIR", "")
+
+# Pas de séries *_created: une série de moins par compteur et par étiquette
+disable_created_metrics()
+
+# Registre auquel les métriques du moniteur sont rattachées
+REGISTRY = CollectorRegistry(auto_describe=True)
+
+class _LiveSeriesCollector:
+    """Agrégation multiprocess sans les séries retirées (valeur NaN)"""
+
+    def __init__(self, collector: MultiProcessCollector):
+        self.collector = collector
+
+    def collect(self):
+        for metric in self.collector.collect():
+            metric.samples = [sample for sample in metric.samples if not math.isnan(sample.value)]
+            if metric.samples:
+                yield metric
+
+if MULTIPROC_DIR:
+    # Chaque worker écrit ses valeurs dans des fichiers mmap; l'exposition les agrège
+    EXPOSITION_REGISTRY = CollectorRegistry()
+    EXPOSITION_REGISTRY.register(_LiveSeriesCollector(MultiProcessCollector(None)))
+else:
+    EXPOSITION_REGISTRY = REGISTRY
+    ProcessCollector(registry=REGISTRY)
+    PlatformCollector(registry=REGISTRY)
+    GCCollector(registry=REGISTRY)
+
+def gauge(name: str, documentation: str, labelnames=()) -> Gauge:
+    # En multiprocess, seule la dernière valeur écrite compte (un seul collecteur actif)
+    return Gauge(name, documentation, labelnames, registry=REGISTRY, multiprocess_mode="mostrecent")
+
+def counter(name: str, documentation: str, labelnames=()) -> Counter:
+    return Counter(name, documentation, labelnames, registry=REGISTRY)
+
+def remove_series(metric, *labelvalues):
+    """Retire une série étiquetée (sans erreur si elle n'existe pas)"""
+    try:
+        metric.remove(*labelvalues)
+    except KeyError:
+        return
+    if MULTIPROC_DIR:
+        # remove() oublie l'enfant mais pas sa valeur mmap: NaN, filtré à l'exposition
+        metric.labels(*labelvalues)._value.set(math.nan)
+        metric.remove(*labelvalues)
+
+def series(metric, *labelvalues):
+    """Enfant étiqueté; une série retirée (NaN) repart de zéro au lieu de rester NaN"""
+    child = metric.labels(*labelvalues)
+    if MULTIPROC_DIR and math.isnan(child._value.get()):
+        child._value.set(0.0)
+    return child
+
+def render(accept: Optional[str]) -> Tuple[bytes, str]:
+    """Encode le registre selon l'en-tête Accept (texte 0.0.4 par défaut)"""
+    encoder, content_type = choose_encoder(accept or "")
+    return encoder(EXPOSITION_REGISTRY), content_type
+
+_collector_lock = None
+
+def acquire_collector_role() -> bool:
+    """
+    Un seul worker uvicorn exécute la boucle de collecte en multiprocess,
+    sinon chaque worker compterait les mêmes blocs et shares
+    """
+    global _collector_lock
+    if not MULTIPROC_DIR:
+        return True
+    lock = open(os.path.join(MULTIPROC_DIR, "collector.lock"), "w")
+    try:
+        fcntl.flock(lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        lock.close()
+        return False
+    _collector_lock = lock
+    return True
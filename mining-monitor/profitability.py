@@ -0,0 +1,105 @@
+"""
+Rentabilité du minage Kaspa
+Grilles de scénarios (matériel x électricité x prix x croissance de la
+difficulté) calculées en une passe NumPy vectorisée: les cumuls sur
+l'horizon utilisent la somme géométrique fermée, sans boucle sur les jours
+"""
+
+import time
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+# Phase déflationnaire (chromatique) de Kaspa: 440 KAS/s au départ,
+# émission divisée par deux chaque année en 12 paliers mensuels
+DEFLATIONARY_PHASE_START = 1651881600  # 2022-05-07 UTC
+INITIAL_EMISSION_PER_SECOND = 440.0
+SECONDS_PER_DAY = 86400
+DAYS_PER_MONTH = 365.25 / 12
+
+def emission_per_second(now: Optional[float] = None) -> float:
+    """Émission du réseau (KAS/s) selon le calendrier de subvention"""
+    elapsed = (now or time.time()) - DEFLATIONARY_PHASE_START
+    months = max(int(elapsed // (DAYS_PER_MONTH * SECONDS_PER_DAY)), 0)
+    return INITIAL_EMISSION_PER_SECOND * 0.5 ** (months / 12)
+
+def scenario_grid(
+    hashrates: Sequence[float],
+    powers: Sequence[float],
+    capex: Sequence[float],
+    electricity_costs: Sequence[float],
+    prices: Sequence[float],
+    difficulty_growth: Sequence[float],
+    network_hashrate: float,
+    emission: float,
+    pool_fee: float = 0.0,
+    horizon_days: int = 365
+) -> Dict[str, np.ndarray]:
+    """
+    Résultats de forme (matériel, électricité, prix, croissance).
+    Le revenu du jour d décroît d'un facteur r^d: baisse de l'émission
+    et hausse mensuelle de la difficulté (part du réseau réduite d'autant)
+    """
+    hr = np.asarray(hashrates, dtype=np.float64)[:, None, None, None]
+    power = np.asarray(powers, dtype=np.float64)[:, None, None, None]
+    hardware_cost = np.asarray(capex, dtype=np.float64)[:, None, None, None]
+    electricity = np.asarray(electricity_costs, dtype=np.float64)[None, :, None, None]
+    price = np.asarray(prices, dtype=np.float64)[None, None, :, None]
+    growth = np.asarray(difficulty_growth, dtype=np.float64)[None, None, None, :]
+    shape = (hr.shape[0], electricity.shape[1], price.shape[2], growth.shape[3])
+
+    daily_coins = hr / network_hashrate * emission * SECONDS_PER_DAY * (1.0 - pool_fee)
+    daily_revenue = daily_coins * price
+    daily_power_cost = power / 1000.0 * 24.0 * electricity
+
+    ratio = 0.5 ** (1.0 / 365.25) / (1.0 + growth) ** (1.0 / DAYS_PER_MONTH)
+    n = float(horizon_days)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        series = np.where(np.isclose(ratio, 1.0), n, (1.0 - ratio ** n) / (1.0 - ratio))
+        horizon_coins = daily_coins * series
+        horizon_profit = daily_revenue * series - daily_power_cost * n - hardware_cost
+        # Dernier jour rentable: revenu_0 * r^d >= coût quotidien
+        last_day = np.floor(np.log(daily_power_cost / daily_revenue) / np.log(ratio)) + 1
+    profitable_days = np.where(
+        daily_revenue <= daily_power_cost,
+        0.0,
+        np.where((ratio >= 1.0) | (daily_power_cost <= 0), n, np.minimum(last_day, n))
+    )
+
+    return {
+        "daily_coins": np.broadcast_to(daily_coins, shape),
+        "daily_revenue": np.broadcast_to(daily_revenue, shape),
+        "daily_power_cost": np.broadcast_to(daily_power_cost, shape),
+        "daily_profit": np.broadcast_to(daily_revenue - daily_power_cost, shape),
+        "horizon_coins": np.broadcast_to(horizon_coins, shape),
+        "horizon_profit": np.broadcast_to(horizon_profit, shape),
+        "profitable_days": np.broadcast_to(profitable_days, shape)
+    }
+
+def rank_scenarios(
+    grid: Dict[str, np.ndarray],
+    hardware_names: List[str],
+    electricity_costs: Sequence[float],
+    prices: Sequence[float],
+    difficulty_growth: Sequence[float],
+    limit: int
+) -> List[Dict]:
+    """Meilleurs scénarios par profit sur l'horizon (tri partiel sur le tableau aplati)"""
+    profit = grid["horizon_profit"].ravel()
+    limit = min(limit, profit.size)
+    top = np.argpartition(-profit, limit - 1)[:limit] if limit < profit.size else np.arange(profit.size)
+    top = top[np.argsort(-profit[top], kind="stable")]
+    indexes = np.unravel_index(top, grid["horizon_profit"].shape)
+    columns = {name: values.ravel()[top] for name, values in grid.items()}
+
+    results = []
+    for row, (h, e, p, g) in enumerate(zip(*indexes)):
+        result = {
+            "hardware": hardware_names[h],
+            "electricity_cost": float(electricity_costs[e]),
+            "price": float(prices[p]),
+            "difficulty_growth": float(difficulty_growth[g])
+        }
+        result.update({name: round(float(values[row]), 6) for name, values in columns.items()})
+        results.append(result)
+    return results
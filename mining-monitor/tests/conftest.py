@@ -0,0 +1,10 @@
+import os
+import sys
+
+# Modules du moniteur et racine du dépôt (paquet shared) importables depuis les tests
+MONITOR_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, MONITOR_DIR)
+sys.path.insert(0, os.path.dirname(MONITOR_DIR))
+
+# Registre en mémoire, sans fichiers mmap
+os.environ.pop("PROMETHEUS_MULTIPROC_DIR", None)
@@ -0,0 +1,31 @@
+import requests
+
+from alerts import AlertNotifier
+
+def _event(n):
+    return {"timestamp": n, "status": "firing", "summary": f"alerte {n}"}
+
+def test_flush_keeps_events_added_while_sending():
+    notifier = AlertNotifier("", "http://hook", "", "", max_pending=3)
+    queue = notifier.pending["webhook"]
+    notifier.add([_event(1), _event(2), _event(3)])
+    sent = []
+
+    def send(events):
+        sent.extend(events)
+        # Arrivées pendant l'envoi: la file pleine évince 1 et 2
+        notifier.add([_event(4), _event(5)])
+
+    notifier._flush({"webhook": send})
+    assert [event["timestamp"] for event in sent] == [1, 2, 3]
+    assert [event["timestamp"] for event in queue] == [4, 5]
+
+def test_flush_failure_keeps_events():
+    notifier = AlertNotifier("", "http://hook", "", "")
+    notifier.add([_event(1)])
+
+    def fail(events):
+        raise requests.ConnectionError("down")
+
+    notifier._flush({"webhook": fail})
+    assert len(notifier.pending["webhook"]) == 1
@@ -0,0 +1,37 @@
+from fleet import MinerFleet
+
+def test_first_report_sets_baseline():
+    fleet = MinerFleet()
+    # Totaux de toute la vie du mineur: rien de nouveau à compter
+    assert fleet.report("rig1", 1e9, shares_accepted=250000, shares_rejected=10, timestamp=1000) == (0, 0)
+    assert fleet.report("rig1", 1e9, shares_accepted=250040, shares_rejected=12, timestamp=1010) == (40, 2)
+
+def test_missing_totals_do_not_count():
+    fleet = MinerFleet()
+    assert fleet.report("rig1", 1e9, timestamp=1000) == (0, 0)
+    # Premier total fourni après des rapports sans compteurs: c'est la référence
+    assert fleet.report("rig1", 1e9, shares_accepted=500, timestamp=1010) == (0, 0)
+    assert fleet.report("rig1", 1e9, shares_accepted=510, timestamp=1020) == (10, 0)
+
+def test_miner_restart_counts_new_totals():
+    fleet = MinerFleet()
+    fleet.report("rig1", 1e9, shares_accepted=1000, shares_rejected=5, timestamp=1000)
+    # Compteurs remis à zéro par le redémarrage du mineur
+    assert fleet.report("rig1", 1e9, shares_accepted=30, shares_rejected=1, timestamp=1010) == (30, 1)
+    assert fleet.report("rig1", 1e9, shares_accepted=35, shares_rejected=1, timestamp=1020) == (5, 0)
+
+def test_monitor_restart_sets_new_baseline():
+    before = MinerFleet()
+    before.report("rig1", 1e9, shares_accepted=1000, timestamp=1000)
+    # Nouveau processus: la flotte repart vide
+    after = MinerFleet()
+    assert after.report("rig1", 1e9, shares_accepted=1200, timestamp=2000) == (0, 0)
+    assert after.report("rig1", 1e9, shares_accepted=1210, timestamp=2010) == (10, 0)
+
+def test_pruned_miner_reappearing_sets_new_baseline():
+    fleet = MinerFleet(stale_after=60)
+    fleet.report("rig1", 1e9, shares_accepted=1000, timestamp=1000)
+    assert fleet.prune(now=2000) == ["rig1"]
+    assert fleet.report("rig1", 1e9, shares_accepted=5000, timestamp=2000) == (0, 0)
+    assert fleet.report("rig1", 1e9, shares_accepted=5003, timestamp=2010) == (3, 0)
+    assert fleet.snapshot()[0]["shares_accepted"] == 5003
@@ -0,0 +1,63 @@
+"""
+État du moniteur partagé entre workers uvicorn
+En multiprocess, un seul worker collecte (metrics.acquire_collector_role):
+il publie un instantané de son état dans PROMETHEUS_MULTIPROC_DIR, que les
+autres workers servent tel quel; les rapports de mineurs reçus par ces
+workers sont déposés dans une file sur disque que le collecteur intègre
+"""
+
+import fcntl
+import json
+import logging
+import os
+from typing import Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+class WorkerState:
+    def __init__(self, directory: str):
+        self.directory = directory
+        self.state_path = os.path.join(directory, "monitor_state.json")
+        self.spool_path = os.path.join(directory, "miner_reports.jsonl")
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.directory)
+
+    def publish(self, state: Dict):
+        """Écriture atomique: un lecteur voit l'ancien ou le nouvel état, jamais un mélange"""
+        temporary = f"{self.state_path}.{os.getpid()}"
+        with open(temporary, "w") as f:
+            json.dump(state, f, default=str)
+        os.replace(temporary, self.state_path)
+
+    def read(self) -> Optional[Dict]:
+        try:
+            with open(self.state_path) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def spool(self, record: Dict):
+        with open(self.spool_path, "a") as f:
+            fcntl.flock(f, fcntl.LOCK_EX)
+            f.write(json.dumps(record) + "\n")
+
+    def drain(self) -> List[Dict]:
+        """Vide la file des rapports déposés par les autres workers"""
+        try:
+            f = open(self.spool_path, "r+")
+        except FileNotFoundError:
+            return []
+        with f:
+            fcntl.flock(f, fcntl.LOCK_EX)
+            lines = f.read().splitlines()
+            f.seek(0)
+            f.truncate()
+        records = []
+        for line in lines:
+            try:
+                records.append(json.loads(line))
+            except ValueError:
+                logger.warning(f"Rapport de mineur illisible ignoré: {line[:100]}")
+        return records
@@ -0,0 +1 @@
+# Modules communs au backend et au mining-monitor
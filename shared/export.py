@@ -0,0 +1,129 @@
+"""
+Encodeurs d'export en streaming (NDJSON, CSV, Parquet)
+Chaque encodeur reçoit les lignes par lots et renvoie les octets à émettre:
+seul le lot courant est en mémoire, quelle que soit la taille de l'export
+"""
+
+import csv
+import importlib.util
+import io
+import json
+from datetime import datetime
+from typing import List, Sequence, Tuple
+
+# pyarrow importé au premier export Parquet (lourd à charger)
+PARQUET_AVAILABLE = importlib.util.find_spec("pyarrow") is not None
+
+EXPORT_MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv; charset=utf-8",
+    "parquet": "application/vnd.apache.parquet"
+}
+
+EXPORT_FORMAT_PATTERN = "^(ndjson|csv|parquet)$"
+
+class NdjsonEncoder:
+    def __init__(self, columns: Sequence[str], types: Sequence[str] = None):
+        self.columns = columns
+
+    def encode(self, rows: List[Tuple]) -> bytes:
+        return "".join(
+            json.dumps(dict(zip(self.columns, row)), default=str) + "\n" for row in rows
+        ).encode()
+
+    def close(self) -> bytes:
+        return b""
+
+class CsvEncoder:
+    def __init__(self, columns: Sequence[str], types: Sequence[str] = None):
+        self.columns = columns
+        self.header_sent = False
+
+    def encode(self, rows: List[Tuple]) -> bytes:
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        if not self.header_sent:
+            writer.writerow(self.columns)
+            self.header_sent = True
+        writer.writerows(rows)
+        return buffer.getvalue().encode()
+
+    def close(self) -> bytes:
+        return b"" if self.header_sent else self.encode([])
+
+class _ChunkSink(io.RawIOBase):
+    """Flux en écriture seule dont on vide le contenu après chaque groupe de lignes"""
+
+    def __init__(self):
+        self.chunks: List[bytes] = []
+        self.position = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self.chunks.append(bytes(data))
+        self.position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self.position
+
+    def drain(self) -> bytes:
+        data = b"".join(self.chunks)
+        self.chunks.clear()
+        return data
+
+class ParquetEncoder:
+    """Un groupe de lignes Parquet par lot, schéma déclaré par l'export"""
+
+    def __init__(self, columns: Sequence[str], types: Sequence[str]):
+        import pyarrow
+        import pyarrow.parquet
+        self.pa = pyarrow
+        self.pq = pyarrow.parquet
+        self.columns = columns
+        # Schéma fixé d'avance: une colonne vide dans le premier lot ne doit pas
+        # devenir de type null (ArrowInvalid dès qu'une valeur arrive ensuite)
+        arrow_types = {
+            "timestamp": pyarrow.timestamp("us", tz="UTC"),
+            "int64": pyarrow.int64(),
+            "float64": pyarrow.float64(),
+            "string": pyarrow.string(),
+            "json": pyarrow.string()
+        }
+        self.schema = pyarrow.schema([
+            (column, arrow_types[kind]) for column, kind in zip(columns, types)
+        ])
+        self.sink = _ChunkSink()
+        self.writer = None
+
+    def encode(self, rows: List[Tuple]) -> bytes:
+        # Les DECIMAL et JSONB sont convertis en types simples
+        data = {
+            column: [_plain(row[i]) for row in rows] for i, column in enumerate(self.columns)
+        }
+        if self.writer is None:
+            self.writer = self.pq.ParquetWriter(self.sink, self.schema)
+        self.writer.write_table(self.pa.Table.from_pydict(data, schema=self.schema))
+        return self.sink.drain()
+
+    def close(self) -> bytes:
+        if self.writer is None:
+            # Export vide: fichier valide, avec son schéma
+            self.writer = self.pq.ParquetWriter(self.sink, self.schema)
+        self.writer.close()
+        return self.sink.drain()
+
+def _plain(value):
+    if value is None or isinstance(value, (int, float, str, datetime)):
+        return value
+    if isinstance(value, (dict, list)):
+        return json.dumps(value, default=str)
+    return float(value)
+
+ENCODERS = {
+    "ndjson": NdjsonEncoder,
+    "csv": CsvEncoder,
+    "parquet": ParquetEncoder
+}
@@ -0,0 +1,113 @@
+"""
+Surveillance de la boucle d'événements asyncio
+Retard de la boucle mesuré en continu, détection des callbacks bloquants
+(avec la pile du code fautif) par un thread de garde, nombre de tâches
+en attente; le tout exporté en métriques Prometheus
+"""
+
+import asyncio
+import logging
+import sys
+import threading
+import time
+import traceback
+from typing import Optional
+
+from prometheus_client import REGISTRY, CollectorRegistry, Counter, Gauge, Histogram
+
+logger = logging.getLogger(__name__)
+
+LAG_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+class LoopMonitor:
+    """Sonde de latence de la boucle et détecteur de blocages"""
+
+    def __init__(
+        self,
+        registry: CollectorRegistry = REGISTRY,
+        interval: float = 0.5,
+        slow_callback_threshold: float = 0.1,
+        max_stack_depth: int = 15
+    ):
+        self.interval = interval
+        self.threshold = slow_callback_threshold
+        self.max_stack_depth = max_stack_depth
+        self.lag = Histogram(
+            'kaspazof_event_loop_lag_seconds',
+            "Retard de réveil de la boucle d'événements",
+            buckets=LAG_BUCKETS,
+            registry=registry
+        )
+        self.last_lag = Gauge(
+            'kaspazof_event_loop_last_lag_seconds',
+            'Dernier retard mesuré de la boucle',
+            registry=registry,
+            multiprocess_mode="liveall"
+        )
+        self.slow_callbacks = Counter(
+            'kaspazof_event_loop_slow_callbacks_total',
+            'Callbacks ayant bloqué la boucle au-delà du seuil',
+            registry=registry
+        )
+        self.pending_tasks = Gauge(
+            'kaspazof_event_loop_pending_tasks',
+            'Tâches asyncio en attente',
+            registry=registry,
+            multiprocess_mode="liveall"
+        )
+        self._task: Optional[asyncio.Task] = None
+        self._watchdog: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self._loop_thread_id: Optional[int] = None
+        # Instant prévu du prochain réveil de la sonde (lu par le thread de garde)
+        self._expected_wakeup = 0.0
+
+    def start(self):
+        """Démarre la sonde (à appeler depuis la boucle surveillée)"""
+        if self._task is not None and not self._task.done():
+            return
+        self._loop_thread_id = threading.get_ident()
+        self._expected_wakeup = time.monotonic() + self.interval
+        self._stop.clear()
+        self._task = asyncio.get_running_loop().create_task(self._probe())
+        self._watchdog = threading.Thread(target=self._watch, name="loop-watchdog", daemon=True)
+        self._watchdog.start()
+
+    async def stop(self):
+        self._stop.set()
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _probe(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            self._expected_wakeup = time.monotonic() + self.interval
+            await asyncio.sleep(self.interval)
+            lag = max(time.monotonic() - self._expected_wakeup, 0.0)
+            self.lag.observe(lag)
+            self.last_lag.set(lag)
+            self.pending_tasks.set(len(asyncio.all_tasks(loop)))
+
+    def _watch(self):
+        reported_for = None
+        while not self._stop.wait(self.threshold / 2):
+            expected = self._expected_wakeup
+            if time.monotonic() - expected < self.threshold or reported_for == expected:
+                continue
+            # La sonde aurait dû se réveiller: la boucle exécute un code bloquant
+            reported_for = expected
+            self.slow_callbacks.inc()
+            logger.warning(
+                f"Event loop blocked for more than {self.threshold * 1000:.0f} ms:\n{self._loop_stack()}"
+            )
+
+    def _loop_stack(self) -> str:
+        frame = sys._current_frames().get(self._loop_thread_id)
+        if frame is None:
+            return "<stack unavailable>"
+        return "".join(traceback.format_stack(frame, limit=self.max_stack_depth))
@@ -0,0 +1,203 @@
+"""
+Profileur statistique à la demande
+Échantillonne périodiquement la pile de tous les threads (boucle d'événements
+comprise) via sys._current_frames(), sans instrumentation permanente.
+Sorties: piles repliées (flamegraph.pl, speedscope) ou JSON speedscope;
+différence d'instantanés tracemalloc pour la croissance mémoire
+"""
+
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from typing import Any, Dict, List, Optional, Tuple
+
+# (nom de fonction, fichier, ligne)
+Frame = Tuple[str, str, int]
+
+# Feuilles de pile d'un thread en attente (exclues par défaut)
+IDLE_FRAMES = {
+    ("threading.py", "wait"),
+    ("threading.py", "_wait_for_tstate_lock"),
+    ("selectors.py", "select"),
+    ("queue.py", "get"),
+    ("thread.py", "_worker")
+}
+
+# Un seul profilage à la fois par processus
+_lock = threading.Lock()
+
+class ProfilerBusyError(RuntimeError):
+    pass
+
+class Profile:
+    """Piles échantillonnées agrégées par thread"""
+
+    def __init__(self, interval: float, duration: float):
+        self.interval = interval
+        self.duration = duration
+        self.samples = 0
+        self.stacks: Counter = Counter()
+
+    def collapsed(self) -> str:
+        """Format replié: "thread;frame;...;frame nombre" par ligne"""
+        lines = []
+        for (thread, stack), count in self.stacks.most_common():
+            frames = ";".join(_frame_label(frame) for frame in stack)
+            lines.append(f"{thread};{frames} {count}" if frames else f"{thread} {count}")
+        return "\n".join(lines) + "\n"
+
+    def speedscope(self, name: str) -> Dict[str, Any]:
+        """Document speedscope: un profil "sampled" par thread, poids en secondes"""
+        frame_index: Dict[Frame, int] = {}
+        frames: List[Dict[str, Any]] = []
+        profiles: Dict[str, Dict[str, Any]] = {}
+
+        for (thread, stack), count in self.stacks.most_common():
+            indexes = []
+            for frame in stack:
+                if frame not in frame_index:
+                    frame_index[frame] = len(frames)
+                    frames.append({"name": frame[0], "file": frame[1], "line": frame[2]})
+                indexes.append(frame_index[frame])
+            profile = profiles.setdefault(thread, {
+                "type": "sampled",
+                "name": thread,
+                "unit": "seconds",
+                "startValue": 0,
+                "endValue": round(self.duration, 6),
+                "samples": [],
+                "weights": []
+            })
+            profile["samples"].append(indexes)
+            profile["weights"].append(round(count * self.interval, 6))
+
+        return {
+            "$schema": "https://www.speedscope.app/file-format-schema.json",
+            "name": name,
+            "exporter": "kaspazof-profiler",
+            "activeProfileIndex": 0,
+            "shared": {"frames": frames},
+            "profiles": list(profiles.values())
+        }
+
+class SamplingProfiler:
+    def __init__(self, interval: float = 0.01, max_depth: int = 128, include_idle: bool = False):
+        self.interval = interval
+        self.max_depth = max_depth
+        self.include_idle = include_idle
+
+    def run(self, duration: float, loop_thread_id: Optional[int] = None) -> Profile:
+        """Échantillonne pendant duration secondes (bloquant: à lancer hors de la boucle)"""
+        if not _lock.acquire(blocking=False):
+            raise ProfilerBusyError("Un profilage est déjà en cours")
+        try:
+            return self._sample(duration, loop_thread_id)
+        finally:
+            _lock.release()
+
+    def _sample(self, duration: float, loop_thread_id: Optional[int]) -> Profile:
+        own_id = threading.get_ident()
+        thread_ids: set = set()
+        raw: Counter = Counter()
+        samples = 0
+
+        start = time.perf_counter()
+        deadline = start + duration
+        while True:
+            now = time.perf_counter()
+            if now >= deadline:
+                break
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own_id:
+                    continue
+                stack = self._stack(frame)
+                if stack is None:
+                    continue
+                raw[(thread_id, stack)] += 1
+                thread_ids.add(thread_id)
+            samples += 1
+            time.sleep(max(self.interval - (time.perf_counter() - now), 0))
+
+        profile = Profile(self.interval, time.perf_counter() - start)
+        profile.samples = samples
+        names = self._thread_names(thread_ids, loop_thread_id)
+        for (thread_id, stack), count in raw.items():
+            profile.stacks[(names[thread_id], stack)] += count
+        return profile
+
+    def _stack(self, frame) -> Optional[Tuple[Frame, ...]]:
+        stack = []
+        while frame is not None and len(stack) < self.max_depth:
+            code = frame.f_code
+            stack.append((code.co_name, code.co_filename, frame.f_lineno))
+            frame = frame.f_back
+        if not self.include_idle and stack and _is_idle(stack[0]):
+            return None
+        stack.reverse()
+        return tuple(stack)
+
+    @staticmethod
+    def _thread_names(thread_ids, loop_thread_id: Optional[int]) -> Dict[int, str]:
+        known = {thread.ident: thread.name for thread in threading.enumerate()}
+        names = {}
+        for thread_id in thread_ids:
+            name = known.get(thread_id, f"thread-{thread_id}")
+            names[thread_id] = f"event-loop ({name})" if thread_id == loop_thread_id else name
+        return names
+
+def memory_diff(duration: float, top: int = 50) -> Dict[str, Any]:
+    """Croissance mémoire par ligne allouée pendant duration secondes (tracemalloc)"""
+    if not _lock.acquire(blocking=False):
+        raise ProfilerBusyError("Un profilage est déjà en cours")
+    started = not tracemalloc.is_tracing()
+    try:
+        if started:
+            tracemalloc.start()
+        before = tracemalloc.take_snapshot()
+        time.sleep(duration)
+        after = tracemalloc.take_snapshot()
+        traced_current, traced_peak = tracemalloc.get_traced_memory()
+    finally:
+        if started:
+            tracemalloc.stop()
+        _lock.release()
+
+    filters = [tracemalloc.Filter(False, tracemalloc.__file__)]
+    stats = after.filter_traces(filters).compare_to(before.filter_traces(filters), "lineno")
+    return {
+        "duration": duration,
+        "traced_current_bytes": traced_current,
+        "traced_peak_bytes": traced_peak,
+        "top": [
+            {
+                "location": f"{stat.traceback[0].filename}:{stat.traceback[0].lineno}",
+                "size_diff": stat.size_diff,
+                "count_diff": stat.count_diff,
+                "size": stat.size,
+                "count": stat.count
+            }
+            for stat in stats[:top]
+        ]
+    }
+
+def _frame_label(frame: Frame) -> str:
+    name, filename, line = frame
+    return f"{name} ({_short_path(filename)}:{line})"
+
+def _short_path(filename: str) -> str:
+    # Chemins relatifs à site-packages ou au répertoire courant, plus lisibles
+    marker = "site-packages" + os.sep
+    index = filename.rfind(marker)
+    if index >= 0:
+        return filename[index + len(marker):]
+    try:
+        relative = os.path.relpath(filename)
+    except ValueError:
+        return filename
+    return filename if relative.startswith("..") else relative
+
+def _is_idle(leaf: Frame) -> bool:
+    return (os.path.basename(leaf[1]), leaf[0]) in IDLE_FRAMES